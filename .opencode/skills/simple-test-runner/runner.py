@@ -117,6 +117,18 @@ def extract_class_info(filepath: Path) -> Dict:
                     "args": args,
                     "docstring": docstring.strip() if docstring else "",
                 }
+
+        # aves_class 中由 _stream_method() 生成的方法
+        stream_pattern = r'^\s+(\w+) = _stream_method\(\s*"([^"]*)"'
+        for match in re.finditer(stream_pattern, content, re.MULTILINE):
+            name, title = match.groups()
+            info["methods"][name] = {"args": "self", "docstring": title}
+
+        # 只 include 一个函数的 AVES 函数生成为别名: func_a = func_b  # 标题
+        alias_pattern = r"^\s+(func_\w+) = func_\w+  # (.*)$"
+        for match in re.finditer(alias_pattern, content, re.MULTILINE):
+            name, title = match.groups()
+            info["methods"][name] = {"args": "self", "docstring": title}
     except Exception as e:
         print(f"[WARN] 扫描失败 {filepath}: {e}")
 
@@ -14,6 +14,7 @@ Usage:
     >>> usb.init_usb2_tx_prbs(utmi_addr=UtmUp, u2_ana_addr=U2AnaUp)
 """
 
+from contextlib import contextmanager
 from typing import List, Tuple, Dict
 import time
 
@@ -26,15 +27,198 @@ class USBCommonClass:
     所有端口地址从外部传入，不在类内部进行选择。
     """
 
-    def __init__(self, device):
+    # (start, count) CDR register runs saved and restored by measure_eye_1d
+    _EYE_BACKUP_RUNS = (
+        (0x09, 1),
+        (0x13, 1),
+        (0xBB, 1),
+        (0xA0, 7),
+        (0xAE, 1),
+        (0x01, 1),
+        (0x3F, 1),
+        (0xE0, 1),
+        (0xF1, 1),
+    )
+
+    # 0x3A-0x41 data for each 5-bit swing: swing0..swing11 packed MSB first
+    # from 0x3A[7] down to 0x41[4] (0x0842108421084210 repeats a 5-bit value
+    # twelve times, shifted left by 4)
+    _SWING_BLOCKS = tuple((swing * 0x0842108421084210).to_bytes(8, "big") for swing in range(32))
+
+    # Fixed (addr2, mask, value) register updates, applied with _apply_plan()
+    _FFE_ENABLE_PLAN = (
+        (0xEA, 0x40, 0x00),  # tap_weight_en=0
+        (0x0E, 0x01, 0x01),  # ana_man[0]=1
+        (0x0F, 0x80, 0x80),  # pre_emp_en=1
+    )
+    _EYE_SETUP_PLAN = (
+        (0x99, 0x01, 0x01),  # enable Slicer eye clk
+        (0x09, 0x08, 0x08),  # enable d_e_check_en
+        (0xBB, 0xC0, 0xC0),  # DFE dis in track=1, enable EYE CDR follow
+        (0xF1, 0x01, 0x01),  # enable floor
+        # Fix SSC eye meas bug
+        (0x3F, 0x03, 0x03),  # cdr rstb=1, cdr man rstb en=1
+        (0xE0, 0x81, 0x81),  # freqtrack_en=1, freqtrack_en man=1
+    )
+
+    def __init__(self, device, shadow: bool = False, settle_time: float = 0.1):
         """
         Initialize the USB Common Class.
 
         Args:
             device: I2C device instance implementing IDevice interface.
-                   Must provide methods: write_reg, read_reg, write_bits, read_bits
-        """
+                   Must provide methods: write_reg, read_reg, write_bits, read_bits,
+                   read_regs, write_reg_rmw, write_block, batch
+            shadow: If True, wrap the device in a hw_bridge ShadowDevice so that
+                    bit writes reuse known register values instead of reading
+                    them back, and unchanged writes are skipped
+            settle_time: Seconds to wait after an FSM reset (eye measurement) and
+                         the maximum wait for the DFE tap readback
+        """
+        if shadow:
+            from hw_bridge import ShadowDevice
+
+            device = ShadowDevice(device)
         self.device = device
+        self.settle_time = settle_time
+        self._shadow = shadow
+        self._batch = None
+
+    @contextmanager
+    def batched(self, dedupe: bool = False):
+        """
+        Defer the register writes of several configuration calls.
+
+        Inside the block every write is queued in one hw_bridge write
+        batch and sent as a single stream when the block exits. Reads
+        send the queued writes first, so read-modify-write and readback
+        see current values. Write order is kept as issued.
+
+        In shadow mode the shadow stays in front of the batch, so bit
+        writes still use known register values instead of reads.
+
+        Usage:
+            >>> with usb.batched():
+            ...     usb.init_usb2_tx_prbs(UtmUp, U2AnaUp)
+            ...     usb.usb2_clk_reverse(UtmUp, U2AnaUp, 1, 0)
+
+        Args:
+            dedupe: If True, drop writes that repeat the value last written
+                    to the same register within the block
+
+        Yields:
+            USBCommonClass: This instance
+        """
+        if self._batch is not None:
+            yield self
+            return
+
+        # The object whose device is swapped for the batch
+        owner = self.device if self._shadow else self
+        device = owner.device
+        with device.batch(dedupe=dedupe) as batch:
+            owner.device = batch
+            self._batch = batch
+            try:
+                yield self
+            finally:
+                owner.device = device
+                self._batch = None
+
+    def _settle(self) -> None:
+        """Send any writes queued by batched(), then wait settle_time."""
+        if self._batch is not None:
+            self._batch.flush()
+        time.sleep(self.settle_time)
+
+    def invalidate(self, addr1: int = None) -> None:
+        """
+        Forget cached register values (shadow mode only).
+
+        Call after a chip reset or anything else that changes registers
+        behind this class.
+
+        Args:
+            addr1: Page to forget; None forgets all pages
+        """
+        if hasattr(self.device, "invalidate"):
+            self.device.invalidate(addr1)
+
+    def _apply_plan(self, addr1: int, plan: Tuple[Tuple[int, int, int], ...]) -> None:
+        """
+        Apply a fixed table of masked register updates in order.
+
+        Args:
+            addr1: Page address
+            plan: (addr2, mask, value) for each register
+        """
+        rmw = self._rmw
+        for addr2, mask, value in plan:
+            rmw(addr1, addr2, mask, value)
+
+    def _rmw(self, addr1: int, addr2: int, mask: int, value: int) -> None:
+        """
+        Read-modify-write the masked bits of one register.
+
+        The register is always written back, as write_bits() does, so
+        write-triggered and self-clearing bits still see the write; only
+        in shadow mode is a write that would not change the value skipped.
+
+        Args:
+            addr1: Page address
+            addr2: Register offset
+            mask: Bits to update
+            value: New bit values, aligned to mask
+        """
+        self.device.write_reg_rmw(addr1, addr2, mask, value, skip_unchanged=self._shadow)
+
+    def _write_fields(
+        self, addr1: int, addr2: int, fields: Tuple[Tuple[int, int, int], ...]
+    ) -> None:
+        """
+        Write several bit fields of one register with a single read-modify-write.
+
+        A register whose bits are all covered by the fields is written
+        without reading it first.
+
+        Args:
+            addr1: Page address
+            addr2: Register offset
+            fields: (lsb, bits, value) for each field
+        """
+        mask = 0
+        value = 0
+        for lsb, bits, field_value in fields:
+            field_mask = ((1 << bits) - 1) << lsb
+            mask |= field_mask
+            value = (value & ~field_mask) | ((field_value << lsb) & field_mask)
+
+        if mask == 0xFF:
+            self.device.write_reg(addr1, addr2, value)
+        else:
+            self._rmw(addr1, addr2, mask, value)
+
+    def _pulse_bits(
+        self, addr1: int, addr2: int, steps: Tuple[Tuple[int, int, int], ...]
+    ) -> None:
+        """
+        Drive a sequence of bit-field values into one register.
+
+        The register is read once and every step is written back to back
+        from that value, so a reset pulse costs one read plus one write
+        per edge instead of a read-modify-write per edge.
+
+        Args:
+            addr1: Page address
+            addr2: Register offset
+            steps: (lsb, bits, value) applied cumulatively, one write each
+        """
+        value = self.device.read_reg(addr1, addr2)
+        with self.device.batch() as device:
+            for lsb, bits, field_value in steps:
+                field_mask = ((1 << bits) - 1) << lsb
+                value = (value & ~field_mask) | ((field_value << lsb) & field_mask)
+                device.write_reg(addr1, addr2, value)
 
     @staticmethod
     def _dac_to_code(num_in: int) -> int:
@@ -47,18 +231,10 @@ class USBCommonClass:
         Returns:
             int: Temperature code
         """
-        code_map = {
-            0: 0x00,
-            1: 0x01,
-            2: 0x03,
-            3: 0x07,
-            4: 0x0F,
-            5: 0x1F,
-            6: 0x3F,
-            7: 0x7F,
-            8: 0xFF,
-        }
-        return code_map.get(num_in, 0x00)
+        # 0 -> 0x00, 1 -> 0x01, 2 -> 0x03, ..., 8 -> 0xFF
+        if 0 <= num_in <= 8:
+            return (1 << num_in) - 1
+        return 0x00
 
     # =========================================================================
     # USB2.0 Initialization Functions
@@ -76,8 +252,8 @@ class USBCommonClass:
         self.usb2_tx_reset(utmi_addr)
 
         # Enable HS TX PRBS
-        self.device.write_bits(utmi_addr, 0x30, 4, 1, 1)  # prbs_gen_en=1
-        self.device.write_bits(utmi_addr, 0x30, 5, 1, 1)  # prbs_gen_mode=1
+        # prbs_gen_en=1, prbs_gen_mode=1
+        self._write_fields(utmi_addr, 0x30, ((4, 1, 1), (5, 1, 1)))
         self.device.write_bits(utmi_addr, 0x63, 3, 2, 0)  # test_mode=0
 
     def init_usb2_rx_prbs(self, utmi_addr: int, u2_ana_addr: int) -> None:
@@ -89,9 +265,8 @@ class USBCommonClass:
             u2_ana_addr: USB2 Analog register page address
         """
         # Enable HS RX PRBS
-        self.device.write_bits(utmi_addr, 0x30, 2, 1, 1)  # prbs_check_en=1
-        self.device.write_bits(utmi_addr, 0x30, 3, 1, 1)  # prbs_check_clear=1
-        self.device.write_bits(utmi_addr, 0x30, 3, 1, 0)  # prbs_check_clear=0
+        # prbs_check_en=1, prbs_check_clear=1, prbs_check_clear=0
+        self._pulse_bits(utmi_addr, 0x30, ((2, 1, 1), (3, 1, 1), (3, 1, 0)))
 
 
 
@@ -107,8 +282,7 @@ class USBCommonClass:
             utmi_addr: UTMI register page address
         """
         self.device.write_bits(utmi_addr, 0x62, 7, 1, 0)  # auto_en_tx_reset_hs=0
-        self.device.write_bits(utmi_addr, 0x63, 5, 1, 1)  # set reset_hs=1
-        self.device.write_bits(utmi_addr, 0x63, 5, 1, 0)  # set reset_hs=0
+        self._pulse_bits(utmi_addr, 0x63, ((5, 1, 1), (5, 1, 0)))  # reset_hs=1, 0
 
     def usb2_cdr_config(
         self,
@@ -132,11 +306,10 @@ class USBCommonClass:
             sync_cond: Sync condition
             lp_sel: Low power select (2-bit)
         """
-        self.device.write_bits(u2_ana_addr, 0x01, 5, 1, drop2)
-        self.device.write_bits(u2_ana_addr, 0x01, 6, 1, drop4)
-        self.device.write_bits(u2_ana_addr, 0x02, 4, 1, lp_mode)
-        self.device.write_bits(u2_ana_addr, 0x02, 5, 1, mv_mode)
-        self.device.write_bits(u2_ana_addr, 0x02, 6, 1, sync_cond)
+        self._write_fields(u2_ana_addr, 0x01, ((5, 1, drop2), (6, 1, drop4)))
+        self._write_fields(
+            u2_ana_addr, 0x02, ((4, 1, lp_mode), (5, 1, mv_mode), (6, 1, sync_cond))
+        )
         self.device.write_bits(u2_ana_addr, 0x14, 4, 2, lp_sel)
 
     def usb2_rx_squelch_config(
@@ -151,9 +324,9 @@ class USBCommonClass:
             sql_bias: Squelch bias (3-bit)
             sql_refbias: Squelch reference bias (3-bit)
         """
-        self.device.write_bits(u2_ana_addr, 0x04, 0, 3, sql_bias)
-        self.device.write_bits(u2_ana_addr, 0x04, 3, 2, sql_ctrl)
-        self.device.write_bits(u2_ana_addr, 0x04, 5, 3, sql_refbias)
+        self._write_fields(
+            u2_ana_addr, 0x04, ((0, 3, sql_bias), (3, 2, sql_ctrl), (5, 3, sql_refbias))
+        )
 
     def usb2_pll_clk_set(self, ana_pll_addr: int, clk_val: int) -> bool:
         """
@@ -166,16 +339,14 @@ class USBCommonClass:
         Returns:
             bool: True if successful, False otherwise
         """
-        div_ratio = clk_val / 25
-        if div_ratio != int(div_ratio):
+        int_div, remainder = divmod(clk_val, 25)
+        if remainder:
             return False
+        # divmod keeps a float clk_val (e.g. 500.0) a float
+        int_div = int(int_div)
 
-        int_div = int(div_ratio)
-        int_msb = int_div // 256
-        int_lsb = int_div % 256
-
-        self.device.write_reg(ana_pll_addr, 0xF2, int_msb)
-        self.device.write_reg(ana_pll_addr, 0xF1, int_lsb)
+        # Divider LSB/MSB at 0xF1/0xF2 in one block write
+        self.device.write_block(ana_pll_addr, 0xF1, [int_div & 0xFF, int_div >> 8])
 
         # MPLL restart
         self.device.write_bits(ana_pll_addr, 0xF0, 0, 1, 0)
@@ -207,8 +378,7 @@ class USBCommonClass:
             reverse: 1 for reverse, 0 for normal
             clk_delay: 00=nodelay, 01=1x, 10=2x, 11=reverse
         """
-        self.device.write_bits(utmi_addr, 0x62, 3, 1, 0)
-        self.device.write_bits(utmi_addr, 0x62, 3, 1, 1)
+        self._pulse_bits(utmi_addr, 0x62, ((3, 1, 0), (3, 1, 1)))
 
         self.device.write_bits(u2_ana_addr, 0x06, 7, 1, reverse)
         self.device.write_bits(u2_ana_addr, 0x06, 0, 2, clk_delay)
@@ -236,11 +406,8 @@ class USBCommonClass:
             mv_sel: MV select (0-3, default=3)
         """
         # Set to manual mode
-        self.device.write_bits(cdr_addr, 0xE0, 7, 1, 1)
-
-        self.device.write_bits(cdr_addr, 0xE0, 0, 1, freq_tracking_en)
-        self.device.write_bits(cdr_addr, 0xE1, 0, 4, phase_gain)
-        self.device.write_bits(cdr_addr, 0xE1, 4, 4, freq_gain)
+        self._write_fields(cdr_addr, 0xE0, ((7, 1, 1), (0, 1, freq_tracking_en)))
+        self._write_fields(cdr_addr, 0xE1, ((0, 4, phase_gain), (4, 4, freq_gain)))
         self.device.write_bits(cdr_addr, 0xE2, 2, 2, mv_sel)
 
     def usb3_pi_config(self, cdr_addr: int, slewrate: int, picuradj: int) -> None:
@@ -263,59 +430,11 @@ class USBCommonClass:
             pipe_addr: PIPE register page address
             swing: Swing value (5-bit)
         """
-        # swing0
-        self.device.write_bits(pipe_addr, 0x3A, 3, 5, swing)
-
-        # swing1
-        swing_msb = swing >> 2
-        swing_lsb = swing & 0x03
-        self.device.write_bits(pipe_addr, 0x3A, 0, 3, swing_msb)
-        self.device.write_bits(pipe_addr, 0x3B, 6, 2, swing_lsb)
-
-        # swing2
-        self.device.write_bits(pipe_addr, 0x3B, 1, 5, swing)
-
-        # swing3
-        swing_msb = swing >> 4
-        swing_lsb = swing & 0x0F
-        self.device.write_bits(pipe_addr, 0x3B, 0, 1, swing_msb)
-        self.device.write_bits(pipe_addr, 0x3C, 4, 4, swing_lsb)
-
-        # swing4
-        swing_msb = swing >> 1
-        swing_lsb = swing & 0x01
-        self.device.write_bits(pipe_addr, 0x3C, 0, 4, swing_msb)
-        self.device.write_bits(pipe_addr, 0x3D, 7, 1, swing_lsb)
-
-        # swing5
-        self.device.write_bits(pipe_addr, 0x3D, 2, 5, swing)
-
-        # swing6
-        swing_msb = swing >> 3
-        swing_lsb = swing & 0x07
-        self.device.write_bits(pipe_addr, 0x3D, 0, 2, swing_msb)
-        self.device.write_bits(pipe_addr, 0x3E, 5, 3, swing_lsb)
+        data = self._SWING_BLOCKS[swing & 0x1F]
 
-        # swing7
-        self.device.write_bits(pipe_addr, 0x3E, 0, 5, swing)
-
-        # swing8
-        self.device.write_bits(pipe_addr, 0x3F, 3, 5, swing)
-
-        # swing9
-        swing_msb = swing >> 2
-        swing_lsb = swing & 0x03
-        self.device.write_bits(pipe_addr, 0x3F, 0, 3, swing_msb)
-        self.device.write_bits(pipe_addr, 0x40, 6, 2, swing_lsb)
-
-        # swing10
-        self.device.write_bits(pipe_addr, 0x40, 1, 5, swing)
-
-        # swing11
-        swing_msb = swing >> 4
-        swing_lsb = swing & 0x0F
-        self.device.write_bits(pipe_addr, 0x40, 0, 1, swing_msb)
-        self.device.write_bits(pipe_addr, 0x41, 4, 4, swing_lsb)
+        # 0x3A-0x40 are fully covered: one block write, no read
+        self.device.write_block(pipe_addr, 0x3A, data[:7])
+        self._rmw(pipe_addr, 0x41, 0xF0, data[7])
 
     def usb3_tx_term_config(self, pipe_addr: int, term: int) -> None:
         """
@@ -346,13 +465,10 @@ class USBCommonClass:
             preemp_sel: Pre-emphasis select (3-bit)
             pre_en: Pre-emphasis enable (1-bit)
         """
-        self.device.write_bits(pipe_addr, 0xEA, 6, 1, 0)  # tap_weight_en
-        self.device.write_bits(pipe_addr, 0x0E, 0, 1, 1)  # ana_man[0]=1
-        self.device.write_bits(pipe_addr, 0x0F, 7, 1, 1)  # pre_emp_en=1
+        self._apply_plan(pipe_addr, self._FFE_ENABLE_PLAN)
         self.device.write_bits(pipe_addr, 0xF7, 7, 1, pre_en)
         self.device.write_bits(pipe_addr, 0xEE, 2, 3, preemp_sel)
-        self.device.write_bits(pipe_addr, 0xF6, 4, 2, tapw_post2)
-        self.device.write_bits(pipe_addr, 0xF6, 2, 2, tapw_post3)
+        self._write_fields(pipe_addr, 0xF6, ((4, 2, tapw_post2), (2, 2, tapw_post3)))
 
     def usb3_tx_curadj_config(self, pipe_addr: int, curadj: int) -> None:
         """
@@ -398,8 +514,7 @@ class USBCommonClass:
             post_vga_gain: Post VGA gain (2-bit)
         """
         # Post VGA gain
-        self.device.write_bits(cdr_addr, 0x4D, 7, 1, 1)
-        self.device.write_bits(cdr_addr, 0x4D, 0, 2, post_vga_gain)
+        self._write_fields(cdr_addr, 0x4D, ((7, 1, 1), (0, 2, post_vga_gain)))
 
         # ATT
         self.device.write_bits(cdr_addr, 0x48, 7, 1, att_en)
@@ -412,18 +527,15 @@ class USBCommonClass:
         self.device.write_bits(cdr_addr, 0xEE, 4, 3, pole_cap)
 
         # Zero
-        self.device.write_bits(cdr_addr, 0x4A, 7, 1, zero_en)
-        self.device.write_bits(cdr_addr, 0x4A, 0, 3, zero)
-        self.device.write_bits(cdr_addr, 0x4F, 7, 1, zero_en)
-        self.device.write_bits(cdr_addr, 0x4F, 0, 3, zero)
+        self._write_fields(cdr_addr, 0x4A, ((7, 1, zero_en), (0, 3, zero)))
+        self._write_fields(cdr_addr, 0x4F, ((7, 1, zero_en), (0, 3, zero)))
 
         # CTLE stage 2 gain
         self.device.write_bits(cdr_addr, 0x4B, 7, 1, khp_t_en)
         self.device.write_bits(cdr_addr, 0x4C, 0, 7, self._dac_to_code(khp_t))
 
         # CTLE stage 1 gain
-        self.device.write_bits(cdr_addr, 0x4E, 7, 1, khp_t_en)
-        self.device.write_bits(cdr_addr, 0x4E, 0, 3, khp_t)
+        self._write_fields(cdr_addr, 0x4E, ((7, 1, khp_t_en), (0, 3, khp_t)))
 
     # =========================================================================
     # DFE Configuration Functions
@@ -444,11 +556,8 @@ class USBCommonClass:
             print("DFE manual tap num out of range, need check...")
             return False
 
-        # Convert to Verilog format
-        if tap_num >= 0:
-            tap_verilog = tap_num
-        else:
-            tap_verilog = (~abs(tap_num) & 0xFF) + 1
+        # Convert to Verilog format (8-bit two's complement)
+        tap_verilog = tap_num & 0xFF
 
         # Set manual DFE mode
         self.device.write_bits(cdr_addr, 0x09, 5, 1, 1)
@@ -457,14 +566,15 @@ class USBCommonClass:
         self.device.write_reg(cdr_addr, 0xAD, tap_verilog)
 
         # Reset FSM
-        self.device.write_bits(cdr_addr, 0x01, 1, 1, 0)
-        self.device.write_bits(cdr_addr, 0x01, 1, 1, 1)
-        self.device.write_bits(cdr_addr, 0x01, 1, 1, 0)
+        self._pulse_bits(cdr_addr, 0x01, ((1, 1, 0), (1, 1, 1), (1, 1, 0)))
 
-        time.sleep(0.1)
-
-        # Verify
-        rb_tap_verilog = self.device.read_reg(cdr_addr, 0x66) - 128
+        # Verify: poll the readback until the FSM has applied the tap
+        deadline = time.monotonic() + self.settle_time
+        while True:
+            rb_tap_verilog = self.device.read_reg(cdr_addr, 0x66) - 128
+            if rb_tap_verilog == tap_num or time.monotonic() >= deadline:
+                break
+            time.sleep(0.001)
 
         if rb_tap_verilog != tap_num:
             print("DFE manual tap ERROR, not equal")
@@ -493,8 +603,7 @@ class USBCommonClass:
         Returns:
             List[int]: [d_lev, tap1]
         """
-        d_lev = self.device.read_reg(cdr_addr, 0xD8)
-        tap1 = self.device.read_reg(cdr_addr, 0xD9)
+        d_lev, tap1 = self.device.read_regs(cdr_addr, 0xD8, 2)
 
         return [int(d_lev), int(tap1)]
 
@@ -509,9 +618,8 @@ class USBCommonClass:
         Args:
             cdr_addr: CDR register page address
         """
-        self.device.write_bits(cdr_addr, 0x3F, 1, 1, 1)  # rx_cdr_rstb_man_en=1
-        self.device.write_bits(cdr_addr, 0x3F, 0, 1, 0)  # rx_cdr_rstb_man=0
-        self.device.write_bits(cdr_addr, 0x3F, 0, 1, 1)  # rx_cdr_rstb_man=1
+        # rx_cdr_rstb_man_en=1, rx_cdr_rstb_man=0, rx_cdr_rstb_man=1
+        self._pulse_bits(cdr_addr, 0x3F, ((1, 1, 1), (0, 1, 0), (0, 1, 1)))
 
     def cdr_set_eq_bias(self, cdr_addr: int, poly: int, ptat: int, ac_cm: int) -> None:
         """
@@ -523,9 +631,7 @@ class USBCommonClass:
             ptat: PTAT value
             ac_cm: AC CM value
         """
-        self.device.write_reg(cdr_addr, 0x54, ac_cm)
-        self.device.write_reg(cdr_addr, 0x55, poly)
-        self.device.write_reg(cdr_addr, 0x56, ptat)
+        self.device.write_block(cdr_addr, 0x54, [ac_cm, poly, ptat])
 
     def cdr_read_status(
         self, cdr_addr: int, catch_times: int
@@ -547,8 +653,7 @@ class USBCommonClass:
         freq_dac_array = []
 
         for _ in range(catch_times):
-            freq_reg_0 = self.device.read_reg(cdr_addr, 0xE5)
-            freq_reg_1 = self.device.read_reg(cdr_addr, 0xE6)
+            freq_reg_0, freq_reg_1 = self.device.read_regs(cdr_addr, 0xE5, 2)
 
             freq_cnt = freq_reg_0 * 256 + freq_reg_1
             phase_cnt = 0
@@ -575,9 +680,8 @@ class USBCommonClass:
         Args:
             pipe_addr: PIPE register page address
         """
-        self.device.write_bits(pipe_addr, 0x1E, 3, 1, 1)  # tx_ser_rst_man_en=1
-        self.device.write_bits(pipe_addr, 0x1E, 2, 1, 1)  # ser_rst=1
-        self.device.write_bits(pipe_addr, 0x1E, 2, 1, 0)  # ser_rst=0
+        # tx_ser_rst_man_en=1, ser_rst=1, ser_rst=0
+        self._pulse_bits(pipe_addr, 0x1E, ((3, 1, 1), (2, 1, 1), (2, 1, 0)))
 
     # =========================================================================
     # PRBS Control Functions
@@ -596,9 +700,17 @@ class USBCommonClass:
                 PRBS mode 3, PRBS23
                 PRBS mode 4, PRBS31
         """
-        for pipe_addr in pipe_addr_list:
-            self.device.write_bits(pipe_addr, 0x63, 1, 3, prbs_mode)
-            self.device.write_bits(pipe_addr, 0x19, 3, 3, prbs_mode)
+        # Read every port first, then send all ports' writes as one batch
+        read_reg = self.device.read_reg
+        current = [
+            (pipe_addr, read_reg(pipe_addr, 0x63), read_reg(pipe_addr, 0x19))
+            for pipe_addr in pipe_addr_list
+        ]
+        mode = prbs_mode & 0x07
+        with self.device.batch() as device:
+            for pipe_addr, reg_63, reg_19 in current:
+                device.write_reg(pipe_addr, 0x63, (reg_63 & ~0x0E) | (mode << 1))
+                device.write_reg(pipe_addr, 0x19, (reg_19 & ~0x38) | (mode << 3))
 
     def usb2_prbs_clear(self, utmi_addr_list: List[int]) -> None:
         """
@@ -607,11 +719,18 @@ class USBCommonClass:
         Args:
             utmi_addr_list: List of UTMI register page addresses
         """
-        for utmi_addr in utmi_addr_list:
-            self.device.write_bits(utmi_addr, 0x30, 2, 1, 0)  # prbs_check_en=0
-            self.device.write_bits(utmi_addr, 0x30, 3, 1, 1)  # prbs_check_clear=1
-            self.device.write_bits(utmi_addr, 0x30, 3, 1, 0)  # prbs_check_clear=0
-            self.device.write_bits(utmi_addr, 0x30, 2, 1, 1)  # prbs_check_en=1
+        # Read every port first, then send all ports' pulses as one batch
+        current = [
+            (utmi_addr, self.device.read_reg(utmi_addr, 0x30)) for utmi_addr in utmi_addr_list
+        ]
+        with self.device.batch() as device:
+            for utmi_addr, reg_30 in current:
+                reg_30 &= ~0x04
+                device.write_reg(utmi_addr, 0x30, reg_30)  # prbs_check_en=0
+                device.write_reg(utmi_addr, 0x30, reg_30 | 0x08)  # prbs_check_clear=1
+                reg_30 &= ~0x08
+                device.write_reg(utmi_addr, 0x30, reg_30)  # prbs_check_clear=0
+                device.write_reg(utmi_addr, 0x30, reg_30 | 0x04)  # prbs_check_en=1
 
     def usb3_prbs_clear(self, pipe_addr_list: List[int]) -> None:
         """
@@ -620,15 +739,23 @@ class USBCommonClass:
         Args:
             pipe_addr_list: List of PIPE register page addresses
         """
-        for pipe_addr in pipe_addr_list:
-            self.device.write_bits(pipe_addr, 0x63, 4, 1, 1)  # prbs en=1
-            self.device.write_bits(pipe_addr, 0x64, 7, 1, 1)  # prbs_compare en=1
-            self.device.write_bits(pipe_addr, 0x63, 4, 1, 0)  # prbs en=0
-            self.device.write_bits(pipe_addr, 0x64, 7, 1, 0)  # prbs_compare en=0
-            self.device.write_bits(pipe_addr, 0x64, 7, 1, 1)  # prbs_compare en=1
-            self.device.write_bits(pipe_addr, 0x64, 7, 1, 0)  # prbs_compare en=0
-            self.device.write_bits(pipe_addr, 0x63, 4, 1, 1)  # prbs en=1
-            self.device.write_bits(pipe_addr, 0x64, 7, 1, 1)  # prbs_compare en=1
+        # Read every port first (0x63-0x64), then send all ports' pulses as one batch
+        current = [
+            (pipe_addr, self.device.read_regs(pipe_addr, 0x63, 2))
+            for pipe_addr in pipe_addr_list
+        ]
+        with self.device.batch() as device:
+            for pipe_addr, (reg_63, reg_64) in current:
+                en_1, en_0 = reg_63 | 0x10, reg_63 & ~0x10
+                compare_1, compare_0 = reg_64 | 0x80, reg_64 & ~0x80
+                device.write_reg(pipe_addr, 0x63, en_1)  # prbs en=1
+                device.write_reg(pipe_addr, 0x64, compare_1)  # prbs_compare en=1
+                device.write_reg(pipe_addr, 0x63, en_0)  # prbs en=0
+                device.write_reg(pipe_addr, 0x64, compare_0)  # prbs_compare en=0
+                device.write_reg(pipe_addr, 0x64, compare_1)  # prbs_compare en=1
+                device.write_reg(pipe_addr, 0x64, compare_0)  # prbs_compare en=0
+                device.write_reg(pipe_addr, 0x63, en_1)  # prbs en=1
+                device.write_reg(pipe_addr, 0x64, compare_1)  # prbs_compare en=1
 
     def read_usb3_prbs_errors(self, pipe_addr: int) -> int:
         """
@@ -640,11 +767,8 @@ class USBCommonClass:
         Returns:
             int: PRBS error count
         """
-        a = self.device.read_reg(pipe_addr, 0x6C)
-        b = self.device.read_reg(pipe_addr, 0x6B)
-        c = self.device.read_reg(pipe_addr, 0x6A)
-
-        return int(a) + int(b) * 256 + int(c) * 65536
+        # 0x6A holds the most significant byte
+        return int.from_bytes(bytes(self.device.read_regs(pipe_addr, 0x6A, 3)), "big")
 
     def read_usb2_prbs_errors(self, utmi_addr: int) -> Tuple[int, int]:
         """
@@ -656,17 +780,10 @@ class USBCommonClass:
         Returns:
             Tuple[int, int]: (error_count, length)
         """
-        # Read length
-        length_msb = self.device.read_reg(utmi_addr, 0x3B)
-        length_lsb = self.device.read_reg(utmi_addr, 0x3A)
-        length = length_msb * 256 + length_lsb
-
-        # Read error
-        err_0 = self.device.read_reg(utmi_addr, 0x36)
-        err_1 = self.device.read_reg(utmi_addr, 0x37)
-        err_2 = self.device.read_reg(utmi_addr, 0x38)
-        err_3 = self.device.read_reg(utmi_addr, 0x39)
-        error = err_3 * 16777216 + err_2 * 65536 + err_1 * 256 + err_0
+        # Error (0x36-0x39) and length (0x3A-0x3B) in one block read
+        data = bytes(self.device.read_regs(utmi_addr, 0x36, 6))
+        error = int.from_bytes(data[:4], "little")
+        length = int.from_bytes(data[4:], "little")
 
         return (error, length)
 
@@ -685,17 +802,15 @@ class USBCommonClass:
         check_result = "pass"
         prbs_error = 0
 
-        # Check PRBS constant
-        prbs_constant_list = []
-        for _ in range(10):
-            prbs_constant_list.append(self.device.read_reg(pipe_addr, 0x69))
-
-        prbs_constant = not all(x == prbs_constant_list[0] for x in prbs_constant_list)
+        # Check PRBS constant: 0x69 must change within 10 reads; stop at the first change
+        read_reg = self.device.read_reg
+        first = read_reg(pipe_addr, 0x69)
+        prbs_varying = any(read_reg(pipe_addr, 0x69) != first for _ in range(9))
 
         for _ in range(mins):
             prbs_error = self.read_usb3_prbs_errors(pipe_addr)
 
-            if not prbs_constant:
+            if not prbs_varying:
                 print("PRBS ALL equal, Need check, quit")
                 check_result = "fail"
                 break
@@ -708,7 +823,13 @@ class USBCommonClass:
         return [prbs_error, check_result]
 
     def check_usb2_prbs_with_break(
-        self, utmi_addr: int, mins: int, unit: int, length_expect: int = 512
+        self,
+        utmi_addr: int,
+        mins: int,
+        unit: int,
+        length_expect: int = 512,
+        probe_count: int = 20,
+        probe_interval: float = 0.1,
     ) -> List:
         """
         Check USB2.0 PRBS with break on error.
@@ -718,6 +839,8 @@ class USBCommonClass:
             mins: Number of minutes/iterations to check
             unit: Sleep time per iteration in seconds
             length_expect: Expected packet length
+            probe_count: Number of length reads used to find the max length (>= 1)
+            probe_interval: Sleep between length reads in seconds
 
         Returns:
             List: [error_count, check_result, time_iterations]
@@ -726,20 +849,22 @@ class USBCommonClass:
         time_i = mins * unit
         error = 0
 
-        # Get max length from initial reads
+        read_regs = self.device.read_regs
+
+        # Get max length from initial reads (length only, 0x3A-0x3B)
         length_array = []
-        for _ in range(20):
-            _, length = self.read_usb2_prbs_errors(utmi_addr)
-            length_array.append(length)
-            time.sleep(0.1)
+        for _ in range(probe_count):
+            length_array.append(int.from_bytes(bytes(read_regs(utmi_addr, 0x3A, 2)), "little"))
+            time.sleep(probe_interval)
 
-        max_length = max(length_array)
+        # The length check does not change inside the loop
+        length_ok = abs(length_expect - max(length_array)) < 10
 
         for min_i in range(mins):
-            error, length = self.read_usb2_prbs_errors(utmi_addr)
-            length_diff = abs(length_expect - max_length)
+            # Error count only (0x36-0x39)
+            error = int.from_bytes(bytes(read_regs(utmi_addr, 0x36, 4)), "little")
 
-            if error < 10 and length_diff < 10:
+            if error < 10 and length_ok:
                 time.sleep(int(unit))
             else:
                 check_result = "fail"
@@ -762,70 +887,38 @@ class USBCommonClass:
         Returns:
             int: Eye measurement value
         """
-        # Save registers
-        reg_backup = {
-            0x09: self.device.read_reg(cdr_addr, 0x09),
-            0x13: self.device.read_reg(cdr_addr, 0x13),
-            0xBB: self.device.read_reg(cdr_addr, 0xBB),
-            0xA0: self.device.read_reg(cdr_addr, 0xA0),
-            0xA1: self.device.read_reg(cdr_addr, 0xA1),
-            0xA2: self.device.read_reg(cdr_addr, 0xA2),
-            0xA3: self.device.read_reg(cdr_addr, 0xA3),
-            0xA4: self.device.read_reg(cdr_addr, 0xA4),
-            0xA5: self.device.read_reg(cdr_addr, 0xA5),
-            0xA6: self.device.read_reg(cdr_addr, 0xA6),
-            0xAE: self.device.read_reg(cdr_addr, 0xAE),
-            0x01: self.device.read_reg(cdr_addr, 0x01),
-            0x3F: self.device.read_reg(cdr_addr, 0x3F),
-            0xE0: self.device.read_reg(cdr_addr, 0xE0),
-            0xF1: self.device.read_reg(cdr_addr, 0xF1),
-        }
+        # Save registers, one block read per contiguous run
+        reg_backup = [
+            (start, self.device.read_regs(cdr_addr, start, num))
+            for start, num in self._EYE_BACKUP_RUNS
+        ]
 
         try:
             # Configure for eye measurement
-            self.device.write_bits(cdr_addr, 0x99, 0, 1, 1)  # enable Slicer eye clk
-            self.device.write_bits(cdr_addr, 0x09, 3, 1, 1)  # enable d_e_check_en
-            self.device.write_bits(cdr_addr, 0xBB, 7, 1, 1)  # DFE dis in track=1
-            self.device.write_bits(cdr_addr, 0xBB, 6, 1, 1)  # enable EYE CDR follow
-            self.device.write_bits(cdr_addr, 0xF1, 0, 1, 1)  # enable floor
-
-            # Fix SSC eye meas bug
-            self.device.write_bits(cdr_addr, 0x3F, 0, 1, 1)  # cdr rstb=1
-            self.device.write_bits(cdr_addr, 0x3F, 1, 1, 1)  # cdr man rstb en=1
-            self.device.write_bits(cdr_addr, 0xE0, 0, 1, 1)  # freqtrack_en=1
-            self.device.write_bits(cdr_addr, 0xE0, 7, 1, 1)  # freqtrack_en man=1
-
-            # Clear all EQ param loop
-            self.device.write_reg(cdr_addr, 0xA0, 0x40)
-            self.device.write_reg(cdr_addr, 0xA1, 0x00)
-            self.device.write_reg(cdr_addr, 0xA2, 0x00)
-            self.device.write_reg(cdr_addr, 0xA3, 0x00)
-            self.device.write_reg(cdr_addr, 0xA4, 0x00)
-            self.device.write_reg(cdr_addr, 0xA5, 0x00)
-            self.device.write_reg(cdr_addr, 0xA6, 0x00)
+            self._apply_plan(cdr_addr, self._EYE_SETUP_PLAN)
+
+            # Clear all EQ param loop (0xA0-0xA6)
+            self.device.write_block(cdr_addr, 0xA0, [0x40, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
 
             # Set fixed parameters
             self.device.write_reg(cdr_addr, 0xAE, 0x21)
             self.device.write_reg(cdr_addr, 0x01, 0x04)
 
             # Do FSM reset
-            self.device.write_bits(cdr_addr, 0x3F, 3, 1, 1)  # man_en=1
-            self.device.write_bits(cdr_addr, 0x3F, 2, 1, 1)  # reset=1
-            self.device.write_bits(cdr_addr, 0x3F, 2, 1, 0)  # reset=0
-            self.device.write_bits(cdr_addr, 0x3F, 3, 1, 0)  # man_en=0
+            # man_en=1, reset=1, reset=0, man_en=0
+            self._pulse_bits(cdr_addr, 0x3F, ((3, 1, 1), (2, 1, 1), (2, 1, 0), (3, 1, 0)))
 
             # Wait for stable
-            time.sleep(0.1)
+            self._settle()
 
             # Read eye measurement
-            eye_lsb = self.device.read_reg(cdr_addr, 0x38)
-            eye_msb = self.device.read_reg(cdr_addr, 0x37)
+            eye_msb, eye_lsb = self.device.read_regs(cdr_addr, 0x37, 2)
             eye_value = eye_msb * 256 + eye_lsb
 
         finally:
             # Restore registers
-            for addr, value in reg_backup.items():
-                self.device.write_reg(cdr_addr, addr, value)
+            for start, values in reg_backup:
+                self.device.write_block(cdr_addr, start, values)
 
         return eye_value
 
@@ -861,7 +954,11 @@ class USBCommonClass:
     # =========================================================================
 
     def adc_measure_voltage(
-        self, misc_addr: int, channel: int, meas_time: int = 30
+        self,
+        misc_addr: int,
+        channel: int,
+        meas_time: int = 30,
+        sample_interval: float = 0.1,
     ) -> float:
         """
         Measure voltage using ADC.
@@ -870,27 +967,29 @@ class USBCommonClass:
             misc_addr: Misc register page address
             channel: ADC channel to measure
             meas_time: Number of measurement samples
+            sample_interval: Seconds to wait between samples (no wait after
+                             the last one); 0 reads back to back
 
         Returns:
             float: Average voltage measured
         """
         # Configure ADC
-        self.device.write_reg(misc_addr, 0x20, 0x08)  # ADC clkdiv ctrl
-        self.device.write_reg(misc_addr, 0x21, 0x1F)  # ADC power on
+        # ADC clkdiv ctrl (0x20), ADC power on (0x21)
+        self.device.write_block(misc_addr, 0x20, [0x08, 0x1F])
         self.device.write_reg(misc_addr, 0x24, 0x0F)  # ADC sample ctrl
         self.device.write_reg(misc_addr, 0x22, channel)  # SEL channel
 
         # Take measurements
-        vout_list = []
-        for _ in range(meas_time):
-            vout = (self.device.read_reg(misc_addr, 0x45) / 255) * 2
-            vout_list.append(vout)
-            time.sleep(0.1)
+        code_sum = 0
+        for i in range(meas_time):
+            if i and sample_interval > 0:
+                time.sleep(sample_interval)
+            code_sum += self.device.read_reg(misc_addr, 0x45)
 
-        # Calculate mean
-        vout_mean = sum(vout_list) / len(vout_list) if vout_list else 0.0
-
-        return vout_mean
+        # Average the raw codes, then scale once (full scale 255 -> 2 V)
+        if meas_time <= 0:
+            return 0.0
+        return code_sum * 2 / (255 * meas_time)
 
     # =========================================================================
     # Debug Functions
@@ -906,13 +1005,17 @@ class USBCommonClass:
         Returns:
             Dict: Dictionary containing all status fields
         """
+        # Select each readback slot with 0xB8[3:0] and burst-read 0xBC-0xBD
+        reg_b8 = self.device.read_reg(pipe_addr, 0xB8) & 0xF0
         lock_rb_list = []
         for i in range(13):
-            self.device.write_bits(pipe_addr, 0xB8, 0, 4, i)
-            lock_rb_msb = self.device.read_reg(pipe_addr, 0xBC)
-            lock_rb_lsb = self.device.read_reg(pipe_addr, 0xBD)
+            self.device.write_reg(pipe_addr, 0xB8, reg_b8 | i)
+            lock_rb_msb, lock_rb_lsb = self.device.read_regs(pipe_addr, 0xBC, 2)
             lock_rb_list.append(lock_rb_msb << 8 | lock_rb_lsb)
 
+        reg_be = self.device.read_reg(pipe_addr, 0xBE)
+        reg_7c = self.device.read_reg(pipe_addr, 0x7C)
+
         result = {
             "i2c_tseq_lock_eq_cnt_rb": lock_rb_list[0],
             "i2c_tseq_lock_done_cnt_rb": lock_rb_list[1],
@@ -924,9 +1027,9 @@ class USBCommonClass:
             "i2c_tseq_lock_group_num_rb": (lock_rb_list[5] >> 2) & 31,
             "i2c_tseq_lock_pl_lock_rb": (lock_rb_list[5] >> 1) & 1,
             "i2c_tseq_lock_pass_rb": lock_rb_list[5] & 1,
-            "i2c_tseq_check_time_out_rb": self.device.read_bits(pipe_addr, 0xBE, 7, 1),
-            "i2c_tseq_resp_time_out_rb": self.device.read_bits(pipe_addr, 0xBE, 6, 1),
-            "i2c_ssvalid_rb": self.device.read_bits(pipe_addr, 0x7C, 7, 1),
+            "i2c_tseq_check_time_out_rb": (reg_be >> 7) & 1,
+            "i2c_tseq_resp_time_out_rb": (reg_be >> 6) & 1,
+            "i2c_ssvalid_rb": (reg_7c >> 7) & 1,
         }
 
         return result
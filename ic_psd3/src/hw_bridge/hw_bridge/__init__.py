@@ -6,6 +6,8 @@ across different hardware platforms (FTDI, Raspberry Pi, etc.).
 """
 
 from .interfaces import IDevice
+from .batch import WriteBatch
+from .shadow import ShadowDevice
 from .factory import create_device
 from .device_manager import DeviceManager, get_manager
 from .utils.config import load_config, Config
@@ -13,6 +15,8 @@ from .utils.config import load_config, Config
 __version__ = "0.1.0"
 __all__ = [
     "IDevice",
+    "WriteBatch",
+    "ShadowDevice",
     "create_device",
     "DeviceManager",
     "get_manager",
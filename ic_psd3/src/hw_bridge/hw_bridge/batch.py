@@ -0,0 +1,220 @@
+"""
+Deferred register writes for hw_bridge devices.
+
+A WriteBatch collects register writes and sends them to the underlying
+device as one packed stream, letting drivers chain the writes into as
+few bus transactions as they support.
+"""
+
+from typing import List, Optional, Sequence
+
+from .interfaces import IDevice
+
+
+class WriteBatch(IDevice):
+    """
+    Write-deferring proxy around an IDevice.
+
+    Writes are buffered in order and flushed with device.write_stream()
+    when the outermost ``with`` block exits. Reads flush pending writes
+    first, so read-modify-write helpers (write_bits) see current values.
+
+    While a batch is active, device.batch() returns the same batch, so
+    nested configuration calls join the outer batch and keep their order.
+    Writes made directly on the underlying device bypass the buffer.
+
+    Usage:
+        >>> with device.batch() as dev:
+        ...     dev.write_reg(0x09, 0x02, 0x13)
+        ...     dev.write_reg(0x09, 0x03, 0x01)
+
+    Attributes:
+        device: Underlying device the writes are sent to
+    """
+
+    def __init__(self, device: IDevice, dedupe: bool = False):
+        """
+        Initialize the batch.
+
+        Args:
+            device: Underlying device
+            dedupe: If True, drop writes that repeat the value last written
+                    to the same register within this batch
+        """
+        super().__init__(chip_addr=device.chip_addr, auto_increment=device.auto_increment)
+        self.device = device
+        self._dedupe = dedupe
+        self._pending = bytearray()
+        self._last: dict = {}
+        self._depth = 0
+
+    def open(self) -> None:
+        """Open the underlying device if needed."""
+        if not self.device.is_open:
+            self.device.open()
+
+    def close(self) -> None:
+        """Flush pending writes (the underlying device stays open)."""
+        self.flush()
+        self._shutdown_async()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the underlying device is open."""
+        return self.device.is_open
+
+    def batch(self, dedupe: bool = False) -> "WriteBatch":
+        """Return this batch; nested batches join the outer one."""
+        return self
+
+    def write_reg(self, addr1: int, addr2: int, value: int) -> None:
+        """
+        Queue a register write.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+        """
+        value = value & 0xFF
+        if self._dedupe:
+            key = (addr1, addr2)
+            if self._last.get(key) == value:
+                return
+            self._last[key] = value
+
+        self._pending += bytes((addr1, addr2, value))
+
+    def write_reg_multi(self, pages: Sequence[int], addr2: int, value: int) -> None:
+        """
+        Queue the same write on several pages.
+
+        Args:
+            pages: Page addresses / high bytes (8-bit each)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+        """
+        for addr1 in pages:
+            self.write_reg(addr1, addr2, value)
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Queue a packed stream of (addr1, addr2, value) triples.
+
+        Args:
+            stream: Packed register writes
+
+        Raises:
+            ValueError: If the stream length is not a multiple of 3
+        """
+        self._check_stream(stream)
+
+        if self._dedupe:
+            it = iter(stream)
+            for addr1, addr2, value in zip(it, it, it):
+                self.write_reg(addr1, addr2, value)
+        else:
+            self._pending += stream
+
+    def write_stream_repeat(self, stream: bytes, repeat: int, gap: float = 0.0) -> None:
+        """
+        Flush pending writes, then send every repeat to the device.
+
+        Repeats are never deduplicated: a repeated stream (e.g. a power-up
+        pulse train) is meant to reach the chip each time.
+
+        Args:
+            stream: Packed register writes
+            repeat: Number of times to write the stream
+            gap: Delay in seconds between repeats
+
+        Raises:
+            ValueError: If the stream length is not a multiple of 3
+        """
+        self._check_stream(stream)
+
+        self.flush()
+        self.device.write_stream_repeat(stream, repeat, gap)
+
+        if self._dedupe:
+            it = iter(stream)
+            for addr1, addr2, value in zip(it, it, it):
+                self._last[(addr1, addr2)] = value
+
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Flush pending writes, then send the block as one transaction.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            data: Values to write
+        """
+        self.flush()
+        self.device.write_block(addr1, addr2, data)
+
+        if self._dedupe:
+            for i, value in enumerate(data):
+                self._last[(addr1, addr2 + i)] = value & 0xFF
+
+    def write_page(self, addr_page: int, data_list: list) -> None:
+        """Flush pending writes, then write the page on the device."""
+        self.write_block(addr_page, 0, data_list)
+
+    def read_reg(self, addr1: int, addr2: int) -> int:
+        """
+        Flush pending writes, then read a register.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+
+        Returns:
+            int: The 8-bit value read from the register
+        """
+        self.flush()
+        return self.device.read_reg(addr1, addr2)
+
+    def read_regs(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Flush pending writes, then read consecutive registers.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
+
+        Returns:
+            List[int]: Values read from consecutive addresses
+        """
+        self.flush()
+        return self.device.read_regs(addr1, addr2, num)
+
+    def flush(self) -> None:
+        """
+        Send all pending writes to the underlying device.
+
+        Raises:
+            RuntimeError: If the write operation fails
+        """
+        if not self._pending:
+            return
+
+        stream = bytes(self._pending)
+        self._pending.clear()
+        self.device.write_stream(stream)
+
+    def __enter__(self) -> "WriteBatch":
+        """Enter the batch; the outermost entry makes it the active batch."""
+        if self._depth == 0:
+            self.device._active_batch = self
+        self._depth += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Leave the batch; the outermost exit flushes pending writes."""
+        self._depth -= 1
+        if self._depth == 0:
+            self.device._active_batch = None
+            self.flush()
+        return False
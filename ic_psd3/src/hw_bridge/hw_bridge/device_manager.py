@@ -6,11 +6,13 @@ Supports immediate or lazy initialization, named device access, and
 automatic cleanup on program exit.
 """
 
-import atexit
+import asyncio
 import weakref
-from typing import Dict, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
 from .interfaces import IDevice
 from .factory import create_device
+from .shadow import ShadowDevice
 
 
 class DeviceManager:
@@ -58,15 +60,20 @@ class DeviceManager:
             auto_open: If True, devices open immediately on register().
                       If False, devices open lazily on first access.
             register_atexit: If True, automatically close all devices
-                           on program exit.
+                           on program exit, or earlier if the manager is
+                           garbage collected.
         """
         self._auto_open = auto_open
         self._devices: Dict[str, IDevice] = {}  # name -> device instance
         self._configs: Dict[str, tuple] = {}  # name -> (driver_type, kwargs)
 
-        # Register cleanup on exit
+        # Close devices on exit or when the manager is collected; the
+        # finalizer holds only the device dict, not the manager itself
+        self._finalizer = None
         if register_atexit:
-            atexit.register(self._cleanup)
+            self._finalizer = weakref.finalize(
+                self, DeviceManager._finalize_devices, self._devices
+            )
 
     def register(self, name: str, driver_type: str, **kwargs) -> IDevice:
         """
@@ -81,6 +88,8 @@ class DeviceManager:
             **kwargs: Driver-specific parameters
                 - chip_addr: I2C device address
                 - i2c_port: I2C port/bus number
+                - shadow: If True, wrap the device in a ShadowDevice that
+                  skips writes of unchanged values
                 - Other driver-specific options
 
         Returns:
@@ -109,15 +118,86 @@ class DeviceManager:
 
         return None
 
+    def register_many(self, specs: List[tuple]) -> Dict[str, IDevice]:
+        """
+        Register several devices, opening them concurrently.
+
+        Opening a device is I/O-bound (USB enumeration, adapter setup), so
+        with auto_open=True all devices are opened in a thread pool and the
+        total time is that of the slowest open rather than the sum. If any
+        open fails, the devices opened by this call are closed again and
+        none of the specs stay registered.
+
+        Args:
+            specs: (name, driver_type, kwargs) for each device; kwargs are
+                   the same as for register()
+
+        Returns:
+            Dict[str, IDevice]: name -> opened device (None values if
+            auto_open=False)
+
+        Raises:
+            ValueError: If a name is already registered or repeated in specs
+            RuntimeError: If a device cannot be opened (when auto_open=True)
+
+        Examples:
+            >>> manager.register_many([
+            ...     ('tx', 'ftdi', {'i2c_port': 0, 'chip_addr': 0x58}),
+            ...     ('rx', 'ftdi', {'i2c_port': 1, 'chip_addr': 0x58}),
+            ... ])
+        """
+        specs = [(name, driver_type, dict(kwargs)) for name, driver_type, kwargs in specs]
+        names = [name for name, _, _ in specs]
+        for i, name in enumerate(names):
+            if name in self._configs:
+                raise ValueError(f"Device '{name}' is already registered")
+            if name in names[:i]:
+                raise ValueError(f"Device '{name}' is listed more than once")
+
+        if not self._auto_open:
+            for name, driver_type, kwargs in specs:
+                self._configs[name] = (driver_type, kwargs)
+            return {name: None for name in names}
+
+        devices: Dict[str, IDevice] = {}
+        errors = []
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(specs)))) as executor:
+            futures = {
+                name: executor.submit(self._open_device, name, driver_type, kwargs)
+                for name, driver_type, kwargs in specs
+            }
+            for name, future in futures.items():
+                try:
+                    devices[name] = future.result()
+                except RuntimeError as e:
+                    errors.append(str(e))
+
+        if errors:
+            for device in devices.values():
+                try:
+                    device.close()
+                except Exception:
+                    pass  # Ignore errors during close
+            raise RuntimeError("; ".join(errors))
+
+        for name, driver_type, kwargs in specs:
+            self._configs[name] = (driver_type, kwargs)
+        self._devices.update(devices)
+        return devices
+
     def _open_device(self, name: str, driver_type: str, kwargs: dict) -> IDevice:
         """
         Open a device and return the instance.
 
         Internal method to create and open a device.
         """
+        kwargs = dict(kwargs)
+        shadow = kwargs.pop("shadow", False)
         try:
             device = create_device(driver_type, **kwargs)
             device.open()
+            if shadow:
+                device = ShadowDevice(device)
             return device
         except Exception as e:
             raise RuntimeError(f"Failed to open device '{name}' ({driver_type}): {e}")
@@ -217,6 +297,8 @@ class DeviceManager:
                 device.close()
             except Exception as e:
                 errors.append(f"{name}: {e}")
+            finally:
+                device._shutdown_async()
 
         self._devices.clear()
         self._configs.clear()
@@ -224,17 +306,92 @@ class DeviceManager:
         if errors:
             raise RuntimeError(f"Errors closing devices: {'; '.join(errors)}")
 
-    def _cleanup(self) -> None:
+    async def __aenter__(self) -> "DeviceManager":
         """
-        Internal cleanup method called on program exit.
+        Async context manager entry.
+
+        Usage:
+            >>> async with DeviceManager() as manager:
+            ...     manager.register('tx', 'ftdi', i2c_port=0)
+            ...     manager.register('rx', 'ftdi', i2c_port=1)
+            ...     await asyncio.gather(
+            ...         manager['tx'].read_reg_async(0x26, 0x00),
+            ...         manager['rx'].read_reg_async(0x26, 0x00),
+            ...     )
+        """
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """
+        Async context manager exit; closes all devices in a worker thread.
+
+        close_all() also stops each device's async worker thread.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.close_all)
+        return False
+
+    @staticmethod
+    def _finalize_devices(devices: Dict[str, IDevice]) -> None:
+        """
+        Close devices on program exit or when their manager is collected.
 
         Automatically closes all devices to prevent resource leaks.
+
+        Args:
+            devices: The manager's name -> device dictionary
         """
-        if self._devices:
+        for device in list(devices.values()):
             try:
-                self.close_all()
+                device.close()
             except Exception:
                 pass  # Ignore errors during cleanup
+        devices.clear()
+
+    def run_parallel(
+        self,
+        func: Callable[[str, IDevice], Any],
+        names: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run a configuration function on several devices concurrently.
+
+        Each device gets its own thread, so bus latency on independent
+        adapters (e.g. TX and RX boards on separate FTDI ports) overlaps.
+        A device is never shared between threads. Registers of one chip
+        share a bus, so per-page work on a single device gains nothing
+        from this and should stay sequential.
+
+        Args:
+            func: Called as func(name, device) for each device
+            names: Device names to run on (default: all registered devices)
+
+        Returns:
+            Dict[str, Any]: name -> return value of func
+
+        Raises:
+            KeyError: If a device name is not registered
+            Exception: The first exception raised by func
+
+        Examples:
+            >>> manager.run_parallel(
+            ...     lambda name, dev: AVESChipConfig(manager, name).func_01_01_Chip_Power_Up()
+            ... )
+        """
+        if names is None:
+            names = self.list_devices()
+
+        # Open devices up front in this thread; lazy opens are not thread-safe
+        devices = {name: self[name] for name in names}
+        if len(devices) <= 1:
+            return {name: func(name, device) for name, device in devices.items()}
+
+        with ThreadPoolExecutor(max_workers=len(devices)) as executor:
+            futures = {
+                name: executor.submit(func, name, device)
+                for name, device in devices.items()
+            }
+            return {name: future.result() for name, future in futures.items()}
 
     def list_devices(self) -> list:
         """
@@ -10,8 +10,9 @@ import datetime
 import os
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from ..interfaces import IDevice
+from ..utils.regtable import coalesce_runs
 
 
 # FTDI Constants
@@ -90,6 +91,7 @@ class FtdiDriver(IDevice):
         aves_write: bool = False,
         aves_path: str = "./to_aves/",
         clock_rate: int = 400000,
+        auto_increment: bool = True,
         **kwargs,
     ):
         """
@@ -102,9 +104,11 @@ class FtdiDriver(IDevice):
             aves_write: Enable AVES script logging
             aves_path: Path for AVES script output
             clock_rate: I2C clock rate in Hz (default: 400000 = 400kHz)
+            auto_increment: If True (default), write_stream() sends consecutive
+                            registers as one auto-increment transaction
             **kwargs: Additional parameters (ignored)
         """
-        super().__init__(chip_addr=chip_addr)
+        super().__init__(chip_addr=chip_addr, auto_increment=auto_increment)
         self.i2c_port = i2c_port
         self._clock_rate = clock_rate
         self.aves_write = aves_write
@@ -126,6 +130,7 @@ class FtdiDriver(IDevice):
             self.write_to = os.path.join(aves_path, f"aves_{StyleTime}.txt")
         else:
             self.write_to = None
+        self._aves_file = None
 
         # Store DLL path
         self._dll_path = dll_path
@@ -294,7 +299,7 @@ class FtdiDriver(IDevice):
 
     def close(self) -> None:
         """
-        Close the FTDI device and release resources.
+        Close the FTDI device, release resources and flush the AVES log.
         """
         if self._ftd2xx and self._handle:
             try:
@@ -302,6 +307,8 @@ class FtdiDriver(IDevice):
             except Exception:
                 pass  # Ignore errors during close
 
+        self._close_aves()
+        self._shutdown_async()
         self._is_open = False
 
     def write_reg(self, addr1: int, addr2: int, value: int) -> None:
@@ -406,6 +413,75 @@ class FtdiDriver(IDevice):
 
         return int(rb_buffer[0])
 
+    def read_regs(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Read consecutive registers in one transaction.
+
+        Sends the address once, then reads num bytes after a repeated
+        start, relying on register auto-increment.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
+
+        Returns:
+            List[int]: Values read from consecutive addresses
+
+        Raises:
+            RuntimeError: If read fails
+            ValueError: If the block runs past the end of the page
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_block(addr2, num)
+        if num <= 0:
+            return []
+
+        # Write address (no stop)
+        w_options = (
+            I2C_TRANSFER_OPTIONS_START_BIT
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER_BYTES
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER
+        )
+
+        status = self._libmpsse.I2C_DeviceWrite(
+            self._handle,
+            ctypes.c_uint32(self.chip_addr),
+            ctypes.c_uint32(2),
+            (ctypes.c_uint8 * 2)(addr1, addr2),
+            ctypes.byref(self._bytes_written),
+            ctypes.c_uint32(w_options),
+        )
+
+        if status != FT_OK:
+            raise RuntimeError(f"I2C write address failed. Status: {status}")
+
+        # Read all bytes (with stop)
+        r_options = (
+            I2C_TRANSFER_OPTIONS_START_BIT
+            | I2C_TRANSFER_OPTIONS_STOP_BIT
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER_BYTES
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER
+        )
+
+        rb_buffer = (ctypes.c_uint8 * num)()
+
+        status = self._libmpsse.I2C_DeviceRead(
+            self._handle,
+            ctypes.c_uint32(self.chip_addr),
+            ctypes.c_uint32(num),
+            rb_buffer,
+            ctypes.byref(self._bytes_written),
+            ctypes.c_uint32(r_options),
+        )
+
+        if status != FT_OK:
+            raise RuntimeError(f"I2C read failed. Status: {status}")
+
+        return list(rb_buffer)
+
     def write_page(self, addr_page: int, data_list: List[int]) -> None:
         """
         Write a full page (256 bytes) efficiently.
@@ -449,10 +525,127 @@ class FtdiDriver(IDevice):
         if status != FT_OK:
             raise RuntimeError(f"I2C page write failed. Status: {status}")
 
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Write consecutive registers in a single I2C transaction.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            data: Values to write
+
+        Raises:
+            RuntimeError: If write fails
+            ValueError: If the block runs past the end of the page
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_block(addr2, len(data))
+
+        options = (
+            I2C_TRANSFER_OPTIONS_START_BIT
+            | I2C_TRANSFER_OPTIONS_STOP_BIT
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER_BYTES
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER
+        )
+
+        # Build command: [addr1, addr2, data...]
+        command = [addr1, addr2]
+        command.extend([d & 0xFF for d in data])
+
+        c_command = (ctypes.c_uint8 * len(command))(*command)
+
+        status = self._libmpsse.I2C_DeviceWrite(
+            self._handle,
+            ctypes.c_uint32(self.chip_addr),
+            ctypes.c_uint32(len(command)),
+            c_command,
+            ctypes.byref(self._bytes_written),
+            ctypes.c_uint32(options),
+        )
+
+        if status != FT_OK:
+            raise RuntimeError(f"I2C block write failed. Status: {status}")
+
+        # Log to AVES if enabled
+        if self.aves_write:
+            for i, value in enumerate(command[2:]):
+                self._log_to_aves(addr1, addr2 + i, value)
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Write a packed stream of (addr1, addr2, value) triples.
+
+        Consecutive registers on the same page are merged into one
+        auto-increment transaction unless auto_increment is False. All
+        transaction frames are laid out in a single ctypes buffer and
+        passed to libMPSSE by pointer offset, so no per-register ctypes
+        arrays are built.
+
+        Args:
+            stream: Packed register writes
+
+        Raises:
+            RuntimeError: If write fails
+            ValueError: If the stream length is not a multiple of 3
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_stream(stream)
+        if not stream:
+            return
+
+        # Frame each run as [addr1, addr2, data...] in one contiguous buffer
+        runs = coalesce_runs(stream, self.auto_increment)
+        frames = bytearray()
+        for addr1, addr2, values in runs:
+            frames.append(addr1)
+            frames.append(addr2)
+            frames += values
+
+        options = ctypes.c_uint32(
+            I2C_TRANSFER_OPTIONS_START_BIT
+            | I2C_TRANSFER_OPTIONS_STOP_BIT
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER_BYTES
+            | I2C_TRANSFER_OPTIONS_FAST_TRANSFER
+        )
+        chip_addr = ctypes.c_uint32(self.chip_addr)
+        bytes_written = ctypes.byref(self._bytes_written)
+
+        c_frames = (ctypes.c_uint8 * len(frames)).from_buffer(frames)
+        device_write = self._libmpsse.I2C_DeviceWrite
+        handle = self._handle
+
+        offset = 0
+        for addr1, addr2, values in runs:
+            size = len(values) + 2
+            status = device_write(
+                handle,
+                chip_addr,
+                ctypes.c_uint32(size),
+                ctypes.byref(c_frames, offset),
+                bytes_written,
+                options,
+            )
+            if status != FT_OK:
+                raise RuntimeError(
+                    f"I2C write failed at 0x{addr1:02X}{addr2:02X}. Status: {status}"
+                )
+            offset += size
+
+            # Log to AVES if enabled
+            if self.aves_write:
+                for i, value in enumerate(values):
+                    self._log_to_aves(addr1, addr2 + i, value)
+
     def _log_to_aves(self, addr1: int, addr2: int, value: int) -> None:
         """
         Log operation to AVES script file.
 
+        The file is opened on the first call and kept open until close().
+
         Args:
             addr1: Page address
             addr2: Offset address
@@ -461,13 +654,16 @@ class FtdiDriver(IDevice):
         if not self.write_to:
             return
 
+        # Kept open and buffered; flushed by close() or when the buffer fills
+        if self._aves_file is None:
+            self._aves_file = open(self.write_to, "a", buffering=1 << 16)
+
         # Format: B0 0101 FF
         device_addr = "b0"  # GS Coolink default
-        addr1_str = f"{addr1:02x}"
-        addr2_str = f"{addr2:02x}"
-        value_str = f"{value:02x}"
-
-        print_str = f"{device_addr} {addr1_str}{addr2_str} {value_str};\n"
+        self._aves_file.write(f"{device_addr} {addr1:02x}{addr2:02x} {value:02x};\n")
 
-        with open(self.write_to, "a") as f:
-            f.write(print_str)
+    def _close_aves(self) -> None:
+        """Flush and close the AVES log file if it is open."""
+        if self._aves_file is not None:
+            self._aves_file.close()
+            self._aves_file = None
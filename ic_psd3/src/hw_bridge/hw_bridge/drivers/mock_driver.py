@@ -5,7 +5,7 @@ This driver simulates I2C operations without requiring actual hardware.
 Useful for development, testing, and CI/CD pipelines.
 """
 
-from typing import List, Optional
+from typing import List, Optional, Sequence
 from ..interfaces import IDevice
 
 
@@ -27,6 +27,7 @@ class MockDriver(IDevice):
         chip_addr: int = 0x58,
         default_value: int = 0x00,
         verbose: bool = True,
+        auto_increment: bool = True,
         **kwargs,
     ):
         """
@@ -36,9 +37,11 @@ class MockDriver(IDevice):
             chip_addr: I2C device address (for interface compatibility)
             default_value: Default value for unread registers
             verbose: If True, print operations to stdout
+            auto_increment: Kept for interface compatibility; writes are
+                            always logged per register
             **kwargs: Additional parameters (ignored)
         """
-        super().__init__(chip_addr=chip_addr)
+        super().__init__(chip_addr=chip_addr, auto_increment=auto_increment)
         self._default_value = default_value & 0xFF
         self._verbose = verbose
 
@@ -67,8 +70,9 @@ class MockDriver(IDevice):
         """
         Close the mock device.
 
-        Clears the is_open flag.
+        Clears the is_open flag and stops the async worker thread.
         """
+        self._shutdown_async()
         self._is_open = False
         if self._verbose:
             print("[MOCK] Device closed")
@@ -216,3 +220,55 @@ class MockDriver(IDevice):
 
         if self._verbose:
             print(f"[MOCK] Write page 0x{addr_page:02X}: {len(data_list)} bytes")
+
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Write consecutive registers as one block.
+
+        Each register is logged individually so the write log matches
+        the equivalent sequence of write_reg calls.
+
+        Args:
+            addr1: Page address / high byte
+            addr2: Starting offset address / low byte
+            data: Values to write
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_block(addr2, len(data))
+
+        for i, value in enumerate(data):
+            value = value & 0xFF
+            self.registers[(addr1, addr2 + i)] = value
+            self.write_log.append((addr1, addr2 + i, value))
+        self._write_count += len(data)
+
+        if self._verbose:
+            print(
+                f"[MOCK] Write block 0x{addr1:02X}{addr2:02X}: {len(data)} bytes"
+            )
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Write a packed stream of (addr1, addr2, value) triples.
+
+        The stream is split with strided slices and stored with bulk
+        dict/list updates, so no Python-level loop runs per register.
+
+        Args:
+            stream: Packed register writes
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_stream(stream)
+
+        stream = bytes(stream)
+        entries = list(zip(stream[0::3], stream[1::3], stream[2::3]))
+        self.registers.update(zip(zip(stream[0::3], stream[1::3]), stream[2::3]))
+        self.write_log.extend(entries)
+        self._write_count += len(entries)
+
+        if self._verbose:
+            print(f"[MOCK] Write stream: {len(entries)} registers")
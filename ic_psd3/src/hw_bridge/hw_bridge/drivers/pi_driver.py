@@ -1,27 +1,35 @@
 """
 Raspberry Pi I2C driver.
 
-Linux I2C driver using i2ctransfer command-line tool.
+Linux I2C driver using a persistent /dev/i2c-N handle (smbus2), with the
+i2ctransfer command-line tool as a fallback.
 Compatible with Raspberry Pi and other Linux I2C buses.
 """
 
 import datetime
+import errno
+import random
+import shutil
 import subprocess
 import time
-from typing import List
+from typing import List, Optional, Sequence
 from ..interfaces import IDevice
+from ..utils.regtable import coalesce_runs
 
 
 class RaspberryPiDriver(IDevice):
     """
-    Raspberry Pi I2C driver using i2ctransfer.
+    Raspberry Pi I2C driver using smbus2 or i2ctransfer.
 
-    This driver uses the Linux i2ctransfer command-line tool to
-    communicate with I2C devices on Raspberry Pi and other Linux systems.
+    When smbus2 is installed, open() keeps /dev/i2c-N open and every
+    transfer is one I2C_RDWR ioctl on that handle. Otherwise each
+    transfer runs the Linux i2ctransfer command-line tool, which costs a
+    process spawn per call.
 
     Requirements:
         - Linux system with I2C support
-        - i2ctransfer tool (usually in i2c-tools package)
+        - smbus2 package (pip install smbus2), or the i2ctransfer tool
+          (usually in i2c-tools package)
         - Appropriate permissions to access I2C bus
 
     Attributes:
@@ -29,6 +37,19 @@ class RaspberryPiDriver(IDevice):
         chip_addr: I2C device address (7-bit format)
     """
 
+    # Kernel limit on messages per I2C_RDWR ioctl (one i2ctransfer call)
+    MAX_MSGS = 42
+
+    # Retry policy: exponential backoff from RETRY_DELAY_MIN up to
+    # RETRY_DELAY_MAX seconds, plus up to RETRY_DELAY_MIN of jitter
+    MAX_RETRIES = 10
+    RETRY_DELAY_MIN = 0.001
+    RETRY_DELAY_MAX = 0.05
+
+    # Bus errors that retrying cannot fix (no device at the address,
+    # adapter gone, handle closed)
+    FATAL_ERRNOS = frozenset((errno.ENXIO, errno.ENODEV, errno.EBADF))
+
     def __init__(
         self,
         i2c_port: int = 1,
@@ -36,6 +57,8 @@ class RaspberryPiDriver(IDevice):
         aves_write: bool = False,
         aves_path: str = "./to_aves/",
         i2ctransfer_path: str = "/usr/sbin/i2ctransfer",
+        use_smbus: Optional[bool] = None,
+        auto_increment: bool = True,
         **kwargs,
     ):
         """
@@ -47,12 +70,21 @@ class RaspberryPiDriver(IDevice):
             aves_write: Enable AVES script logging
             aves_path: Path for AVES script output
             i2ctransfer_path: Path to i2ctransfer executable
+            use_smbus: True to require smbus2, False to always use
+                       i2ctransfer, None to use smbus2 when installed
+            auto_increment: If True (default), write_stream() sends consecutive
+                            registers as one auto-increment message
             **kwargs: Additional parameters (ignored)
         """
-        super().__init__(chip_addr=chip_addr)
+        super().__init__(chip_addr=chip_addr, auto_increment=auto_increment)
         self.i2c_port = i2c_port
         self.aves_write = aves_write
         self.i2ctransfer_path = i2ctransfer_path
+        self.use_smbus = use_smbus
+
+        # Persistent bus handle and message factory (smbus2 only)
+        self._bus = None
+        self._i2c_msg = None
 
         # Setup AVES logging
         if self.aves_write:
@@ -64,6 +96,7 @@ class RaspberryPiDriver(IDevice):
             self.write_to = os.path.join(aves_path, f"aves_{StyleTime}.txt")
         else:
             self.write_to = None
+        self._aves_file = None
 
     def _run_command(self, cmd: str) -> str:
         """
@@ -93,14 +126,40 @@ class RaspberryPiDriver(IDevice):
         """
         Open the I2C device.
 
-        Verifies that the i2ctransfer tool is available.
+        Opens /dev/i2c-N through smbus2 if available (see use_smbus);
+        otherwise verifies that the i2ctransfer tool is available. With
+        use_smbus=None, a bus smbus2 cannot open also falls back to
+        i2ctransfer.
+
+        Raises:
+            ImportError: If use_smbus is True and smbus2 is not installed
+            RuntimeError: If use_smbus is True and the bus cannot be opened,
+                          or if neither smbus2 nor i2ctransfer can be used
         """
-        # Check if i2ctransfer exists
-        try:
-            result = self._run_command(f"which {self.i2ctransfer_path}")
-            if not result:
-                raise RuntimeError(f"i2ctransfer not found at {self.i2ctransfer_path}")
-        except RuntimeError:
+        if self.use_smbus is not False:
+            try:
+                from smbus2 import SMBus, i2c_msg
+            except ImportError:
+                if self.use_smbus:
+                    raise ImportError(
+                        "smbus2 is required when use_smbus=True. "
+                        "Install with: pip install smbus2"
+                    )
+            else:
+                try:
+                    self._bus = SMBus(self.i2c_port)
+                except OSError as e:
+                    if self.use_smbus:
+                        raise RuntimeError(
+                            f"Cannot open /dev/i2c-{self.i2c_port} with smbus2: {e}"
+                        ) from e
+                else:
+                    self._i2c_msg = i2c_msg
+                    self._is_open = True
+                    return
+
+        # Check if i2ctransfer exists (and is executable) without spawning a shell
+        if shutil.which(self.i2ctransfer_path) is None:
             raise RuntimeError(
                 f"i2ctransfer not found. Please install i2c-tools package.\n"
                 f"Path checked: {self.i2ctransfer_path}"
@@ -109,7 +168,12 @@ class RaspberryPiDriver(IDevice):
         self._is_open = True
 
     def close(self) -> None:
-        """Close the I2C device (no-op for this driver)."""
+        """Close the I2C device, release the bus handle and flush the AVES log."""
+        if self._bus is not None:
+            self._bus.close()
+            self._bus = None
+        self._close_aves()
+        self._shutdown_async()
         self._is_open = False
 
     def write_reg(self, addr1: int, addr2: int, value: int) -> None:
@@ -127,38 +191,239 @@ class RaspberryPiDriver(IDevice):
         if not self._is_open:
             raise RuntimeError("Device not open. Call open() first.")
 
-        # Build command: w3 = write 3 bytes
-        write_cmd = (
+        value = value & 0xFF
+        self._write_with_retry([bytes((addr1, addr2, value))])
+
+        # Log to AVES if enabled
+        if self.aves_write:
+            self._log_to_aves(addr1, addr2, value)
+
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Write consecutive registers in a single I2C message.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            data: Values to write
+
+        Raises:
+            RuntimeError: If write fails
+            ValueError: If the block runs past the end of the page
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_block(addr2, len(data))
+
+        values = [d & 0xFF for d in data]
+
+        # Address bytes followed by all data bytes
+        self._write_with_retry([bytes([addr1, addr2] + values)])
+
+        # Log to AVES if enabled
+        if self.aves_write:
+            for i, value in enumerate(values):
+                self._log_to_aves(addr1, addr2 + i, value)
+
+    def write_reg_multi(self, pages: Sequence[int], addr2: int, value: int) -> None:
+        """
+        Write the same value to the same offset on several pages.
+
+        All writes are chained as separate messages of one transfer
+        (up to MAX_MSGS per transfer).
+
+        Args:
+            pages: Page addresses / high bytes (8-bit each)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+
+        Raises:
+            RuntimeError: If write fails
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        value = value & 0xFF
+        self._write_msgs([bytes((addr1, addr2, value)) for addr1 in pages])
+
+        # Log to AVES if enabled
+        if self.aves_write:
+            for addr1 in pages:
+                self._log_to_aves(addr1, addr2, value)
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Write a packed stream of (addr1, addr2, value) triples.
+
+        Consecutive registers on the same page are merged into one
+        auto-increment message (unless auto_increment is False), and
+        messages are chained in one transfer (up to MAX_MSGS per transfer).
+
+        Args:
+            stream: Packed register writes
+
+        Raises:
+            RuntimeError: If write fails
+            ValueError: If the stream length is not a multiple of 3
+        """
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_stream(stream)
+
+        self._write_msgs(
+            [
+                bytes((addr1, addr2)) + bytes(values)
+                for addr1, addr2, values in coalesce_runs(stream, self.auto_increment)
+            ]
+        )
+
+        # Log to AVES if enabled
+        if self.aves_write:
+            it = iter(stream)
+            for addr1, addr2, value in zip(it, it, it):
+                self._log_to_aves(addr1, addr2, value)
+
+    def _write_msgs(self, msgs: List[bytes]) -> None:
+        """
+        Send write messages, MAX_MSGS per transfer.
+
+        Args:
+            msgs: Message payloads (address bytes followed by data)
+
+        Raises:
+            RuntimeError: If any transfer fails after retries
+        """
+        for start in range(0, len(msgs), self.MAX_MSGS):
+            self._write_with_retry(msgs[start : start + self.MAX_MSGS])
+
+    def _transfer_write(self, msgs: List[bytes]) -> None:
+        """
+        Send write messages as one combined transfer.
+
+        Args:
+            msgs: Message payloads (at most MAX_MSGS)
+
+        Raises:
+            RuntimeError: If the transfer fails
+        """
+        if self._bus is not None:
+            try:
+                self._bus.i2c_rdwr(
+                    *[self._i2c_msg.write(self.chip_addr, msg) for msg in msgs]
+                )
+            except OSError as e:
+                raise RuntimeError(f"I2C write failed: {e}") from e
+            return
+
+        chip = hex(self.chip_addr)
+        self._run_command(
             f"{self.i2ctransfer_path} -f -y {self.i2c_port} "
-            f"w3@{hex(self.chip_addr)} "
-            f"{hex(addr1)} {hex(addr2)} {hex(value)}"
+            + " ".join(
+                f"w{len(msg)}@{chip} " + " ".join(hex(b) for b in msg) for msg in msgs
+            )
         )
 
-        # Retry on failure
-        max_retries = 10
+    def _transfer_read(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Write the register address and read num bytes in one transfer.
+
+        The address write and the read are two messages of one I2C_RDWR
+        call (smbus2 or a single i2ctransfer command), so they are joined
+        by a repeated START with no STOP in between: no second bus
+        arbitration, and no other master can move the address pointer
+        before the read.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of bytes to read
+
+        Returns:
+            List[int]: The bytes read
+
+        Raises:
+            RuntimeError: If the transfer fails
+            ValueError: If the i2ctransfer output cannot be parsed
+        """
+        if self._bus is not None:
+            write = self._i2c_msg.write(self.chip_addr, [addr1, addr2])
+            read = self._i2c_msg.read(self.chip_addr, num)
+            try:
+                self._bus.i2c_rdwr(write, read)
+            except OSError as e:
+                raise RuntimeError(f"I2C read failed: {e}") from e
+            return list(read)
+
+        # w2 (write 2 bytes for address), r{num} (read num bytes)
+        read_out = self._run_command(
+            f"{self.i2ctransfer_path} -f -y {self.i2c_port} "
+            f"w2@{hex(self.chip_addr)} {hex(addr1)} {hex(addr2)} r{num}"
+        )
+        return [int(v, 16) for v in read_out.split()]
+
+    def _write_with_retry(self, msgs: List[bytes]) -> None:
+        """
+        Send write messages as one transfer, retrying on failure.
+
+        Args:
+            msgs: Message payloads (at most MAX_MSGS)
+
+        Raises:
+            RuntimeError: If all retries fail
+        """
+        max_retries = self.MAX_RETRIES
         for attempt in range(max_retries):
             try:
-                self._run_command(write_cmd)
-                break
+                self._transfer_write(msgs)
+                return
             except RuntimeError as e:
+                if self._is_fatal(e):
+                    raise
                 if attempt < max_retries - 1:
                     print(
                         f"[PI] Write failed, retrying ({attempt + 1}/{max_retries})..."
                     )
-                    time.sleep(0.1)
+                    time.sleep(self._retry_delay(attempt))
                 else:
                     raise RuntimeError(
                         f"Write failed after {max_retries} attempts: {e}"
                     )
 
-        # Log to AVES if enabled
-        if self.aves_write:
-            self._log_to_aves(addr1, addr2, value)
+    def _retry_delay(self, attempt: int) -> float:
+        """
+        Return the backoff delay before the next retry.
+
+        Args:
+            attempt: Zero-based number of the attempt that just failed
+
+        Returns:
+            float: Delay in seconds
+        """
+        delay = min(self.RETRY_DELAY_MAX, self.RETRY_DELAY_MIN * (2**attempt))
+        return delay + random.random() * self.RETRY_DELAY_MIN
+
+    def _is_fatal(self, error: Exception) -> bool:
+        """
+        Return True if a failed transfer should not be retried.
+
+        Args:
+            error: Exception raised by _transfer_write or _transfer_read
+
+        Returns:
+            bool: True if the underlying OS error is in FATAL_ERRNOS
+        """
+        cause = error.__cause__
+        return isinstance(cause, OSError) and cause.errno in self.FATAL_ERRNOS
 
     def read_reg(self, addr1: int, addr2: int) -> int:
         """
         Read a value from a register.
 
+        The address write and the read are sent as one combined
+        write-then-read transfer (see _transfer_read).
+
         Args:
             addr1: Page address / high byte (8-bit)
             addr2: Offset address / low byte (8-bit)
@@ -172,36 +437,49 @@ class RaspberryPiDriver(IDevice):
         if not self._is_open:
             raise RuntimeError("Device not open. Call open() first.")
 
-        # Build command: w2 (write 2 bytes for address), r1 (read 1 byte)
-        read_cmd = (
-            f"{self.i2ctransfer_path} -f -y {self.i2c_port} "
-            f"w2@{hex(self.chip_addr)} "
-            f"{hex(addr1)} {hex(addr2)} "
-            f"r1"
-        )
+        return self._read_with_retry(addr1, addr2, 1)[0]
+
+    def _read_with_retry(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Read num consecutive registers in one transfer, retrying on failure.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
 
-        # Retry on failure
-        max_retries = 10
+        Returns:
+            List[int]: Values read from consecutive addresses
+
+        Raises:
+            RuntimeError: If all retries fail
+        """
+        max_retries = self.MAX_RETRIES
         for attempt in range(max_retries):
             try:
-                read_out = self._run_command(read_cmd)
-                # Parse hex string to int
-                return int(read_out, 16)
+                values = self._transfer_read(addr1, addr2, num)
+                if len(values) != num:
+                    raise ValueError(f"Expected {num} bytes, got {len(values)}")
+                return values
             except (RuntimeError, ValueError) as e:
+                if self._is_fatal(e):
+                    raise
                 if attempt < max_retries - 1:
                     print(
                         f"[PI] Read failed, retrying ({attempt + 1}/{max_retries})..."
                     )
-                    time.sleep(0.1)
+                    time.sleep(self._retry_delay(attempt))
                 else:
                     raise RuntimeError(f"Read failed after {max_retries} attempts: {e}")
 
-        return 0  # Should never reach here
+        return []  # Should never reach here
 
     def _log_to_aves(self, addr1: int, addr2: int, value: int) -> None:
         """
         Log operation to AVES script file.
 
+        The file is opened on the first call and kept open until close().
+
         Args:
             addr1: Page address
             addr2: Offset address
@@ -210,32 +488,19 @@ class RaspberryPiDriver(IDevice):
         if not self.write_to:
             return
 
+        # Kept open and buffered; flushed by close() or when the buffer fills
+        if self._aves_file is None:
+            self._aves_file = open(self.write_to, "a", buffering=1 << 16)
+
         # Format: B0 0101 FF
         device_addr = f"{(self.chip_addr << 1):02x}"
-        addr1_str = f"{addr1:02x}"
-        addr2_str = f"{addr2:02x}"
-        value_str = f"{value:02x}"
+        self._aves_file.write(f"{device_addr} {addr1:02x}{addr2:02x} {value:02x};\n")
 
-        print_str = f"{device_addr} {addr1_str}{addr2_str} {value_str};\n"
-
-        with open(self.write_to, "a") as f:
-            f.write(print_str)
-
-    def write_bits(
-        self, addr1: int, addr2: int, lsb: int, bits: int, value: int
-    ) -> None:
-        """
-        Write specific bits to a register.
-
-        Uses parent implementation.
-        """
-        super().write_bits(addr1, addr2, lsb, bits, value)
-
-        # Also log to AVES if enabled
-        if self.aves_write:
-            # Read back to get final value for logging
-            final_value = self.read_reg(addr1, addr2)
-            self._log_to_aves(addr1, addr2, final_value)
+    def _close_aves(self) -> None:
+        """Flush and close the AVES log file if it is open."""
+        if self._aves_file is not None:
+            self._aves_file.close()
+            self._aves_file = None
 
     def read_bits(self, addr1: int, addr2: int, lsb: int, bits: int) -> int:
         """
@@ -247,8 +512,28 @@ class RaspberryPiDriver(IDevice):
 
     def read_regs(self, addr1: int, addr2: int, num: int) -> List[int]:
         """
-        Read multiple consecutive registers.
+        Read consecutive registers in one transaction.
 
-        Uses parent implementation.
+        Sends the address once, then reads num bytes after a repeated
+        start, relying on register auto-increment.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
+
+        Returns:
+            List[int]: Values read from consecutive addresses
+
+        Raises:
+            RuntimeError: If read fails
+            ValueError: If the block runs past the end of the page
         """
-        return super().read_regs(addr1, addr2, num)
+        if not self._is_open:
+            raise RuntimeError("Device not open. Call open() first.")
+
+        self._check_block(addr2, num)
+        if num <= 0:
+            return []
+
+        return self._read_with_retry(addr1, addr2, num)
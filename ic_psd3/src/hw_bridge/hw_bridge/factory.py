@@ -5,6 +5,7 @@ Provides a unified way to instantiate different hardware drivers
 based on configuration or driver type specification.
 """
 
+from functools import lru_cache
 from typing import Optional, Dict, Any
 from .interfaces import IDevice
 
@@ -113,10 +114,14 @@ def get_available_drivers() -> list:
     return ["ftdi", "pi", "mock"]
 
 
+@lru_cache(maxsize=None)
 def auto_detect_driver() -> Optional[str]:
     """
     Auto-detect the appropriate driver for the current platform.
 
+    The platform cannot change while the process runs, so the result is
+    computed once and cached.
+
     Returns:
         str: Recommended driver type ('ftdi' for Windows, 'pi' for Linux)
         None: If platform cannot be determined
@@ -5,8 +5,14 @@ All hardware drivers must implement this interface to ensure
 compatibility with the hardware bridge library.
 """
 
+import asyncio
+import time
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Iterable, List, Sequence, Tuple
+
+from .utils.regtable import coalesce_runs, pack_table
 
 
 class IDevice(ABC):
@@ -18,16 +24,25 @@ class IDevice(ABC):
     platforms (FTDI, Raspberry Pi, Mock, etc.).
     """
 
-    def __init__(self, chip_addr: int = 0x58, **kwargs):
+    # Field mask for each bit count 0-8 (0 -> 0x00, 3 -> 0x07, 8 -> 0xFF)
+    _BIT_MASKS = tuple((1 << bits) - 1 for bits in range(9))
+
+    def __init__(self, chip_addr: int = 0x58, auto_increment: bool = True, **kwargs):
         """
         Initialize the device.
 
         Args:
             chip_addr: I2C device address (7-bit format, default 0x58)
+            auto_increment: If True (default), write_stream() merges consecutive
+                            offsets on one page into one auto-increment burst;
+                            False writes every register in its own transaction
             **kwargs: Additional driver-specific parameters
         """
         self.chip_addr = chip_addr
+        self.auto_increment = auto_increment
         self._is_open = False
+        self._active_batch = None
+        self._async_executor = None
 
     @abstractmethod
     def open(self) -> None:
@@ -44,6 +59,9 @@ class IDevice(ABC):
     def close(self) -> None:
         """
         Close the device connection and release resources.
+
+        Implementations also stop the async worker thread with
+        _shutdown_async().
         """
         pass
 
@@ -109,17 +127,98 @@ class IDevice(ABC):
         # Read current value
         old_value = self.read_reg(addr1, addr2)
 
-        # Calculate new value
-        shifted_value = (value & bit_mask) << lsb
-        shifted_mask = bit_mask << lsb
-        clear_mask = (~shifted_mask) & 0xFF
-
         # Clear target bits and set new value
-        new_value = (old_value & clear_mask) | shifted_value
+        new_value = (old_value & ~(bit_mask << lsb)) | ((value & bit_mask) << lsb)
 
         # Write back
         self.write_reg(addr1, addr2, new_value)
 
+    def write_reg_rmw(
+        self,
+        addr1: int,
+        addr2: int,
+        mask: int,
+        value: int,
+        skip_unchanged: bool = True,
+    ) -> bool:
+        """
+        Update the masked bits of a register, skipping the write if unchanged.
+
+        Reads the register, computes (old & ~mask) | (value & mask) and
+        writes it back only when it differs from the value read. With
+        skip_unchanged=False it is a plain read-modify-write that always
+        writes, for write-triggered or self-clearing bits.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            mask: Bits to update (8-bit)
+            value: New value for the masked bits (8-bit), already shifted into
+                   position: only the bits set in mask are used
+            skip_unchanged: If False, write even when the value is unchanged
+
+        Returns:
+            bool: True if the register was written
+
+        Raises:
+            RuntimeError: If the read or write operation fails
+        """
+        old_value = self.read_reg(addr1, addr2)
+        new_value = (old_value & ~mask & 0xFF) | (value & mask & 0xFF)
+        if skip_unchanged and new_value == old_value:
+            return False
+
+        self.write_reg(addr1, addr2, new_value)
+        return True
+
+    def write_reg_and_wait(
+        self,
+        addr1: int,
+        addr2: int,
+        value: int,
+        status_addr1: int,
+        status_addr2: int,
+        mask: int,
+        expected: int,
+        timeout: float = 1.0,
+        poll_interval: float = 0.001,
+    ) -> int:
+        """
+        Write a register, then poll a status register until it matches.
+
+        Args:
+            addr1: Page address / high byte of the register to write
+            addr2: Offset address / low byte of the register to write
+            value: Value to write (8-bit)
+            status_addr1: Page address of the status register
+            status_addr2: Offset address of the status register
+            mask: Status bits to compare
+            expected: Expected value of the masked status bits
+            timeout: Maximum time to wait in seconds
+            poll_interval: Delay between status reads in seconds
+
+        Returns:
+            int: The last status value read
+
+        Raises:
+            RuntimeError: If the status does not match within the timeout,
+                or a read/write operation fails
+        """
+        self.write_reg(addr1, addr2, value)
+
+        read_reg = self.read_reg
+        deadline = time.monotonic() + timeout
+        while True:
+            status = read_reg(status_addr1, status_addr2)
+            if status & mask == expected & mask:
+                return status
+            if time.monotonic() >= deadline:
+                raise RuntimeError(
+                    f"Timeout waiting for 0x{status_addr1:02X}{status_addr2:02X} & 0x{mask:02X}"
+                    f" == 0x{expected & mask:02X} (last 0x{status:02X})"
+                )
+            time.sleep(poll_interval)
+
     def read_bits(self, addr1: int, addr2: int, lsb: int, bits: int) -> int:
         """
         Read specific bits from a register.
@@ -164,12 +263,8 @@ class IDevice(ABC):
         Raises:
             RuntimeError: If any read operation fails
         """
-        read_list = []
-        for i in range(num):
-            addr_loop = addr2 + i
-            read_value = self.read_reg(addr1, addr_loop)
-            read_list.append(read_value)
-        return read_list
+        read_reg = self.read_reg
+        return [read_reg(addr1, addr2 + i) for i in range(num)]
 
     def write_page(self, addr_page: int, data_list: List[int]) -> None:
         """
@@ -191,8 +286,231 @@ class IDevice(ABC):
             raise ValueError(f"Data list too long: {len(data_list)} bytes (max 256)")
 
         # Default implementation: write byte by byte
+        write_reg = self.write_reg
         for i, data in enumerate(data_list):
-            self.write_reg(addr_page, i, data & 0xFF)
+            write_reg(addr_page, i, data & 0xFF)
+
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Write consecutive registers starting at (addr1, addr2).
+
+        Drivers that support register auto-increment override this to
+        send [addr1, addr2, data...] as a single I2C transaction.
+        Default implementation writes bytes one by one.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            data: Values to write (bytes or list of 8-bit ints)
+
+        Raises:
+            RuntimeError: If the write operation fails
+            ValueError: If the block runs past the end of the page
+        """
+        self._check_block(addr2, len(data))
+
+        write_reg = self.write_reg
+        for i, value in enumerate(data):
+            write_reg(addr1, addr2 + i, value & 0xFF)
+
+    def write_reg_multi(self, pages: Sequence[int], addr2: int, value: int) -> None:
+        """
+        Write the same value to the same offset on several pages.
+
+        Drivers that can chain messages override this to send all
+        writes in one bus transaction. Default implementation writes
+        pages one by one.
+
+        Args:
+            pages: Page addresses / high bytes (8-bit each)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+
+        Raises:
+            RuntimeError: If the write operation fails
+        """
+        write_reg = self.write_reg
+        for addr1 in pages:
+            write_reg(addr1, addr2, value)
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Write a packed stream of register writes.
+
+        The stream holds (addr1, addr2, value) triples, 3 bytes per
+        register, as built by hw_bridge.utils.regtable.pack_table().
+        Drivers override this to walk the buffer without per-register
+        Python overhead. Default implementation merges consecutive offsets
+        on one page into write_block() bursts (unless auto_increment is
+        False) and writes the rest one by one.
+
+        Args:
+            stream: Packed register writes (bytes, bytearray or memoryview)
+
+        Raises:
+            RuntimeError: If the write operation fails
+            ValueError: If the stream length is not a multiple of 3
+        """
+        self._check_stream(stream)
+
+        write_reg = self.write_reg
+        write_block = self.write_block
+        for addr1, addr2, values in coalesce_runs(stream, self.auto_increment):
+            if len(values) == 1:
+                write_reg(addr1, addr2, values[0])
+            else:
+                write_block(addr1, addr2, values)
+
+    def write_stream_repeat(self, stream: bytes, repeat: int, gap: float = 0.0) -> None:
+        """
+        Write a packed stream several times, e.g. a power-up pulse train.
+
+        Without a gap the repeats are concatenated and sent as one stream,
+        so the driver can chain them into as few transactions as it allows.
+
+        Args:
+            stream: Packed (addr1, addr2, value) triples
+            repeat: Number of times to write the stream
+            gap: Delay in seconds between repeats (0 sends them back to back)
+
+        Raises:
+            RuntimeError: If the write operation fails
+            ValueError: If the stream length is not a multiple of 3
+        """
+        if gap <= 0:
+            self.write_stream(bytes(stream) * repeat)
+            return
+
+        for i in range(repeat):
+            if i:
+                time.sleep(gap)
+            self.write_stream(stream)
+
+    def write_reg_batch(self, writes: Iterable[Tuple[int, int, int]]) -> None:
+        """
+        Write a list of registers in as few transactions as the driver allows.
+
+        Args:
+            writes: Iterable of (addr1, addr2, value) triples, written in order
+
+        Raises:
+            RuntimeError: If the write operation fails
+            ValueError: If any field is outside 0x00-0xFF
+        """
+        self.write_stream(pack_table(writes))
+
+    async def _run_async(self, func: Callable, *args) -> Any:
+        """
+        Run a blocking device call in this device's worker thread.
+
+        Each device has a single worker thread, so async calls on one
+        device run one at a time in the order they were awaited, while
+        calls on different devices overlap.
+
+        Args:
+            func: Bound device method to call
+            *args: Arguments for func
+
+        Returns:
+            Any: The return value of func
+        """
+        if self._async_executor is None:
+            self._async_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"hw_bridge-0x{self.chip_addr:02X}"
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._async_executor, partial(func, *args))
+
+    def _shutdown_async(self) -> None:
+        """
+        Stop this device's async worker thread, if one was started.
+
+        Calls already queued still run; a later async call starts a new
+        worker.
+        """
+        executor = self._async_executor
+        if executor is not None:
+            self._async_executor = None
+            executor.shutdown(wait=False)
+
+    async def write_reg_async(self, addr1: int, addr2: int, value: int) -> None:
+        """
+        Awaitable write_reg(); the bus transfer runs in a worker thread.
+
+        Usage:
+            >>> await asyncio.gather(
+            ...     tx.write_reg_async(0x09, 0x02, 0x13),
+            ...     rx.write_reg_async(0x09, 0x02, 0x13),
+            ... )
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+        """
+        await self._run_async(self.write_reg, addr1, addr2, value)
+
+    async def read_reg_async(self, addr1: int, addr2: int) -> int:
+        """
+        Awaitable read_reg(); the bus transfer runs in a worker thread.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+
+        Returns:
+            int: The 8-bit value read from the register
+        """
+        return await self._run_async(self.read_reg, addr1, addr2)
+
+    async def read_regs_async(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Awaitable read_regs(); the bus transfer runs in a worker thread.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
+
+        Returns:
+            List[int]: Values read from consecutive addresses
+        """
+        return await self._run_async(self.read_regs, addr1, addr2, num)
+
+    async def write_stream_async(self, stream: bytes) -> None:
+        """
+        Awaitable write_stream(); the bus transfers run in a worker thread.
+
+        Args:
+            stream: Packed register writes
+        """
+        await self._run_async(self.write_stream, stream)
+
+    def batch(self, dedupe: bool = False):
+        """
+        Defer register writes and send them as one packed stream.
+
+        Returns the active batch if one is already open on this device,
+        so nested calls join it and write order is preserved.
+
+        Args:
+            dedupe: If True, drop writes that repeat the value last written
+                    to the same register within the batch
+
+        Returns:
+            WriteBatch: Batch proxy to use as a context manager
+        """
+        if self._active_batch is not None:
+            return self._active_batch
+
+        from .batch import WriteBatch
+
+        return WriteBatch(self, dedupe=dedupe)
+
+    @property
+    def in_batch(self) -> bool:
+        """Return True if a write batch is active on this device."""
+        return self._active_batch is not None
 
     @property
     def is_open(self) -> bool:
@@ -214,10 +532,40 @@ class IDevice(ABC):
         """
         if bits <= 0:
             return 0x00
-        elif bits >= 8:
-            return 0xFF
-        else:
-            return (1 << bits) - 1
+        return IDevice._BIT_MASKS[bits if bits < 8 else 8]
+
+    @staticmethod
+    def _check_block(addr2: int, num: int) -> None:
+        """
+        Validate that a block of registers stays within one page.
+
+        Args:
+            addr2: Starting offset address / low byte
+            num: Number of registers in the block
+
+        Raises:
+            ValueError: If the block runs past offset 0xFF
+        """
+        if addr2 + num > 256:
+            raise ValueError(
+                f"Block too long: {num} bytes from offset 0x{addr2:02X} (max 0xFF)"
+            )
+
+    @staticmethod
+    def _check_stream(stream: bytes) -> None:
+        """
+        Validate that a packed register stream holds whole triples.
+
+        Args:
+            stream: Packed register writes
+
+        Raises:
+            ValueError: If the stream length is not a multiple of 3
+        """
+        if len(stream) % 3:
+            raise ValueError(
+                f"Stream length must be a multiple of 3, got {len(stream)} bytes"
+            )
 
     def __enter__(self):
         """Context manager entry."""
@@ -0,0 +1,297 @@
+"""
+Shadow register map for hw_bridge devices.
+
+A ShadowDevice remembers the last value written to (or read from) each
+register and skips writes that would not change it.
+"""
+
+from typing import List, Optional, Sequence
+
+from .interfaces import IDevice
+
+
+class ShadowDevice(IDevice):
+    """
+    Write-skipping proxy around an IDevice.
+
+    Every write updates a shadow map of (addr1, addr2) -> value; a write
+    whose value already matches the shadow is not sent. Reads always go
+    to the device and refresh the shadow.
+
+    The shadow is only valid while nothing else changes the chip: call
+    invalidate() after a reset or power cycle. Registers that must be
+    rewritten even when unchanged (self-clearing triggers, FIFOs) should
+    be on a page listed in volatile_pages.
+
+    Usage:
+        >>> dev = ShadowDevice(create_device("ftdi", i2c_port=0))
+        >>> dev.write_reg(0x09, 0x02, 0x13)  # sent
+        >>> dev.write_reg(0x09, 0x02, 0x13)  # skipped
+        >>> dev.invalidate()                  # after chip reset
+
+    Attributes:
+        device: Underlying device the writes are sent to
+        shadow: Dictionary of known register values (key: (addr1, addr2))
+        enabled: If False, all writes are sent (the shadow is still updated)
+    """
+
+    def __init__(self, device: IDevice, volatile_pages: Sequence[int] = ()):
+        """
+        Initialize the shadow proxy.
+
+        Args:
+            device: Underlying device
+            volatile_pages: Pages whose writes are never skipped
+        """
+        super().__init__(chip_addr=device.chip_addr, auto_increment=device.auto_increment)
+        self.device = device
+        self.shadow: dict = {}
+        self.enabled = True
+        self._volatile_pages = frozenset(volatile_pages)
+        self._skipped = 0
+
+    def open(self) -> None:
+        """Open the underlying device."""
+        self.device.open()
+
+    def close(self) -> None:
+        """Close the underlying device and drop the shadow."""
+        self.device.close()
+        self._shutdown_async()
+        self.shadow.clear()
+
+    @property
+    def is_open(self) -> bool:
+        """Return True if the underlying device is open."""
+        return self.device.is_open
+
+    @property
+    def skipped(self) -> int:
+        """Number of writes skipped because the value was unchanged."""
+        return self._skipped
+
+    def invalidate(self, addr1: Optional[int] = None) -> None:
+        """
+        Forget known register values.
+
+        Args:
+            addr1: Page to forget; None forgets all pages
+        """
+        if addr1 is None:
+            self.shadow.clear()
+            return
+
+        for key in [key for key in self.shadow if key[0] == addr1]:
+            del self.shadow[key]
+
+    def _is_current(self, addr1: int, addr2: int, value: int) -> bool:
+        """Return True if the write can be skipped."""
+        return (
+            self.enabled
+            and addr1 not in self._volatile_pages
+            and self.shadow.get((addr1, addr2)) == value
+        )
+
+    def write_reg(self, addr1: int, addr2: int, value: int) -> None:
+        """
+        Write a register unless the shadow already holds the value.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+        """
+        value = value & 0xFF
+        if self._is_current(addr1, addr2, value):
+            self._skipped += 1
+            return
+
+        self.device.write_reg(addr1, addr2, value)
+        self.shadow[(addr1, addr2)] = value
+
+    def write_reg_multi(self, pages: Sequence[int], addr2: int, value: int) -> None:
+        """
+        Write the same value on several pages, skipping unchanged ones.
+
+        Args:
+            pages: Page addresses / high bytes (8-bit each)
+            addr2: Offset address / low byte (8-bit)
+            value: Value to write (8-bit)
+        """
+        value = value & 0xFF
+        pending = [addr1 for addr1 in pages if not self._is_current(addr1, addr2, value)]
+        self._skipped += len(pages) - len(pending)
+        if not pending:
+            return
+
+        self.device.write_reg_multi(pending, addr2, value)
+        for addr1 in pending:
+            self.shadow[(addr1, addr2)] = value
+
+    def write_block(self, addr1: int, addr2: int, data: Sequence[int]) -> None:
+        """
+        Write a block unless every register in it is unchanged.
+
+        A block with any changed register is sent whole, as one transaction.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            data: Values to write
+        """
+        values = [d & 0xFF for d in data]
+        if all(self._is_current(addr1, addr2 + i, v) for i, v in enumerate(values)):
+            self._skipped += len(values)
+            return
+
+        self.device.write_block(addr1, addr2, values)
+        for i, value in enumerate(values):
+            self.shadow[(addr1, addr2 + i)] = value
+
+    def write_page(self, addr_page: int, data_list: List[int]) -> None:
+        """Write a full page unless it is unchanged."""
+        self.write_block(addr_page, 0, data_list)
+
+    def write_stream(self, stream: bytes) -> None:
+        """
+        Write a packed stream, dropping registers that are unchanged.
+
+        Only writes made before the stream count: a register written
+        earlier in the same stream is always written again, so sequences
+        repeated within one stream (a flattened triple Chip_Power_Up, a
+        pulse) reach the chip as often as they were issued.
+
+        Args:
+            stream: Packed (addr1, addr2, value) triples
+
+        Raises:
+            ValueError: If the stream length is not a multiple of 3
+        """
+        self._check_stream(stream)
+
+        pending = bytearray()
+        shadow = self.shadow
+        written = set()
+        it = iter(stream)
+        for addr1, addr2, value in zip(it, it, it):
+            key = (addr1, addr2)
+            if key not in written and self._is_current(addr1, addr2, value):
+                self._skipped += 1
+                continue
+            pending += bytes((addr1, addr2, value))
+            shadow[key] = value
+            written.add(key)
+
+        if pending:
+            self.device.write_stream(bytes(pending))
+
+    def write_stream_repeat(self, stream: bytes, repeat: int, gap: float = 0.0) -> None:
+        """
+        Write a repeated stream in full, skipping nothing.
+
+        A repeat is issued on purpose (e.g. a power-up pulse train), so
+        every copy is sent even when the shadow already holds its values.
+
+        Args:
+            stream: Packed (addr1, addr2, value) triples
+            repeat: Number of times to write the stream
+            gap: Delay in seconds between repeats
+
+        Raises:
+            ValueError: If the stream length is not a multiple of 3
+        """
+        self._check_stream(stream)
+
+        self.device.write_stream_repeat(stream, repeat, gap)
+
+        shadow = self.shadow
+        it = iter(stream)
+        for addr1, addr2, value in zip(it, it, it):
+            shadow[(addr1, addr2)] = value
+
+    def write_bits(
+        self, addr1: int, addr2: int, lsb: int, bits: int, value: int
+    ) -> None:
+        """
+        Write specific bits, using the shadow value instead of a read if known.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            lsb: Least significant bit position (0-7)
+            bits: Number of bits to write (1-8)
+            value: Value to write (will be masked to fit in 'bits' width)
+        """
+        bit_mask = self._bits_to_mask(bits)
+        self.write_reg_rmw(addr1, addr2, bit_mask << lsb, (value & bit_mask) << lsb)
+
+    def write_reg_rmw(
+        self,
+        addr1: int,
+        addr2: int,
+        mask: int,
+        value: int,
+        skip_unchanged: bool = True,
+    ) -> bool:
+        """
+        Update the masked bits of a register, reading it only if unknown.
+
+        When the shadow holds the register, its value stands in for the
+        read, so an RMW costs at most one write and no reads.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+            mask: Bits to update (8-bit)
+            value: New value for the masked bits (8-bit), already shifted into
+                   position: only the bits set in mask are used
+            skip_unchanged: If False, write even when the value is unchanged
+
+        Returns:
+            bool: True if the register was written
+        """
+        old_value = self.shadow.get((addr1, addr2))
+        if old_value is None or not self.enabled or addr1 in self._volatile_pages:
+            old_value = self.read_reg(addr1, addr2)
+
+        new_value = (old_value & ~mask & 0xFF) | (value & mask & 0xFF)
+        if skip_unchanged and new_value == old_value:
+            self._skipped += 1
+            return False
+
+        self.device.write_reg(addr1, addr2, new_value)
+        self.shadow[(addr1, addr2)] = new_value
+        return True
+
+    def read_reg(self, addr1: int, addr2: int) -> int:
+        """
+        Read a register from the device and refresh the shadow.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Offset address / low byte (8-bit)
+
+        Returns:
+            int: The 8-bit value read from the register
+        """
+        value = self.device.read_reg(addr1, addr2)
+        self.shadow[(addr1, addr2)] = value
+        return value
+
+    def read_regs(self, addr1: int, addr2: int, num: int) -> List[int]:
+        """
+        Read consecutive registers from the device and refresh the shadow.
+
+        Args:
+            addr1: Page address / high byte (8-bit)
+            addr2: Starting offset address / low byte (8-bit)
+            num: Number of registers to read
+
+        Returns:
+            List[int]: Values read from consecutive addresses
+        """
+        values = self.device.read_regs(addr1, addr2, num)
+        shadow = self.shadow
+        for i, value in enumerate(values):
+            shadow[(addr1, addr2 + i)] = value
+        return values
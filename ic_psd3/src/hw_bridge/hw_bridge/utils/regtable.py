@@ -0,0 +1,153 @@
+"""
+Register table helpers for hw_bridge.
+
+Converts (addr1, addr2, value) tables into the packed byte streams
+accepted by IDevice.write_stream(), and splits streams into runs of
+consecutive registers that can be sent as block writes.
+"""
+
+from itertools import chain
+from typing import Iterable, List, Sequence, Tuple
+
+
+def pack_table(table: Iterable[Tuple[int, int, int]]) -> bytes:
+    """
+    Pack a register table into a flat byte stream.
+
+    Args:
+        table: Iterable of (addr1, addr2, value) triples
+
+    Returns:
+        bytes: addr1, addr2, value for each entry, 3 bytes per register
+
+    Raises:
+        ValueError: If any field is outside 0x00-0xFF
+    """
+    return bytes(chain.from_iterable(table))
+
+
+def pack_columns(pages: bytes, offsets: bytes, values: bytes) -> bytes:
+    """
+    Interleave parallel page, offset and value columns into a byte stream.
+
+    The columns are copied with strided slice assignment, so no per-register
+    Python objects are created.
+
+    Args:
+        pages: Page address / high byte of each register
+        offsets: Offset address / low byte of each register
+        values: Value of each register
+
+    Returns:
+        bytes: Packed (addr1, addr2, value) triples
+
+    Raises:
+        ValueError: If the columns differ in length or hold a field outside 0x00-0xFF
+    """
+    if not len(pages) == len(offsets) == len(values):
+        raise ValueError(
+            f"Column lengths differ: {len(pages)}, {len(offsets)}, {len(values)}"
+        )
+
+    stream = bytearray(3 * len(pages))
+    stream[0::3] = bytes(pages)
+    stream[1::3] = bytes(offsets)
+    stream[2::3] = bytes(values)
+    return bytes(stream)
+
+
+def pack_block(addr1: int, addr2: int, data: Sequence[int]) -> bytes:
+    """
+    Pack consecutive registers of one page into a byte stream.
+
+    Args:
+        addr1: Page address / high byte
+        addr2: Starting offset address / low byte
+        data: Values for addr2, addr2 + 1, ...
+
+    Returns:
+        bytes: Packed (addr1, addr2, value) triples
+
+    Raises:
+        ValueError: If any field is outside 0x00-0xFF
+    """
+    return bytes(
+        field for i, value in enumerate(data) for field in (addr1, addr2 + i, value)
+    )
+
+
+def expand_pages(
+    pages: Sequence[int],
+    table: Sequence[Tuple[int, int]],
+    page_major: bool = False,
+) -> bytes:
+    """
+    Pack (addr2, value) pairs written to several pages into a byte stream.
+
+    By default each pair is written to every page before moving to the
+    next pair, matching a sequence of write_reg_multi() calls. With
+    page_major=True the whole table is written to one page before the
+    next, which keeps each page's consecutive offsets together.
+
+    Args:
+        pages: Page addresses / high bytes
+        table: Sequence of (addr2, value) pairs
+        page_major: Iterate pages in the outer loop
+
+    Returns:
+        bytes: Packed (addr1, addr2, value) triples
+
+    Raises:
+        ValueError: If any field is outside 0x00-0xFF
+    """
+    if page_major:
+        return bytes(
+            field
+            for addr1 in pages
+            for addr2, value in table
+            for field in (addr1, addr2, value)
+        )
+    return bytes(
+        field
+        for addr2, value in table
+        for addr1 in pages
+        for field in (addr1, addr2, value)
+    )
+
+
+def coalesce_runs(stream: bytes, auto_increment: bool = True) -> List[Tuple[int, int, bytes]]:
+    """
+    Group a packed stream into runs of consecutive registers.
+
+    A run continues while the page stays the same and each offset is
+    one past the previous one, so it can be written with register
+    auto-increment in a single transaction. Write order is unchanged.
+
+    Args:
+        stream: Packed (addr1, addr2, value) triples
+        auto_increment: If False, every register is a run of its own
+
+    Returns:
+        List of (addr1, start_addr2, values) tuples
+    """
+    if not auto_increment:
+        it = iter(stream)
+        return [(addr1, addr2, bytes((value,))) for addr1, addr2, value in zip(it, it, it)]
+
+    runs = []
+    run_addr1 = run_addr2 = -1
+    values = bytearray()
+
+    it = iter(stream)
+    for addr1, addr2, value in zip(it, it, it):
+        if addr1 == run_addr1 and addr2 == run_addr2 + len(values):
+            values.append(value)
+            continue
+        if values:
+            runs.append((run_addr1, run_addr2, bytes(values)))
+        run_addr1, run_addr2 = addr1, addr2
+        values = bytearray((value,))
+
+    if values:
+        runs.append((run_addr1, run_addr2, bytes(values)))
+    return runs
@@ -1,6 +1,6 @@
 from .instruments.e3631a import E3631a
 from .instruments.e3648a import E3648a
 from .instruments.tt5166_tcp_ctr import TemperatureController
-from .instrument_manager import InstrumentManager
+from .instrument_manager import InstrumentManager, read_all
 
-__all__ = ["E3631a", "E3648a", "TemperatureController", "InstrumentManager"]
+__all__ = ["E3631a", "E3648a", "TemperatureController", "InstrumentManager", "read_all"]
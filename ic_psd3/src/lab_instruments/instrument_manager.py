@@ -1,8 +1,43 @@
+import asyncio
+import os
+from functools import lru_cache
+
 import yaml
 from .instruments.e3631a import E3631a
 from .instruments.e3648a import E3648a
 from .instruments.tt5166_tcp_ctr import TemperatureController
 
+try:
+    # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+@lru_cache(maxsize=16)
+def _load_yaml_cached(path, mtime):
+    """
+    Parse a YAML file; cached per (path, mtime) so unchanged files are parsed once.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=_SafeLoader)
+
+
+async def read_all(instruments):
+    """
+    Measure the voltage of several supplies concurrently.
+
+    Each supply runs its VISA call in its own worker thread (getVoltageAsync),
+    so the total time is that of the slowest supply rather than the sum.
+
+    Args:
+        instruments: Iterable of (instrument, source) pairs, e.g. [(vs1, 'P6V'), (vs2, 'OUTP1')]
+
+    Returns:
+        list: Voltages in the same order as instruments
+    """
+    return list(await asyncio.gather(*(inst.getVoltageAsync(src) for inst, src in instruments)))
+
 
 class InstrumentManager:
     """
@@ -25,8 +60,7 @@ class InstrumentManager:
         Load configuration from a dictionary or a YAML file path.
         """
         if isinstance(config, str):
-            with open(config, "r", encoding="utf-8") as f:
-                config = yaml.safe_load(f)
+            config = _load_yaml_cached(config, os.path.getmtime(config))
 
         instruments_config = config.get("instruments", {})
         for name, info in instruments_config.items():
@@ -43,7 +77,30 @@ class InstrumentManager:
                 print(f"Warning: Unknown instrument type '{inst_type}' for '{name}'")
 
     def __getitem__(self, name):
-        return self.instruments.get(name)
+        """
+        Get an instrument by name.
+
+        Raises:
+            KeyError: If no instrument with that name was initialized
+        """
+        try:
+            return self.instruments[name]
+        except KeyError:
+            raise KeyError(
+                f"Instrument '{name}' not found. Available instruments: {list(self.instruments)}"
+            ) from None
+
+    def get(self, name, default=None):
+        """
+        Get an instrument by name, or default if it was not initialized.
+        """
+        return self.instruments.get(name, default)
+
+    def __contains__(self, name):
+        return name in self.instruments
+
+    def __len__(self):
+        return len(self.instruments)
 
     @classmethod
     def from_yaml(cls, yaml_path):
@@ -3,9 +3,10 @@ Created on 20250117
 @author: yfzhao
 '''
 
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 #from visa import Instrument
-import pyvisa
 
 
 
@@ -18,6 +19,14 @@ class E3648a():
         OUTP1
         OUTP2        
     Raw SCIP commands can be written with "E3646A.write()"
+
+    The last selected source is cached and INST:SEL is only sent when it
+    changes. If the selection is changed elsewhere (front panel, another
+    program, raw instrument writes), call clearSelection() first.
+
+    The *Async methods run the VISA call in a worker thread owned by this
+    supply, so several supplies can be measured at once with asyncio.gather;
+    calls on one supply still run one at a time.
     
     Example Usage:
         vsource = E3646a(gpib=6,setMaxLimit=True)
@@ -36,9 +45,14 @@ class E3648a():
             gpib = 'GPIB::'+str(int(gpib))
         except ValueError:
             pass
+        # Imported here so that importing lab_instruments does not load VISA
+        import pyvisa
+
         resource_manager = pyvisa.ResourceManager()
         #Instrument.__init__(self,gpib)
         self.instrument=resource_manager.open_resource(gpib)
+        self._selected = None
+        self._executor = None
         
         if setMaxLimit:
             self.setCurrLimit('OUTP1','max')
@@ -54,27 +68,64 @@ class E3648a():
             voltage: (float)
         '''
         #Source = P6V, P25V, N25V
-        self.instrument.write('INST:SEL ' + source)
-        self.instrument.write('CURR MAX')
-        self.instrument.write('VOLT ' + str(voltage))
+        # One compound SCPI message (select if needed, current max, voltage)
+        self.instrument.write(self._select(source) + 'CURR MAX;:VOLT ' + str(voltage))
     
     def getVoltage(self,source):
-        self.instrument.write('INST:SEL ' + source)
-        return float(self.instrument.query('MEAS:VOLT:DC? '))
+        return float(self.instrument.query(self._select(source) + 'MEAS:VOLT:DC? '))
     
     def getCurrent(self,source):
-        self.instrument.write('INST:SEL ' + source)
-        return float(self.instrument.query('MEAS:CURR:DC? '))
+        return float(self.instrument.query(self._select(source) + 'MEAS:CURR:DC? '))
     
     def setCurrLimit(self,source,limit):
-        self.instrument.write('INST:SEL ' + source)
-        self.instrument.write('CURR ' + str(limit))
+        self.instrument.write(self._select(source) + 'CURR ' + str(limit))
+
+    async def getVoltageAsync(self,source):
+        '''
+        v = await vsrc.getVoltageAsync('OUTP2')
+        '''
+        return await self._runAsync(self.getVoltage, source)
+
+    async def getCurrentAsync(self,source):
+        return await self._runAsync(self.getCurrent, source)
+
+    async def _runAsync(self,func,*args):
+        # one worker thread per supply: the VISA session is not shared between threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    def clearSelection(self):
+        '''
+        Forget the cached source so the next command sends INST:SEL again.
+        '''
+        self._selected = None
+
+    def _select(self,source):
+        '''
+        Return the "INST:SEL <source>;:" prefix, or '' if source is already selected.
+        '''
+        if source == self._selected:
+            return ''
+        self._selected = source
+        return 'INST:SEL ' + source + ';:'
         
     def outputEnable(self):
         self.instrument.write('OUTP ON')
 
     def outputDisable(self):
         self.instrument.write('OUTP OFF')
+
+    def close(self):
+        '''
+        vsrc.close()
+
+        Stop the async worker thread and close the VISA session.
+        '''
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.instrument.close()
         
         
         
@@ -1,48 +1,97 @@
 # coding: utf-8
+import asyncio
 import socket
 import time
 import struct
-import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# Modbus TCP frame: MBAP header (transaction 1, protocol 0, length 6) + 6-byte PDU
+_MBAP = struct.Struct('>6sBBBBBB')
+_HDR = b'\x00\x01\x00\x00\x00\x06'
+_LEN = struct.Struct('>H')    # MBAP length field: unit id + PDU bytes
+_TEMP = struct.Struct('>h')   # signed register value, 0.01 deg
+
+# constant requests, built once
+_READ_TEMP_FRAME = _MBAP.pack(_HDR, 0x00, 0x03, 0x00, 0x00, 0x00, 0x01)
+_POWER_ON_FRAME = _MBAP.pack(_HDR, 0x00, 0x05, 0x00, 0x00, 0xff, 0x00)
+_POWER_OFF_FRAME = _MBAP.pack(_HDR, 0x00, 0x05, 0x00, 0x01, 0xff, 0x00)
 
 class TemperatureController:
     def __init__(self, ip_address, port):
         self.ip_address = ip_address
         self.port = port
         self.client_socket = None
+        # has connected at least once; client_socket is None again after a link error
+        self._connected = False
         self.now_temperature = 0
+        self._executor = None
 
         #yfzhao fix init bug
         #self._connect_to_device()
 
     def _modbus_tcp_msg(self, address, function_code, start_addr_high, start_addr_low, data_high, data_low):
         # create a modbus TCP message
-
-
-        if sys.version_info.major == 3:
-            package_start=bytes([0x00, 0x01, 0x00, 0x00, 0x00, 0x06])
-            msg = package_start + bytes([address, function_code, start_addr_high, start_addr_low, data_high, data_low])
-        else:
-            #python2
-            msg = '\x00\x01\x00\x00\x00\x06' + chr(address) + chr(function_code) + chr(start_addr_high) + chr(start_addr_low) + chr(data_high) + chr(data_low)
-        return msg
+        return _MBAP.pack(_HDR, address, function_code,
+                          start_addr_high, start_addr_low, data_high, data_low)
 
     def _connect_to_device(self):
         # create a socket object and connect to the device
+        # the socket stays open between commands; Modbus frames are tiny, so no Nagle delay
         self.client_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.client_socket.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        # wake recv only once a whole MBAP header is in; not supported on Windows
+        try:
+            self.client_socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVLOWAT, 7)
+        except (AttributeError, OSError):
+            pass
         self.client_socket.connect((self.ip_address, self.port))
+        self._connected = True
         #if sys.version_info.major == 3:
             #self.client_socket.setblocking(False)
     def _off_connect(self):
         #add try
         try:
             self.client_socket.close()
-            return
         except:
             # if error do nothing
-            return
+            pass
+        self.client_socket = None
 
+    def _txn(self, msg):
+        # send one request on the persistent socket and return the reply
+        # connects on first use; reconnects and retries once if the link dropped
+        for attempt in range(2):
+            if self.client_socket is None:
+                self._connect_to_device()
+            try:
+                self.client_socket.sendall(msg)
+                # 7-byte MBAP header (incl. unit id), then the length it declares
+                hdr = self._recv_exact(7)
+                length = _LEN.unpack_from(hdr, 4)[0]
+                if length < 1:
+                    # cannot tell where this reply ends: drop the link like a broken one
+                    raise ConnectionError("malformed Modbus reply, MBAP length " + str(length))
+                return hdr + self._recv_exact(length - 1)
+            except (ConnectionError, socket.timeout):
+                self._off_connect()
+                if attempt:
+                    raise
 
 
+
+    def _recv_exact(self, n):
+        # read exactly n bytes; recv() may return a partial frame
+        buf = bytearray(n)
+        mv = memoryview(buf)
+        off = 0
+        while off < n:
+            r = self.client_socket.recv_into(mv[off:])
+            if not r:
+                raise ConnectionError("connection closed by controller")
+            off += r
+        return bytes(buf)
+
     def _set_temperature(self, temperature):
         if temperature >= 0:
             temperature_hex = hex(int(temperature * 10))[2:].zfill(4)
@@ -53,58 +102,71 @@ class TemperatureController:
         data_high = int(temperature_str[:2], 16)
         data_low  = int(temperature_str[2:], 16)
 
-        self._connect_to_device()
         msg = self._modbus_tcp_msg(0x00, 0x06, 0x00, 0x26, data_high, data_low)
-        self.client_socket.send(msg)
-        response = self.client_socket.recv(1024)
-        self._off_connect()
-
-        return response
+        return self._txn(msg)
 
     def _display_temperature(self):
-        self._connect_to_device()
         # read the temperature from the device and display it
-        msg = self._modbus_tcp_msg(0x00, 0x03, 0x00, 0x00, 0x00, 0x01)
-        self.client_socket.send(msg)
-        response = self.client_socket.recv(1024)
-        self._off_connect()
-        temperature = struct.unpack('!h', response[-2:])[0] / 100.0
+        response = self._txn(_READ_TEMP_FRAME)
+        temperature = _TEMP.unpack_from(response, len(response) - 2)[0] / 100.0
         return temperature
 
-    def _check_temperature(self, temperature):
+    def _check_temperature(self, temperature, poll_s=0.2, tol=0.3, timeout=None):
+        # poll every poll_s until within tol of the target; read errors back off up to 2 s
+        # timeout (s) None waits forever
         self._set_temperature(temperature)
         print("instrument::set_temperature is " + str(temperature) + " deg")
-        while True:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        backoff = poll_s
+        last_printed = None
+        while deadline is None or time.monotonic() < deadline:
             try:
                 self.now_temperature = self._display_temperature()
-            except:
-                print("instrument::get temp error, dont care, continue.")
+            except (OSError, struct.error) as e:
+                # ConnectionError from a dropped link or a malformed reply lands here too
+                print("instrument::get temp error (" + str(e) + "), dont care, continue.")
                 #maybe connection wrong
                 self._off_connect()
                 #ADD error detect, yfzhao
-                time.sleep(1)
+                backoff = min(backoff * 2, 2.0)
+                time.sleep(backoff)
                 continue
-            print("instrument::now temper is ", str(self.now_temperature) + " deg")
-            time.sleep(1)
-            if abs(self.now_temperature - temperature) < 0.3:
+            backoff = poll_s
+            if self.now_temperature != last_printed:
+                print("instrument::now temper is ", str(self.now_temperature) + " deg")
+                last_printed = self.now_temperature
+            if abs(self.now_temperature - temperature) < tol:
                 break
             elif self.now_temperature == 150:
                 break
+            time.sleep(poll_s)
+        else:
+            raise RuntimeError("instrument::temperature did not reach " + str(temperature)
+                               + " deg in " + str(timeout) + " s")
         print("instrument::target temper is already")
 
+    async def _run_async(self, func, *args):
+        # one worker thread per controller, so the socket is never used from two threads
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+
+    async def _display_temperature_async(self):
+        return await self._run_async(self._display_temperature)
+
+    async def temper_ctr_async(self, temperature):
+        # await several chambers settling at once:
+        # asyncio.gather(a.temper_ctr_async(25), b.temper_ctr_async(25))
+        return await self._run_async(self.temper_ctr, temperature)
+
     def _turn_on_power(self):
-        self._connect_to_device()
         # turn on the power to the device
-        msg = self._modbus_tcp_msg(0x00, 0x05, 0x00, 0x00, 0xff, 0x00)
-        self.client_socket.send(msg)
-        self._off_connect()
+        # the echo reply is read so it cannot be mistaken for the next response
+        self._txn(_POWER_ON_FRAME)
 
     def _turn_off_power(self):
-        self._connect_to_device()
         # turn off the power to the device
-        msg = self._modbus_tcp_msg(0x00, 0x05, 0x00, 0x01, 0xff, 0x00)
-        self.client_socket.send(msg)
-        self._off_connect()
+        self._txn(_POWER_OFF_FRAME)
 
     def temper_ctr(self, temperature):
         #self._connect_to_device()
@@ -115,10 +177,15 @@ class TemperatureController:
         return temperature
 
     def turn_off_controller(self):
-        if self.client_socket is not None:
+        # power off even if the last request dropped the link; _txn reconnects
+        if self._connected:
             self._turn_off_power()
             time.sleep(1)  # 增加延时等待电源关闭
-            self.client_socket.close()
+            self._off_connect()
+        # release the async worker thread; a later *_async call starts a new one
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
 
 
             
@@ -6,23 +6,176 @@ for centralized device management, supporting multi-device configurations (e.g.,
 
 Usage:
     cd ic_psd3
-    python -m src.psd_bridge.aves_converter
+    python -m src.psd_bridge.aves_converter [script] [output_dir] [chip_name]
+        [--collapse-repeated-includes]
+
+    Several scripts can be converted at once, in parallel processes; each one
+    is written to output_dir/<script name>:
+    python -m src.psd_bridge.aves_converter a.txt b.txt [output_dir] [chip_name] [--jobs N]
 """
 
+import mmap
 import os
 import re
-from typing import Optional, List, Dict, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, List, Dict, Iterable, Tuple, Union
+
+# Function header index and name, 2-4 segments of 2-3 digits (01-01, 01-01-002, 01-01-02-02)
+_FUNC_HDR_RE = re.compile(r"(\d{2,3}(?:[-_]\d{2,3})+)\s+(.+)")
+# Index and name of an included function
+_INCLUDE_FUNC_RE = re.compile(r"(\d{2}[-_]\d{2}(?:[-_]\d{2})?)\s+(.+)")
+_QUOTED_RE = re.compile(r'"([^"]+)"')
+
+# Register write templates, called with (addr1, addr2, value)
+_PY_WRITE = "device.write_reg(0x{:02x}, 0x{:02x}, 0x{:02x})".format
+_C_WRITE = "writeReg(0x{:02x},0x{:02x},0x{:02x});".format
+
+# A parsed AVES command: (addr1, addr2, value, comment) for a register write,
+# or the sanitized name of an included function
+Command = Union[Tuple[int, int, int, str], str]
+
+
+# Static part of the generated class: module docstring, imports and the
+# methods every generated class has; the configuration methods follow it
+_CLASS_HEADER_TMPL = '''\
+"""
+{class_name} - AVES script configuration class
+Auto-generated from: {script_name}
+"""
+
+from typing import Optional
+from hw_bridge import DeviceManager
+
+
+class {class_name}:
+    """
+    AVES script configuration for chip initialization.
+    
+    This class provides methods to configure the chip using I2C commands
+    converted from AVES scripts. It supports DeviceManager for centralized
+    device management, enabling multi-device configurations (e.g., TX/RX boards).
+    
+    Usage (DeviceManager mode - recommended):
+        >>> from hw_bridge import DeviceManager
+        >>> dm = DeviceManager(auto_open=True)
+        >>> dm.register("tx", "ftdi", i2c_port=0, chip_addr=0x58)
+        >>> dm.register("rx", "ftdi", i2c_port=1, chip_addr=0x58)
+        >>> tx_config = AVESChipConfig(device_manager=dm, device_name="tx")
+        >>> rx_config = AVESChipConfig(device_manager=dm, device_name="rx")
+        >>> tx_config.func_01_01_Chip_Power_Up()
+    """
+
+    __slots__ = (
+        "_device_manager",
+        "_device_name",
+        "_dedupe_writes",
+        "_verbose",
+        "_device",
+        "_skip_applied",
+        "_applied",
+    )
+
+    def __init__(
+        self,
+        device_manager: Optional[DeviceManager] = None,
+        device_name: str = "chip",
+        dedupe_writes: bool = False,
+        verbose: bool = True,
+        skip_applied: bool = False,
+    ):
+        """
+        Initialize the AVES chip configuration.
+
+        Args:
+            device_manager: DeviceManager instance for device access.
+                           If None, you must set it before calling methods.
+            device_name: Name of the device in the DeviceManager.
+            dedupe_writes: Drop writes that repeat the value already written
+                           to the same register within one call.
+            verbose: If True, print the name of each top-level configuration call.
+            skip_applied: Skip configuration functions that already ran on this
+                          device; use force_reapply() to run them again.
+        """
+        self._device_manager = device_manager
+        self._device_name = device_name
+        self._dedupe_writes = dedupe_writes
+        self._verbose = verbose
+        self._device = None
+        self._skip_applied = skip_applied
+        self._applied = set()
+
+    def _get_device(self):
+        """Get the device instance from DeviceManager (cached while open)."""
+        device = self._device
+        if device is not None and device.is_open:
+            return device
+        if self._device_manager is None:
+            raise RuntimeError("DeviceManager not set. Initialize with device_manager parameter.")
+        self._device = self._device_manager[self._device_name]
+        return self._device
+
+    def set_device_manager(self, device_manager: DeviceManager, device_name: str = None):
+        """
+        Set or update the DeviceManager.
+
+        Args:
+            device_manager: DeviceManager instance
+            device_name: Optional new device name
+        """
+        self._device_manager = device_manager
+        self._device = None
+        self._applied.clear()
+        if device_name:
+            self._device_name = device_name
+
+    def force_reapply(self, names=None):
+        """
+        Let configuration functions run again when skip_applied is set.
+
+        Args:
+            names: Function names to forget (e.g. ["func_01_01_Chip_Power_Up"]);
+                   None forgets all of them, e.g. after a chip reset
+        """
+        if names is None:
+            self._applied.clear()
+        else:
+            self._applied.difference_update(names)
+'''
+
+
+class _NameTable(dict):
+    """
+    str.translate() table for function names, filled in on first use of each character.
+
+    Letters and digits (any script, as str.isalnum) are kept, "." becomes "p" and
+    everything else becomes "_".
+    """
+
+    def __missing__(self, code: int) -> str:
+        char = chr(code)
+        value = char if char.isalnum() else ("p" if char == "." else "_")
+        self[code] = value
+        return value
+
+
+_NAME_TABLE = _NameTable()
 
 
 class AVESConverter:
     """Convert AVES scripts to Python class with DeviceManager support."""
 
+    # Minimum number of contiguous writes emitted as one pack_block() burst
+    BLOCK_MIN_LEN = 4
+    # Minimum per-page sequence length detected as a page-major mirror
+    MIRROR_MIN_LEN = 2
+
     def __init__(
         self,
         aves_script_path: str,
         output_dir: str = "library",
         chip_name: str = "GSU1K1_NTO",
         class_name: str = "AVESChipConfig",
+        collapse_repeated_includes: bool = False,
     ):
         """
         Initialize the AVES converter.
@@ -32,11 +185,15 @@ class AVESConverter:
             output_dir: Output directory for generated files
             chip_name: Chip name for register definition file
             class_name: Name of the generated Python class
+            collapse_repeated_includes: Emit back-to-back identical include calls
+                (e.g. Chip_Power_Up three times in a row) as a single call.
+                Only enable when the included sequence is idempotent.
         """
         self.aves_script_path = aves_script_path
         self.output_dir = output_dir
         self.chip_name = chip_name
         self.class_name = class_name
+        self.collapse_repeated_includes = collapse_repeated_includes
         self.output_file = "aves_class.py"
         self.c_header_file = f"{chip_name}_scripts.h"
         self.c_source_file = f"{chip_name}_scripts.c"
@@ -55,44 +212,52 @@ class AVESConverter:
         functions = self._parse_aves_script()
         print(f"Found {len(functions)} functions")
 
-        # Generate Python class
-        self._generate_aves_class(functions)
-
-        # Generate C header and source files
-        self._generate_c_header(functions)
-        self._generate_c_source(functions)
+        # Generate the Python class and the C header and source files; the three
+        # only read the parsed functions, so their formatting and writes overlap
+        generators = (self._generate_aves_class, self._generate_c_header, self._generate_c_source)
+        with ThreadPoolExecutor(max_workers=len(generators)) as executor:
+            futures = [executor.submit(generate, functions) for generate in generators]
+        for future in futures:
+            future.result()
 
         print(f"Conversion completed!")
         print(f"  - Python class: {os.path.join(self.output_dir, self.output_file)}")
         print(f"  - C header: {os.path.join(self.output_dir, self.c_header_file)}")
         print(f"  - C source: {os.path.join(self.output_dir, self.c_source_file)}")
 
-    def _parse_aves_script(self) -> List[Tuple[str, str, List[str]]]:
+    def _parse_aves_script(self) -> List[Tuple[str, str, List[Command]]]:
         """
         Parse AVES script and extract functions.
 
+        Each command line is parsed here, once; the Python and C generators
+        both work from the parsed commands.
+
         Returns:
             List of tuples: (func_index, func_name, commands)
-            Each command is a line from the AVES script
+            Each command is a write tuple or an included function name
+            (see _lex_command); lines that are neither are dropped
         """
         functions = []
         current_func = None
         current_commands = []
+        # A function whose lines are all dropped is still emitted, with an empty body
+        has_lines = False
+        lex_command = self._lex_command  # bound once for the per-line loop
 
-        with open(self.aves_script_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        for line in lines:
-            line = line.strip()
+        for raw in self._script_lines():
+            line = raw.strip()
 
-            # Skip empty lines and comments (lines starting with ;)
+            # Skip empty lines and comments (lines starting with ;), mostly before decoding
+            if not line or line.startswith(b";"):
+                continue
+            line = line.decode("utf-8").strip()  # also strips non-ASCII whitespace
             if not line or line.startswith(";"):
                 continue
 
             # Check for function definition: :XX-XX Function Name:
             if line.startswith(":") and line.endswith(":"):
                 # Save previous function if exists
-                if current_func and current_commands:
+                if current_func and has_lines:
                     functions.append(
                         (
                             current_func[0],  # index like "01-01"
@@ -104,39 +269,55 @@ class AVESConverter:
                 # Parse new function
                 func_content = line[1:-1].strip()  # Remove : at start and end
                 # Split into index and name (e.g., "01-01 Chip Power Up")
-                # Support 2-4 segments with 2-3 digits each (e.g., 01-01, 01-01-02, 01-01-002, 01-01-02-02)
-                match = re.match(r"(\d{2,3}(?:[-_]\d{2,3})+)\s+(.+)", func_content)
+                match = _FUNC_HDR_RE.match(func_content)
                 if match:
                     func_index = match.group(1)
                     func_name = match.group(2)
                     current_func = (func_index, func_name)
-                    current_commands = []
                 else:
                     # Handle cases without index
                     current_func = ("00-00", func_content)
-                    current_commands = []
+                current_commands = []
+                has_lines = False
                 continue
 
             # Check for End keyword
             if line.lower() == "end":
-                if current_func and current_commands:
+                if current_func and has_lines:
                     functions.append(
                         (current_func[0], current_func[1], current_commands)
                     )
                     current_func = None
                     current_commands = []
+                    has_lines = False
                 continue
 
             # Collect commands within function
             if current_func is not None:
-                current_commands.append(line)
+                has_lines = True
+                command = lex_command(line)
+                if command is not None:
+                    current_commands.append(command)
 
         # Handle last function if file doesn't end with End
-        if current_func and current_commands:
+        if current_func and has_lines:
             functions.append((current_func[0], current_func[1], current_commands))
 
         return functions
 
+    def _script_lines(self) -> Iterable[bytes]:
+        """
+        Yield the raw lines of the AVES script.
+
+        The file is memory-mapped, so the OS pages it in on demand and no
+        line is decoded until the parser needs it.
+        """
+        with open(self.aves_script_path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return  # an empty file cannot be mapped
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                yield from iter(mm.readline, b"")
+
     def _sanitize_func_name(self, func_index: str, func_name: str) -> str:
         """
         Convert function name to valid Python identifier.
@@ -156,53 +337,58 @@ class AVESConverter:
         # - Letters and numbers: keep as is
         # - Dot (.): replace with 'p'
         # - All other characters: replace with '_'
-        name_chars = []
-        for char in func_name:
-            if char.isalnum():  # Keep letters and numbers
-                name_chars.append(char)
-            elif char == ".":  # Dot becomes 'p'
-                name_chars.append("p")
-            else:  # Everything else becomes '_'
-                name_chars.append("_")
-
-        name_part = "".join(name_chars)
+        name_part = func_name.translate(_NAME_TABLE)
 
         return f"func_{index_part}_{name_part}"
 
-    def _parse_command(self, command: str) -> Optional[str]:
+    def _lex_command(self, command: str) -> Optional[Command]:
         """
-        Parse an AVES command and convert to Python code.
+        Parse one AVES command line.
 
         Args:
             command: AVES command line
 
         Returns:
-            Python code string or None if not a valid command
+            (addr1, addr2, value, comment) for a register write, the sanitized
+            name of the called function for an include, or None if the line
+            is neither
         """
         # Handle include statements: include this "..." "XX-XX Function Name"
         # or: include "XX-XX Function Name"
         if command.startswith("include"):
             # Find all quoted strings in the command
-            matches = re.findall(r'"([^"]+)"', command)
+            matches = _QUOTED_RE.findall(command)
             if matches:
                 # The last quoted string contains the function name
                 called_func = matches[-1]
                 # Try to match the function name pattern
-                func_match = re.match(
-                    r"(\d{2}[-_]\d{2}(?:[-_]\d{2})?)\s+(.+)", called_func
-                )
+                func_match = _INCLUDE_FUNC_RE.match(called_func)
                 if func_match:
                     func_index = func_match.group(1)
                     func_name = func_match.group(2)
-                    py_func_name = self._sanitize_func_name(func_index, func_name)
-                    return f"self.{py_func_name}()"
+                    return self._sanitize_func_name(func_index, func_name)
             return None
 
+        return self._parse_write(command)
+
+    def _parse_write(self, command: str) -> Optional[Tuple[int, int, int, str]]:
+        """
+        Parse an AVES I2C write command into its fields.
+
+        Args:
+            command: AVES command line
+
+        Returns:
+            Tuple (addr1, addr2, data, comment) or None if not a write command
+        """
         # Handle I2C write commands: XX XXXX XX ; comment
         # Format: DeviceAddr(2 hex) SubAddr(4 hex) Data(2 hex)
         # Note: DeviceAddr is the I2C chip address, already set in DeviceManager
         #       SubAddr is 16-bit, split into high byte (addr1) and low byte (addr2)
-        # Example: B0 0902 13 -> write_reg(0x09, 0x02, 0x13)
+        # Example: B0 0902 13 -> (0x09, 0x02, 0x13, "")
+        if command.startswith("include"):
+            return None
+
         parts = command.split(";")
         cmd_part = parts[0].strip()
         comment = parts[1].strip() if len(parts) > 1 else ""
@@ -210,29 +396,380 @@ class AVESConverter:
         # Split command into parts
         tokens = cmd_part.split()
         if len(tokens) >= 3:
-            # Parse: B0 0902 13
             # device_addr = tokens[0]  # B0 - not used, already set in DeviceManager
             sub_addr = tokens[1]  # 0902 - 16-bit sub-address
             data = tokens[2]  # 13 - data value
 
             # Split 16-bit sub-address into high and low bytes
             # 0902 -> high=09, low=02
-            sub_addr_high = sub_addr[0:2]  # First 2 chars (high byte)
-            sub_addr_low = sub_addr[2:]  # Last 2 chars (low byte)
+            try:
+                addr1 = int(sub_addr[0:2], 16)
+                addr2 = int(sub_addr[2:], 16)
+                value = int(data, 16)
+            except ValueError:
+                return None
+            return (addr1, addr2, value, comment)
 
-            # Convert to proper hex format
-            addr1_hex = f"0x{sub_addr_high.lower()}"
-            addr2_hex = f"0x{sub_addr_low.lower()}"
-            data_hex = f"0x{data.lower()}"
+        return None
 
-            comment_str = f"  # {comment}" if comment else ""
-            return (
-                f"device.write_reg({addr1_hex}, {addr2_hex}, {data_hex}){comment_str}"
-            )
+    def _group_commands(self, commands: List[Command]) -> List[Tuple[str, object]]:
+        """
+        Group function commands, merging register writes where possible.
 
-        return None
+        - Consecutive writes to the same page with incrementing offsets are
+          merged into a "block" (one I2C transaction via auto-increment).
+        - Consecutive writes of the same value to the same offset on
+          different pages are merged into a "multi" fan-out.
+
+        Args:
+            commands: Parsed commands of one function
+
+        Returns:
+            List of (kind, payload) items:
+                ("block", (addr1, addr2, data_list, comments))
+                ("multi", (pages, addr2, value, comments))
+                ("mirror", (pages, seq, comments))
+                ("write", (addr1, addr2, value, comment))
+                ("line", python_code_string)
+            where comments is a list of (address, comment) pairs, or of
+            (addr1, addr2, comment) for "mirror".
+        """
+        # Writes are tuples, includes are function names
+        entries = []
+        repeats = {}  # entry index -> number of back-to-back identical includes
+        for cmd in commands:
+            if (
+                self.collapse_repeated_includes
+                and isinstance(cmd, str)
+                and entries
+                and entries[-1] == cmd
+            ):
+                repeats[len(entries) - 1] = repeats.get(len(entries) - 1, 1) + 1
+                continue
+            entries.append(cmd)
+
+        match_mirror = self._match_mirror
+        items = []
+        i = 0
+        while i < len(entries):
+            entry = entries[i]
+            if isinstance(entry, str):
+                line = f"self.{entry}()"
+                if i in repeats:
+                    line += f"  # x{repeats[i]} in AVES script, collapsed"
+                items.append(("line", line))
+                i += 1
+                continue
+
+            addr1, addr2, value, comment = entry
+
+            # Same (offset, value) sequence repeated page after page -> mirror
+            mirror = match_mirror(entries, i)
+            if mirror:
+                pages, seq, end = mirror
+                run = entries[i:end]
+                items.append(("mirror", (pages, seq, [(e[0], e[1], e[3]) for e in run])))
+                i = end
+                continue
+
+            # Contiguous offsets on one page -> block
+            j = i + 1
+            while (
+                j < len(entries)
+                and not isinstance(entries[j], str)
+                and entries[j][0] == addr1
+                and entries[j][1] == addr2 + (j - i)
+            ):
+                j += 1
+            if j - i >= self.BLOCK_MIN_LEN:
+                run = entries[i:j]
+                items.append(
+                    (
+                        "block",
+                        (addr1, addr2, [e[2] for e in run], [(e[1], e[3]) for e in run]),
+                    )
+                )
+                i = j
+                continue
+
+            # Same offset and value on distinct pages -> multi
+            pages = [addr1]
+            j = i + 1
+            while (
+                j < len(entries)
+                and not isinstance(entries[j], str)
+                and entries[j][1] == addr2
+                and entries[j][2] == value
+                and entries[j][0] not in pages
+            ):
+                pages.append(entries[j][0])
+                j += 1
+            if len(pages) >= 2:
+                run = entries[i:j]
+                items.append(
+                    ("multi", (tuple(pages), addr2, value, [(e[0], e[3]) for e in run]))
+                )
+                i = j
+                continue
+
+            items.append(("write", entry))
+            i += 1
+
+        return items
+
+    def _match_mirror(
+        self, entries: List[object], start: int
+    ) -> Optional[Tuple[Tuple[int, ...], List[Tuple[int, int]], int]]:
+        """
+        Match a page-major mirror pattern starting at entries[start].
+
+        The writes to the first page (up to the first page change) form the
+        sequence; it must then repeat exactly on at least one other page.
+
+        Args:
+            entries: Parsed writes and include names of one function
+            start: Index of the first write
+
+        Returns:
+            (pages, [(addr2, value), ...], end_index) or None if no match
+        """
+
+        def page_run(i):
+            page = entries[i][0]
+            j = i
+            while j < len(entries) and not isinstance(entries[j], str) and entries[j][0] == page:
+                j += 1
+            return page, [(e[1], e[2]) for e in entries[i:j]], j
+
+        page, seq, end = page_run(start)
+        if len(seq) < self.MIRROR_MIN_LEN:
+            return None
+
+        pages = [page]
+        while end < len(entries) and not isinstance(entries[end], str):
+            next_page, next_seq, next_end = page_run(end)
+            if next_page in pages or next_seq != seq:
+                break
+            pages.append(next_page)
+            end = next_end
+
+        if len(pages) < 2:
+            return None
+        return tuple(pages), seq, end
+
+    def _stream_parts(
+        self, items: List[Tuple[str, object]], regtable_imports: set
+    ) -> Tuple[List[List[str]], int]:
+        """
+        Render grouped writes as byte-stream expressions.
+
+        Args:
+            items: Consecutive non-"line" items from _group_commands()
+            regtable_imports: Set collecting the regtable helpers used
+
+        Returns:
+            (parts, num_regs) where each part is a list of source lines
+            (first line unindented) evaluating to packed register bytes
+        """
+        parts = []
+        num_regs = 0
+        k = 0
+        while k < len(items):
+            kind, payload = items[k]
+
+            if kind == "write":
+                end = k + 1
+                while end < len(items) and items[end][0] == "write":
+                    end += 1
+                part = ["pack_table(", "    ("]
+                for _, (addr1, addr2, value, comment) in items[k:end]:
+                    comment_str = f"  # {comment}" if comment else ""
+                    part.append(
+                        f"        (0x{addr1:02x}, 0x{addr2:02x}, 0x{value:02x}),{comment_str}"
+                    )
+                part += ["    )", ")"]
+                regtable_imports.add("pack_table")
+                num_regs += end - k
+
+            elif kind == "block":
+                # Contiguous writes: drivers send them as one auto-increment burst
+                addr1, addr2, data, comments = payload
+                part = ["pack_block("]
+                part += [
+                    f"    # 0x{addr1:02x}{offset:02x}: {comment}"
+                    for offset, comment in comments
+                    if comment
+                ]
+                part += [
+                    f"    0x{addr1:02x},",
+                    f"    0x{addr2:02x},",
+                    f'    bytes.fromhex("{bytes(data).hex().upper()}"),',
+                    f")  # 0x{addr1:02x}{addr2:02x}-0x{addr1:02x}{addr2 + len(data) - 1:02x}",
+                ]
+                regtable_imports.add("pack_block")
+                num_regs += len(data)
+                end = k + 1
+
+            elif kind == "mirror":
+                # Same sequence on several pages: one table expanded page by page
+                pages, seq, comments = payload
+                pages_str = "(" + ", ".join(f"0x{p:02x}" for p in pages) + ")"
+                part = ["expand_pages("]
+                part += [
+                    f"    # 0x{page:02x}{addr2:02x}: {comment}"
+                    for page, addr2, comment in comments
+                    if comment
+                ]
+                part += [f"    {pages_str},", "    ("]
+                part += [f"        (0x{addr2:02x}, 0x{value:02x})," for addr2, value in seq]
+                part += ["    ),", "    page_major=True,", ")"]
+                regtable_imports.add("expand_pages")
+                num_regs += len(seq) * len(pages)
+                end = k + 1
+
+            else:
+                # Fan-out writes sharing the same pages: (sub, val) pairs expanded per pair
+                pages = payload[0]
+                pages_str = "(" + ", ".join(f"0x{p:02x}" for p in pages) + ")"
+                end = k + 1
+                while end < len(items) and items[end][0] == "multi" and items[end][1][0] == pages:
+                    end += 1
+                part = ["expand_pages("]
+                for _, (_, addr2, _, comments) in items[k:end]:
+                    part += [
+                        f"    # 0x{page:02x}{addr2:02x}: {comment}"
+                        for page, comment in comments
+                        if comment
+                    ]
+                part += [f"    {pages_str},", "    ("]
+                part += [
+                    f"        (0x{addr2:02x}, 0x{value:02x}),"
+                    for _, (_, addr2, value, _) in items[k:end]
+                ]
+                part += ["    ),", ")"]
+                regtable_imports.add("expand_pages")
+                num_regs += (end - k) * len(pages)
+
+            parts.append(part)
+            k = end
+
+        return parts, num_regs
+
+    def _flatten_composites(
+        self, plans: Dict[str, tuple], module_consts: List[str]
+    ) -> Dict[str, Tuple[str, int]]:
+        """
+        Concatenate the streams of composite functions into one stream each.
+
+        A composite (a function with includes) is flattened when every
+        function it includes, directly or not, is known. The concatenation
+        is appended to module_consts after the streams it is built from.
+
+        A stream included more than once (e.g. a triple Chip_Power_Up) is
+        kept apart as a (stream, count) repeat for each run of it, and the
+        composite becomes a tuple of streams and repeats; repeats are
+        written with write_stream_repeat() so they are never filtered as
+        unchanged writes.
+
+        Args:
+            plans: py_func_name -> (func_index, func_name, steps, span)
+            module_consts: Module-level constant definitions, appended to
+
+        Returns:
+            Dict py_func_name -> (stream expression, num_regs) for each
+            flattened composite
+        """
+        runs_of = {}  # py_func_name -> ([[term, count], ...], num_regs), None if not flattenable
+        const_of_runs = {}  # runs with repeats -> the tuple constant built for them
+        flattened = {}
+
+        def flatten(name, active):
+            if name in runs_of:
+                return runs_of[name]
+            if name not in plans or name in active:
+                return None
+
+            runs = []
+            included = {}  # term -> number of times it is written by includes
+            num_regs = 0
+
+            def add(term, count):
+                if runs and runs[-1][0] == term:
+                    runs[-1][1] += count
+                else:
+                    runs.append([term, count])
+
+            for step in plans[name][2]:
+                if step[0] == "call":
+                    child = flatten(step[1], active | {name})
+                    if child is None:
+                        runs_of[name] = None
+                        return None
+                    for term, count in child[0]:
+                        add(term, count)
+                        included[term] = included.get(term, 0) + count
+                    num_regs += child[1]
+                elif step[0] == "stream":
+                    add(step[1], 1)
+                    num_regs += step[2]
+                else:
+                    add(step[1], 1)
+                    num_regs += 1
+
+            is_composite = any(step[0] == "call" for step in plans[name][2])
+            if is_composite and runs:
+                # Streams between repeats are concatenated; None marks a repeat
+                segments = []
+                for term, count in runs:
+                    if included.get(term, 0) > 1:
+                        segments.append((None, f"({term}, {count})"))
+                    elif segments and segments[-1][0] is not None:
+                        segments[-1][0].append(term)
+                    else:
+                        segments.append(([term], None))
+                const_name = f"_STREAM_{plans[name][0].replace('-', '_')}_{len(module_consts)}"
+                if len(segments) > 1 or segments[0][0] is None:
+                    # Parents keep the runs, so the repeats stay repeats there too
+                    key = tuple(map(tuple, runs))
+                    if key in const_of_runs:
+                        flattened[name] = (const_of_runs[key], num_regs)
+                        runs_of[name] = (runs, num_regs)
+                        return runs_of[name]
+                    stream = const_of_runs[key] = const_name
+                    module_consts.append(
+                        "\n".join(
+                            [f"{stream} = ("]
+                            + [
+                                f"    {' + '.join(terms) if repeat is None else repeat},"
+                                for terms, repeat in segments
+                            ]
+                            + [")"]
+                        )
+                    )
+                else:
+                    terms = segments[0][0]
+                    if len(terms) == 1:
+                        stream = terms[0]
+                    else:
+                        stream = const_name
+                        module_consts.append(
+                            "\n".join(
+                                [f"{stream} = ("]
+                                + [("    + " if n else "    ") + t for n, t in enumerate(terms)]
+                                + [")"]
+                            )
+                        )
+                    runs = [[stream, 1]]
+                flattened[name] = (stream, num_regs)
 
-    def _generate_c_header(self, functions: List[Tuple[str, str, List[str]]]) -> None:
+            runs_of[name] = (runs, num_regs)
+            return runs_of[name]
+
+        for name in plans:
+            flatten(name, frozenset())
+        return flattened
+
+    def _generate_c_header(self, functions: List[Tuple[str, str, List[Command]]]) -> None:
         """
         Generate C header file with function declarations.
 
@@ -241,18 +778,18 @@ class AVESConverter:
         """
         output_path = os.path.join(self.output_dir, self.c_header_file)
 
-        lines = []
-        for func_index, func_name, _ in functions:
-            func_c_name = self._sanitize_func_name(func_index, func_name)
-            lines.append(f"void {func_c_name}();")
-
-        content = "\n".join(lines)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        sanitize = self._sanitize_func_name
+        self._write_lines(
+            output_path,
+            (
+                f"void {sanitize(func_index, func_name)}();"
+                for func_index, func_name, _ in functions
+            ),
+        )
 
         print(f"Generated: {output_path}")
 
-    def _generate_c_source(self, functions: List[Tuple[str, str, List[str]]]) -> None:
+    def _generate_c_source(self, functions: List[Tuple[str, str, List[Command]]]) -> None:
         """
         Generate C source file with function implementations.
 
@@ -260,78 +797,74 @@ class AVESConverter:
             functions: List of parsed functions
         """
         output_path = os.path.join(self.output_dir, self.c_source_file)
+        self._write_lines(output_path, self._c_source_lines(functions))
+        print(f"Generated: {output_path}")
+
+    def _c_source_lines(self, functions: List[Tuple[str, str, List[Command]]]) -> Iterable[str]:
+        """
+        Yield the lines of the C source file.
 
-        lines = []
+        Args:
+            functions: List of parsed functions
+        """
         # Include header
-        lines.append(f'#include "{self.c_header_file}"')
+        yield f'#include "{self.c_header_file}"'
 
+        # Hoisted out of the per-command loop
+        sanitize = self._sanitize_func_name
+        c_write = _C_WRITE
         for func_index, func_name, commands in functions:
-            func_c_name = self._sanitize_func_name(func_index, func_name)
+            func_c_name = sanitize(func_index, func_name)
 
             # Function definition
-            lines.append(f"void {func_c_name}(){{")
+            yield f"void {func_c_name}(){{"
 
             # Generate commands
             for cmd in commands:
-                c_cmd = self._parse_c_command(cmd)
-                if c_cmd:
-                    lines.append(f"    {c_cmd}")
-
-            lines.append("}")
-            lines.append("")
-
-        content = "\n".join(lines)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+                if isinstance(cmd, str):
+                    yield f"    {cmd}();"
+                    continue
+                addr1, addr2, data, comment = cmd
+                if comment:
+                    yield "    " + c_write(addr1, addr2, data) + " //" + comment
+                else:
+                    yield "    " + c_write(addr1, addr2, data)
 
-        print(f"Generated: {output_path}")
+            yield "}"
+            yield ""
 
-    def _parse_c_command(self, command: str) -> Optional[str]:
+    def _write_lines(self, output_path: str, lines: Iterable[str]) -> None:
         """
-        Parse an AVES command and convert to C code.
+        Write lines separated by newlines with a single write.
 
-        Args:
-            command: AVES command line
+        The lines are encoded into one bytearray and handed to os.write() in
+        1 MiB slices, so neither a joined str nor a file object is involved.
+        Line endings are always "\\n".
 
-        Returns:
-            C code string or None if not a valid command
+        Args:
+            output_path: File to write
+            lines: Lines of the file, without line endings
         """
-        # Handle include statements
-        if command.startswith("include"):
-            matches = re.findall(r'"([^"]+)"', command)
-            if matches:
-                called_func = matches[-1]
-                func_match = re.match(
-                    r"(\d{2}[-_]\d{2}(?:[-_]\d{2})?)\s+(.+)", called_func
-                )
-                if func_match:
-                    func_index = func_match.group(1)
-                    func_name = func_match.group(2)
-                    c_func_name = self._sanitize_func_name(func_index, func_name)
-                    return f"{c_func_name}();"
-            return None
-
-        # Handle I2C write commands: XX XXXX XX ; comment
-        parts = command.split(";")
-        cmd_part = parts[0].strip()
-        comment = parts[1].strip() if len(parts) > 1 else ""
-
-        tokens = cmd_part.split()
-        if len(tokens) >= 3:
-            # device_addr = tokens[0]  # Not used in C output
-            sub_addr = tokens[1]
-            data = tokens[2]
-
-            # Split 16-bit sub-address
-            sub_addr_high = sub_addr[0:2]
-            sub_addr_low = sub_addr[2:] if len(sub_addr) > 2 else "00"
-
-            comment_str = f" //{comment}" if comment else ""
-            return f"writeReg(0x{sub_addr_high.lower()},0x{sub_addr_low.lower()},0x{data.lower()});{comment_str}"
-
-        return None
-
-    def _generate_aves_class(self, functions: List[Tuple[str, str, List[str]]]) -> None:
+        buf = bytearray()
+        extend = buf.extend
+        sep = b""
+        for line in lines:
+            extend(sep)
+            extend(line.encode("utf-8"))
+            sep = b"\n"
+
+        # O_BINARY (Windows only) keeps the CRT from translating newlines
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+        fd = os.open(output_path, flags, 0o644)
+        try:
+            view = memoryview(buf)
+            while view:
+                # os.write may write less than asked
+                view = view[os.write(fd, view[: 1 << 20]) :]
+        finally:
+            os.close(fd)
+
+    def _generate_aves_class(self, functions: List[Tuple[str, str, List[Command]]]) -> None:
         """
         Generate the AVES configuration Python class.
 
@@ -340,120 +873,219 @@ class AVESConverter:
         """
         output_path = os.path.join(self.output_dir, self.output_file)
 
-        # Build class content
-        lines = []
-
-        # Header and imports
-        lines.append('"""')
-        lines.append(f"{self.class_name} - AVES script configuration class")
-        lines.append(f"Auto-generated from: {os.path.basename(self.aves_script_path)}")
-        lines.append('"""')
-        lines.append("")
-        lines.append("from typing import Optional")
-        lines.append("from hw_bridge import DeviceManager")
-        lines.append("")
-        lines.append("")
-        lines.append(f"class {self.class_name}:")
-        lines.append('    """')
-        lines.append("    AVES script configuration for chip initialization.")
-        lines.append("    ")
-        lines.append(
-            "    This class provides methods to configure the chip using I2C commands"
-        )
-        lines.append(
-            "    converted from AVES scripts. It supports DeviceManager for centralized"
-        )
-        lines.append(
-            "    device management, enabling multi-device configurations (e.g., TX/RX boards)."
-        )
-        lines.append("    ")
-        lines.append("    Usage (DeviceManager mode - recommended):")
-        lines.append("        >>> from hw_bridge import DeviceManager")
-        lines.append("        >>> dm = DeviceManager(auto_open=True)")
-        lines.append(
-            '        >>> dm.register("tx", "ftdi", i2c_port=0, chip_addr=0x58)'
-        )
-        lines.append(
-            '        >>> dm.register("rx", "ftdi", i2c_port=1, chip_addr=0x58)'
-        )
-        lines.append(
-            '        >>> tx_config = AVESChipConfig(device_manager=dm, device_name="tx")'
-        )
-        lines.append(
-            '        >>> rx_config = AVESChipConfig(device_manager=dm, device_name="rx")'
-        )
-        lines.append("        >>> tx_config.func_01_01_Chip_Power_Up()")
-        lines.append('    """')
-        lines.append("")
-        lines.append("    def __init__(")
-        lines.append("        self,")
-        lines.append("        device_manager: Optional[DeviceManager] = None,")
-        lines.append('        device_name: str = "chip"')
-        lines.append("    ):")
-        lines.append('        """')
-        lines.append("        Initialize the AVES chip configuration.")
-        lines.append("")
-        lines.append("        Args:")
-        lines.append(
-            "            device_manager: DeviceManager instance for device access."
-        )
-        lines.append(
-            "                           If None, you must set it before calling methods."
-        )
-        lines.append(
-            "            device_name: Name of the device in the DeviceManager."
-        )
-        lines.append('        """')
-        lines.append("        self._device_manager = device_manager")
-        lines.append("        self._device_name = device_name")
-        lines.append("")
-        lines.append("    def _get_device(self):")
-        lines.append('        """Get the device instance from DeviceManager."""')
-        lines.append("        if self._device_manager is None:")
-        lines.append(
-            '            raise RuntimeError("DeviceManager not set. Initialize with device_manager parameter.")'
-        )
-        lines.append("        return self._device_manager[self._device_name]")
-        lines.append("")
-        lines.append(
-            "    def set_device_manager(self, device_manager: DeviceManager, device_name: str = None):"
-        )
-        lines.append('        """')
-        lines.append("        Set or update the DeviceManager.")
-        lines.append("")
-        lines.append("        Args:")
-        lines.append("            device_manager: DeviceManager instance")
-        lines.append("            device_name: Optional new device name")
-        lines.append('        """')
-        lines.append("        self._device_manager = device_manager")
-        lines.append("        if device_name:")
-        lines.append("            self._device_name = device_name")
-        lines.append("")
+        # Build class content: static header, then the generated methods
+        lines = _CLASS_HEADER_TMPL.format(
+            class_name=self.class_name,
+            script_name=os.path.basename(self.aves_script_path),
+        ).split("\n")
 
         # Generate functions
+        module_consts = []
+        regtable_imports = set()
+        uses_stream_method = False
+        # py_func_name -> (func_index, func_name, steps, (first line, end line)), where
+        # steps are ("call", name), ("stream", const, num_regs) or ("write", literal)
+        plans = {}
+        # Hoisted out of the per-function loop
+        sanitize = self._sanitize_func_name
+        group_commands = self._group_commands
+        stream_parts = self._stream_parts
         for func_index, func_name, commands in functions:
-            py_func_name = self._sanitize_func_name(func_index, func_name)
+            py_func_name = sanitize(func_index, func_name)
 
+            func_start = len(lines)
+            steps = []
             lines.append(f"    def {py_func_name}(self):")
             lines.append(f'        """{func_index} {func_name}"""')
-            lines.append(f'        print("Cfg {py_func_name}...")')
+            lines.append(f'        if self._skip_applied and "{py_func_name}" in self._applied:')
+            lines.append("            return")
             lines.append("        device = self._get_device()")
+            # Only the outermost call prints; included functions run inside its batch
+            lines.append("        if self._verbose and not device.in_batch:")
+            lines.append(f'            print("Cfg {py_func_name}...")')
+            # Writes are deferred and flushed as one stream; included functions
+            # join the caller's batch so the write order is unchanged
+            lines.append("        with device.batch(dedupe=self._dedupe_writes) as device:")
+            body_start = len(lines)
+
+            items = group_commands(commands)
+            index_part = func_index.replace("-", "_")
+            k = 0
+            while k < len(items):
+                if items[k][0] == "line":
+                    lines.append(f"        {items[k][1]}")
+                    steps.append(("call", items[k][1].split("(", 1)[0][len("self.") :]))
+                    k += 1
+                    continue
+
+                # Consecutive writes of any kind: one module-level stream packed at import
+                end = k + 1
+                while end < len(items) and items[end][0] != "line":
+                    end += 1
+                if end - k == 1 and items[k][0] == "write":
+                    # A lone write between calls stays a plain write_reg
+                    addr1, addr2, value, comment = items[k][1]
+                    comment_str = f"  # {comment}" if comment else ""
+                    lines.append(f"        {_PY_WRITE(addr1, addr2, value)}{comment_str}")
+                    steps.append(("write", f'b"\\x{addr1:02x}\\x{addr2:02x}\\x{value:02x}"'))
+                    k = end
+                    continue
+                parts, num_regs = stream_parts(items[k:end], regtable_imports)
+                const_name = f"_STREAM_{index_part}_{len(module_consts)}"
+                if len(parts) == 1:
+                    const_lines = [f"{const_name} = {parts[0][0]}"] + parts[0][1:]
+                else:
+                    const_lines = [f"{const_name} = ("]
+                    for n, part in enumerate(parts):
+                        prefix = "    + " if n else "    "
+                        const_lines.append(prefix + part[0])
+                        const_lines += ["    " + line for line in part[1:]]
+                    const_lines.append(")")
+                module_consts.append("\n".join(const_lines))
+                lines.append(f"        device.write_stream({const_name})  # {num_regs} regs")
+                steps.append(("stream", const_name, num_regs))
+                k = end
+
+            if len(lines) == body_start:
+                lines.append("        pass")
+
+            # A body that is just one stream write is built by _stream_method()
+            body = lines[body_start:]
+            if len(body) == 1 and body[0].startswith("        device.write_stream("):
+                call_args = body[0][len("        device.write_stream(") :]
+                const_name, _, regs = call_args.partition(")")
+                lines[func_start:] = [
+                    f"    {py_func_name} = _stream_method(",
+                    f'        "{func_index} {func_name}", "{py_func_name}", {const_name}',
+                    f"    ){regs}",
+                    "",
+                ]
+                uses_stream_method = True
+            else:
+                lines[body_start:] = ["    " + line for line in lines[body_start:]]
+                lines.append(f'        self._applied.add("{py_func_name}")')
+                lines.append("")
+            plans[py_func_name] = (func_index, func_name, steps, (func_start, len(lines)))
+
+        # A function that only includes one earlier function becomes an alias of it
+        aliases = {}
+        for py_func_name, (func_index, func_name, steps, span) in plans.items():
+            if len(steps) == 1 and steps[0][0] == "call":
+                target = steps[0][1]
+                if target in plans and plans[target][3][0] < span[0]:
+                    aliases[py_func_name] = target
+
+        # Other composites whose includes all resolve are flattened into one stream
+        flattened = self._flatten_composites(plans, module_consts)
+        for py_func_name in sorted(
+            set(flattened) | set(aliases), key=lambda name: plans[name][3][0], reverse=True
+        ):
+            func_index, func_name, steps, (func_start, func_end) = plans[py_func_name]
+            if py_func_name in aliases:
+                lines[func_start:func_end] = [
+                    f"    {py_func_name} = {aliases[py_func_name]}  # {func_index} {func_name}",
+                    "",
+                ]
+                continue
 
-            for cmd in commands:
-                py_cmd = self._parse_command(cmd)
-                if py_cmd:
-                    lines.append(f"        {py_cmd}")
-
-            lines.append("")
+            stream, num_regs = flattened[py_func_name]
+            method = [
+                f"    {py_func_name} = _stream_method(",
+                f'        "{func_index} {func_name}",',
+                f'        "{py_func_name}",',
+                f"        {stream},",
+                "        steps=(",
+            ]
+            for step in steps:
+                step_expr = f'"{step[1]}"' if step[0] == "call" else step[1]
+                method.append(f"            {step_expr},")
+            method += ["        ),", f"    )  # {num_regs} regs", ""]
+            lines[func_start:func_end] = method
+            uses_stream_method = True
+
+        # Data constants live at module level so they are built once at import
+        if uses_stream_method:
+            module_consts.append(
+                "\n".join(
+                    [
+                        "",
+                        "def _stream_method(title, name, stream, steps=None):",
+                        '    """',
+                        "    Build a configuration method that writes one packed stream.",
+                        "",
+                        "    For a flattened composite, steps lists the included method names and",
+                        "    streams it was built from; they are run one by one when skip_applied",
+                        "    is set so that included functions already applied are skipped.",
+                        "    A composite with repeated includes passes a tuple of streams and",
+                        "    (stream, count) repeats instead of one stream.",
+                        '    """',
+                        "",
+                        "    def _method(self):",
+                        "        if self._skip_applied and name in self._applied:",
+                        "            return",
+                        "        device = self._get_device()",
+                        "        if self._verbose and not device.in_batch:",
+                        '            print(f"Cfg {name}...")',
+                        "        with device.batch(dedupe=self._dedupe_writes) as device:",
+                        "            if steps is None or not self._skip_applied:",
+                        "                if isinstance(stream, tuple):",
+                        "                    for part in stream:",
+                        "                        if isinstance(part, tuple):",
+                        "                            device.write_stream_repeat(*part)",
+                        "                        else:",
+                        "                            device.write_stream(part)",
+                        "                else:",
+                        "                    device.write_stream(stream)",
+                        "            else:",
+                        "                for step in steps:",
+                        "                    if isinstance(step, str):",
+                        "                        getattr(self, step)()",
+                        "                    else:",
+                        "                        device.write_stream(step)",
+                        "        self._applied.add(name)",
+                        "",
+                        "    _method.__name__ = name",
+                        "    _method.__doc__ = title",
+                        "    return _method",
+                    ]
+                )
+            )
+        if module_consts:
+            class_start = lines.index(f"class {self.class_name}:")
+            lines[class_start:class_start] = ["\n\n".join(module_consts), "", ""]
+        if regtable_imports:
+            import_at = lines.index("from hw_bridge import DeviceManager") + 1
+            lines.insert(
+                import_at,
+                f"from hw_bridge.utils.regtable import {', '.join(sorted(regtable_imports))}",
+            )
 
         # Write to file
-        content = "\n".join(lines)
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(content)
+        self._write_lines(output_path, lines)
 
         print(f"Generated: {output_path}")
 
 
+def _convert_one(job: Tuple[str, str, str, bool]) -> str:
+    """
+    Convert one script; module-level so ProcessPoolExecutor can pickle it.
+
+    Args:
+        job: (aves_script, output_dir, chip_name, collapse_repeated_includes)
+
+    Returns:
+        The converted script path
+    """
+    aves_script, output_dir, chip_name, collapse = job
+    AVESConverter(
+        aves_script_path=aves_script,
+        output_dir=output_dir,
+        chip_name=chip_name,
+        collapse_repeated_includes=collapse,
+    ).convert()
+    return aves_script
+
+
 def main():
     """Main entry point for command-line usage."""
     import sys
@@ -463,18 +1095,47 @@ def main():
     output_dir = "library"
     chip_name = "GSU1K1_NTO"
 
-    # Allow command-line overrides
-    if len(sys.argv) > 1:
-        aves_script = sys.argv[1]
-    if len(sys.argv) > 2:
-        output_dir = sys.argv[2]
-    if len(sys.argv) > 3:
-        chip_name = sys.argv[3]
-
-    converter = AVESConverter(
-        aves_script_path=aves_script, output_dir=output_dir, chip_name=chip_name
-    )
-    converter.convert()
+    # Optional flag: emit back-to-back identical includes as a single call
+    args = sys.argv[1:]
+    collapse = "--collapse-repeated-includes" in args
+    args = [arg for arg in args if arg != "--collapse-repeated-includes"]
+
+    # Optional: number of worker processes when several scripts are given
+    jobs = None
+    for n, arg in enumerate(args):
+        if arg == "--jobs" and n + 1 < len(args):
+            jobs = int(args[n + 1])
+            del args[n : n + 2]
+            break
+        if arg.startswith("--jobs="):
+            jobs = int(arg[len("--jobs=") :])
+            del args[n]
+            break
+
+    # Leading arguments that are existing files are scripts; the rest are overrides.
+    # Without any, the first argument is the script, as before.
+    scripts = []
+    while args and os.path.isfile(args[0]):
+        scripts.append(args.pop(0))
+    if not scripts:
+        scripts = [args.pop(0) if args else aves_script]
+    if len(args) > 0:
+        output_dir = args[0]
+    if len(args) > 1:
+        chip_name = args[1]
+
+    if len(scripts) == 1:
+        _convert_one((scripts[0], output_dir, chip_name, collapse))
+        return
+
+    # Each conversion is CPU-bound string work, so run them in separate processes
+    job_list = []
+    for script in scripts:
+        script_dir = os.path.join(output_dir, os.path.splitext(os.path.basename(script))[0])
+        job_list.append((script, script_dir, chip_name, collapse))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        for script in executor.map(_convert_one, job_list):
+            print(f"Done: {script}")
 
 
 if __name__ == "__main__":
@@ -18,11 +18,96 @@ AutoClass Unified Generator
 import os
 import re
 import json
+import keyword
 import shutil
-import xml.etree.ElementTree as ET
-from collections import defaultdict
+import sys
+from collections import Counter, namedtuple
+from dataclasses import dataclass
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple
 
+try:
+    # lxml 的 C 解析器更快，接口与 ElementTree 兼容；未安装时退回标准库
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
+
+# 预编译正则
+_ADDR_RE = re.compile(r"(0x[0-9A-Fa-f]+)")
+_RANGE_RE = re.compile(r"\[(\d+):(\d+)\]")
+# 匹配模式：AutoClass.<PAGE>.<reg>.<op>(<args>)
+_CALL_RE = re.compile(
+    r"AutoClass\.(?P<page>\w+)\.(?P<reg>\w+)\.(?P<op>r|w)\(\s*(?P<args>[^)]*)\)"
+)
+# 寄存器名中需替换为下划线的字符
+_CLEAN_TABLE = str.maketrans(dict.fromkeys(" /-[]()", "_"))
+
+
+def _mask_lsb_bits(mask_int: int) -> Tuple[int, int]:
+    """掩码的 LSB 位置和从 LSB 起连续 1 的位数"""
+    if mask_int == 0:
+        return (0, 0)
+    lsb = (mask_int & -mask_int).bit_length() - 1
+    shifted = mask_int >> lsb
+    # shifted + 1 把低位连续的 1 进位成单个 1，其位置即连续 1 的个数
+    return (lsb, (~shifted & (shifted + 1)).bit_length() - 1)
+
+
+# 字节掩码查找表：_MASK_LUT[mask] = (lsb, bits)
+_MASK_LUT = tuple(_mask_lsb_bits(m) for m in range(256))
+
+
+def _parse_int(text: Optional[str], base: int) -> Optional[int]:
+    """解析整数，空串或格式错误时返回 None"""
+    try:
+        return int(text, base)
+    except (TypeError, ValueError):
+        return None
+
+
+# 解析结果缓存：(绝对路径, mtime_ns, size) -> 解析出的各数据结构（只读视图），实例间共享
+_PARSE_CACHE = {}
+_PARSE_CACHE_SIZE = 4
+
+
+# 生成读写命令所需的数值字段，解析时一次算好；mask/shift 无法解析时对应项为 None
+CodegenInfo = namedtuple("CodegenInfo", "addr_int mask_int shift_int lsb bits")
+
+
+@dataclass
+class RegisterData:
+    """寄存器字节条目（跨字节的 field 每个字节一条）"""
+
+    __slots__ = (
+        "register_name",
+        "base_address",
+        "field_name",
+        "bit_range",
+        "total_bits",
+        "default_value",
+        "data_type",
+        "description",
+        "byte_address",
+        "byte_mask",
+        "byte_shift",
+        "effective_bits",
+        "codegen",
+    )
+
+    register_name: str  # 清理后的寄存器名（来自 caption）
+    base_address: str  # field 起始地址，如 "0x1500"
+    field_name: Optional[str]  # XML 中的 field 名
+    bit_range: Optional[str]  # 位域范围，如 "[7:0]"
+    total_bits: int  # field 总位数
+    default_value: Optional[str]
+    data_type: str
+    description: str
+    byte_address: str  # 本字节地址，如 "0x1501"
+    byte_mask: str  # 本字节掩码，如 "0xC0"
+    byte_shift: str  # 本字节移位，如 "-2"
+    effective_bits: int  # 掩码中 1 的个数
+    codegen: CodegenInfo  # 替换代码用的预解析数值
+
 
 class AutoClassGenerator:
     """
@@ -44,53 +129,127 @@ class AutoClassGenerator:
         """
         self.xml_file = xml_file_path
         self.class_instance_name = class_instance_name
-        self.tree = ET.parse(xml_file_path)
-        self.root = self.tree.getroot()
 
-        # 基础数据
-        self.dev_addr_dict = {}
-        self.json_data = {}
-        self.page_reg_map = {}
+        # 基础数据，解析后换成只读视图：同一 XML 的各实例共享同一份缓存，
+        # 其中的 RegisterData 条目也是共享对象，使用方不要修改
+        self.dev_addr_dict = {}  # {page_name: "0xHH"}
+        self.json_data = {}  # {page_name: (RegisterData, ...)}
+        self.page_reg_map = {}  # {page_name: {register_name: (RegisterData, ...)}}
+
+        # 替换时按 (page, reg) 缓存已生成的读命令和写模板
+        self._read_cache = {}
+        self._write_cache = {}
+
+        # 解析数据（同一 XML 未修改时复用上次的解析结果）
+        self._load_xml_data()
+
+    def _load_xml_data(self):
+        """按文件路径、mtime 和大小复用已解析的数据，否则重新解析"""
+        st = os.stat(self.xml_file)
+        key = (os.path.abspath(self.xml_file), st.st_mtime_ns, st.st_size)
+        cached = _PARSE_CACHE.get(key)
+        if cached is not None:
+            (
+                self.dev_addr_dict,
+                self.addr_to_key,
+                self.addr_to_key_str,
+                self.json_data,
+                self.page_reg_map,
+            ) = cached
+            return
 
-        # 解析数据
         self._parse_xml_data()
+        self._freeze_tables()
+        if len(_PARSE_CACHE) >= _PARSE_CACHE_SIZE:
+            del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+        _PARSE_CACHE[key] = (
+            self.dev_addr_dict,
+            self.addr_to_key,
+            self.addr_to_key_str,
+            self.json_data,
+            self.page_reg_map,
+        )
 
-    def _parse_xml_data(self):
-        """解析 XML 并构建内部数据结构"""
-        self._parse_device_addresses()
-        self._build_json_data()
-        self._build_page_reg_map()
-
-    def _parse_device_addresses(self):
-        """提取设备地址映射 {page_name: page_address}"""
-        file_node = self.root
-        if file_node.tag != "file":
-            raise ValueError("根节点不是 file，请检查 XML 结构")
+    def _freeze_tables(self):
+        """把解析出的字典和列表换成只读视图和元组，供缓存在实例间共享"""
+        self.dev_addr_dict = MappingProxyType(self.dev_addr_dict)
+        self.addr_to_key = MappingProxyType(self.addr_to_key)
+        self.addr_to_key_str = MappingProxyType(self.addr_to_key_str)
+        self.json_data = MappingProxyType(
+            {page: tuple(registers) for page, registers in self.json_data.items()}
+        )
+        self.page_reg_map = MappingProxyType(
+            {
+                page: MappingProxyType(
+                    {name: tuple(registers) for name, registers in regs.items()}
+                )
+                for page, regs in self.page_reg_map.items()
+            }
+        )
 
-        device = file_node.find("device")
-        if device is None:
-            raise ValueError("XML 文件中未找到 device 节点")
+    def _parse_xml_data(self):
+        """
+        单次 iterparse 遍历 XML 并构建内部数据结构
 
-        interfaces = device.findall("interface")
-        for interface in interfaces:
-            name_node = interface.find("name")
-            if name_node is None:
-                continue
-            page_name = name_node.text
-            if not page_name:
+        同一遍中提取设备地址映射 {page_name: page_address}（device 下各 interface 的
+        name 和首个 field 的 address）以及所有 field[@class='Field'] 寄存器字段。
+        处理完的 field/interface 立即 clear()，不保留整棵 DOM。
+        """
+        registers = []
+        depth = 0
+        root_checked = False
+        device_seen = False
+        in_device = False
+        in_interface = False
+        page_name = None
+        page_address = None
+
+        for event, elem in ET.iterparse(self.xml_file, events=("start", "end")):
+            tag = elem.tag
+            if event == "start":
+                depth += 1
+                if not root_checked:
+                    if tag != "file":
+                        raise ValueError("根节点不是 file，请检查 XML 结构")
+                    root_checked = True
+                elif depth == 2 and tag == "device" and not device_seen:
+                    device_seen = in_device = True
+                elif depth == 3 and in_device and tag == "interface":
+                    in_interface = True
+                    page_name = page_address = None
                 continue
 
-            field = interface.find("field")
-            if field is not None:
-                address_node = field.find("address")
-                if address_node is not None:
-                    full_address = address_node.text
-                    if full_address:
-                        page_address = full_address[:4]
-                        self.dev_addr_dict[page_name] = page_address
+            if in_interface and depth == 4:
+                if tag == "name" and page_name is None:
+                    page_name = elem.text or ""
+                elif tag == "field" and page_address is None:
+                    page_address = elem.findtext("address") or ""
+
+            if tag == "field":
+                if elem.get("class") == "Field":
+                    self._parse_field(elem, registers)
+                    elem.clear()
+            elif tag == "interface" and in_interface and depth == 3:
+                if page_name and page_address:
+                    self.dev_addr_dict[page_name] = page_address[:4]
+                in_interface = False
+                elem.clear()
+            elif tag == "device" and in_device and depth == 2:
+                in_device = False
+            depth -= 1
+
+        if not device_seen:
+            raise ValueError("XML 文件中未找到 device 节点")
 
-        # 反向字典
+        # 反向字典：整数页地址和小写 "0xHH" 字符串各一份
         self.addr_to_key = {int(v, 16): k for k, v in self.dev_addr_dict.items()}
+        self.addr_to_key_str = {
+            f"0x{addr:02x}": k for addr, k in self.addr_to_key.items() if addr <= 0xFF
+        }
+
+        # 按 PAGE 组织
+        self.json_data = self._organize_by_page(registers)
+        self._build_page_reg_map()
 
     def _parse_mask_shift(self, mask_shift_str: str) -> List[Tuple[str, str]]:
         """解析 mask 和 shift 字段"""
@@ -111,95 +270,104 @@ class AutoClassGenerator:
         """根据字节地址获取 PAGE 名称"""
         if not byte_address:
             return "UNKNOWN"
+        # 常见的 "0xHHLL" 形式直接取前 4 个字符查表，不做 int 转换
+        if len(byte_address) == 6:
+            page_name = self.addr_to_key_str.get(byte_address[:4].lower())
+            if page_name is not None:
+                return page_name
         addr_int = int(byte_address, 16)
         base_addr = addr_int >> 8
         return self.addr_to_key.get(base_addr, f"0x{base_addr:02X}")
 
-    def _build_json_data(self):
-        """构建 JSON 格式的寄存器数据"""
-        registers = []
-
-        for field in self.root.findall(".//field[@class='Field']"):
-            name = field.findtext("name")
-            caption = field.findtext("caption") or name
-            address = field.findtext("address")
-            default_value = field.findtext("defaultvalue")
-            size = field.findtext("size")
-            description = field.findtext("description") or ""
-            datatype = field.findtext("datatype") or ""
-            mask = field.findtext("mask") or "{}"
-            shift = field.findtext("shift") or "{}"
-            byteorder = field.findtext("byteorder") or ""
-
-            # 解析基地址
-            base_addr = "0x0000"
-            if address:
-                match = re.match(r"(0x[0-9A-Fa-f]+)", address)
-                base_addr = match.group(1) if match else address.split(".")[0]
-
-            # 解析位域范围
-            bit_range = None
-            range_match = re.search(r"\[(\d+):(\d+)\]", name) if name else None
-            if range_match:
-                msb = int(range_match.group(1))
-                lsb = int(range_match.group(2))
-                bit_range = f"[{msb}:{lsb}]"
-                total_bits = msb - lsb + 1
+    def _parse_field(self, field, registers: List[RegisterData]):
+        """解析单个 field 节点，按字节配置追加寄存器条目"""
+        # 一次遍历子节点建立 {tag: text}；倒序构建使同名子节点取第一个，与 findtext 一致
+        kids = {child.tag: child.text or "" for child in reversed(field)}
+        name = kids.get("name")
+        caption = kids.get("caption") or name
+        address = kids.get("address")
+        default_value = kids.get("defaultvalue")
+        size = kids.get("size")
+        description = kids.get("description") or ""
+        datatype = kids.get("datatype") or ""
+        mask = kids.get("mask") or "{}"
+        shift = kids.get("shift") or "{}"
+
+        # 解析基地址
+        base_addr = "0x0000"
+        if address:
+            match = _ADDR_RE.match(address)
+            base_addr = match.group(1) if match else address.split(".")[0]
+
+        # 解析位域范围
+        bit_range = None
+        range_match = _RANGE_RE.search(name) if name else None
+        if range_match:
+            msb = int(range_match.group(1))
+            lsb = int(range_match.group(2))
+            bit_range = f"[{msb}:{lsb}]"
+            total_bits = msb - lsb + 1
+        else:
+            total_bits = int(size) if size else 1
+
+        # 解析 mask 和 shift
+        mask_map = dict(self._parse_mask_shift(mask))
+        shift_map = dict(self._parse_mask_shift(shift))
+        # 字节地址顺序：先 mask 中出现的，再补 shift 独有的
+        configs = {
+            addr: (mask_map.get(addr), shift_map.get(addr, ""))
+            for addr in {**mask_map, **shift_map}
+        }
+
+        # 为每个字节配置创建条目
+        for byte_addr, (byte_mask, byte_shift) in configs.items():
+            mask_val = "0x00" if byte_mask is None else byte_mask
+            effective_bits = bin(int(mask_val, 16)).count("1")
+
+            # 预解析数值字段，避免每次生成命令时重复 int()
+            mask_int = _parse_int(byte_mask, 16)
+            if mask_int is None:
+                lsb_bits = (None, None)
+            elif 0 <= mask_int <= 0xFF:
+                lsb_bits = _MASK_LUT[mask_int]
             else:
-                total_bits = int(size) if size else 1
-
-            # 解析 mask 和 shift
-            mask_entries = self._parse_mask_shift(mask)
-            shift_entries = self._parse_mask_shift(shift)
-
-            configs = defaultdict(dict)
-            for addr, mask_val in mask_entries:
-                configs[addr]["mask"] = mask_val
-            for addr, shift_val in shift_entries:
-                configs[addr]["shift"] = shift_val
-
-            # 为每个字节配置创建条目
-            for byte_addr, byte_config in configs.items():
-                mask_val = byte_config.get("mask", "0x00")
-                effective_bits = bin(int(mask_val, 16)).count("1")
-
-                register_data = {
-                    "register_name": self._clean_reg_name(caption) if caption else "",
-                    "base_address": base_addr,
-                    "field_name": name,
-                    "bit_range": bit_range,
-                    "total_bits": total_bits,
-                    "default_value": default_value,
-                    "data_type": datatype,
-                    "description": description,
-                    "byte_address": byte_addr,
-                    "byte_mask": byte_config.get("mask", ""),
-                    "byte_shift": byte_config.get("shift", ""),
-                    "effective_bits": effective_bits,
-                }
-                registers.append(register_data)
-
-        # 按 PAGE 组织
-        self.json_data = self._organize_by_page(registers)
+                lsb_bits = _mask_lsb_bits(mask_int)
+
+            register_data = RegisterData(
+                register_name=self._clean_reg_name(caption) if caption else "",
+                base_address=base_addr,
+                field_name=name,
+                bit_range=bit_range,
+                total_bits=total_bits,
+                default_value=default_value,
+                data_type=datatype,
+                description=description,
+                byte_address=byte_addr,
+                byte_mask=byte_mask or "",
+                byte_shift=byte_shift,
+                effective_bits=effective_bits,
+                codegen=CodegenInfo(
+                    _parse_int(byte_addr, 16),
+                    mask_int,
+                    _parse_int(byte_shift, 10),
+                    *lsb_bits,
+                ),
+            )
+            registers.append(register_data)
 
     def _clean_reg_name(self, name: str) -> str:
         """清理寄存器名称中的特殊字符"""
         if not name:
             return name
-        name = name.replace(" ", "_")
-        name = name.replace("/", "_")
-        name = name.replace("-", "_")
-        name = name.replace("[", "_")
-        name = name.replace("]", "_")
-        name = name.replace("(", "_")
-        name = name.replace(")", "_")
-        return name
-
-    def _organize_by_page(self, registers: List[dict]) -> Dict[str, List[dict]]:
+        return name.translate(_CLEAN_TABLE)
+
+    def _organize_by_page(
+        self, registers: List[RegisterData]
+    ) -> Dict[str, List[RegisterData]]:
         """按 PAGE 组织寄存器数据"""
         organized = {}
         for reg in registers:
-            byte_addr = reg.get("byte_address")
+            byte_addr = reg.byte_address
             if not byte_addr:
                 continue
             page_name = self._get_base_key(byte_addr)
@@ -214,13 +382,16 @@ class AutoClassGenerator:
             if page not in self.page_reg_map:
                 self.page_reg_map[page] = {}
             for reg in registers:
-                reg_name = reg.get("register_name")
+                reg_name = reg.register_name
                 if reg_name:
                     if reg_name not in self.page_reg_map[page]:
                         self.page_reg_map[page][reg_name] = []
-                    self.page_reg_map[page][reg_name].append(reg.copy())
+                    # 与 json_data 共用同一个对象，替换流程只读不改
+                    self.page_reg_map[page][reg_name].append(reg)
 
-    def _get_register_info(self, page: str, reg_name: str) -> Optional[List[dict]]:
+    def _get_register_info(
+        self, page: str, reg_name: str
+    ) -> Optional[Tuple[RegisterData, ...]]:
         """O(1) 查找寄存器信息"""
         page_dict = self.page_reg_map.get(page)
         if not page_dict:
@@ -236,6 +407,11 @@ class AutoClassGenerator:
             valid_name = f"reg_{valid_name}"
         return valid_name
 
+    @staticmethod
+    def _is_valid_identifier(name: str) -> bool:
+        """检查名称能否作为 Python 类名"""
+        return name.isidentifier() and not keyword.iskeyword(name)
+
     # ==================== 功能 1: 生成 AutoClass 文件 ====================
 
     def generate_auto_class(self, output_path: Optional[str] = None) -> str:
@@ -256,101 +432,94 @@ class AutoClassGenerator:
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
         with open(output_path, "w", encoding="utf-8") as f:
-            # 文件头
-            f.write('"""\n')
-            f.write("Auto-generated Register Access Class\n")
-            f.write("Generated from: {}\n".format(os.path.basename(self.xml_file)))
-            f.write("=====================================\n\n")
-            f.write("This class provides IDE autocomplete for register access.\n")
-            f.write(
-                "Use with replace_autoclass_calls() to generate actual I2C code.\n\n"
-            )
-            f.write("Example:\n")
-            f.write("    AutoClass.AG.i2c_audio_format.r()      # Read register\n")
-            f.write("    AutoClass.AG.i2c_audio_format.w(0x3)   # Write register\n")
-            f.write('"""\n\n')
-
-            # 主类定义
-            f.write("class AutoClass:\n")
-            f.write('    """\n')
-            f.write("    Register access class for IDE autocomplete.\n")
-            f.write("    All methods are placeholders (pass).\n")
-            f.write(
-                "    Use replace_autoclass_calls() to replace with actual I2C code.\n"
-            )
-            f.write('    """\n\n')
-
             # 统计信息
             total_pages = len(self.json_data)
             total_regs = sum(len(regs) for regs in self.json_data.values())
+
+            # 文件头 + 主类定义
             f.write(
-                f"    # Total Pages: {total_pages}, Total Registers: {total_regs}\n\n"
+                "".join(
+                    [
+                        '"""\n',
+                        "Auto-generated Register Access Class\n",
+                        "Generated from: {}\n".format(os.path.basename(self.xml_file)),
+                        "=====================================\n\n",
+                        "This class provides IDE autocomplete for register access.\n",
+                        "Use with replace_autoclass_calls() to generate actual I2C code.\n\n",
+                        "Example:\n",
+                        "    AutoClass.AG.i2c_audio_format.r()      # Read register\n",
+                        "    AutoClass.AG.i2c_audio_format.w(0x3)   # Write register\n",
+                        '"""\n\n',
+                        "class AutoClass:\n",
+                        '    """\n',
+                        "    Register access class for IDE autocomplete.\n",
+                        "    All methods are placeholders (pass).\n",
+                        "    Use replace_autoclass_calls() to replace with actual I2C code.\n",
+                        '    """\n\n',
+                        f"    # Total Pages: {total_pages}, Total Registers: {total_regs}\n\n",
+                    ]
+                )
             )
 
-            # 为每个 PAGE 生成子类
+            # 为每个 PAGE 生成子类，每页拼接后一次写入
+            invalid_names = []
+            total_unique_regs = 0
             for page_name in sorted(self.json_data.keys()):
                 registers = self.json_data[page_name]
-                f.write(f"    class {page_name}:\n")
-                f.write(
-                    f'        """Page: {page_name}, Address: {self.dev_addr_dict.get(page_name, "N/A")}"""\n'
-                )
+                if not self._is_valid_identifier(page_name):
+                    invalid_names.append(page_name)
+                page_addr = self.dev_addr_dict.get(page_name, "N/A")
+                parts = [
+                    f"    class {page_name}:\n",
+                    f'        """Page: {page_name}, Address: {page_addr}"""\n',
+                ]
 
                 if not registers:
-                    f.write("        pass\n\n")
+                    parts.append("        pass\n\n")
+                    f.write("".join(parts))
                     continue
 
-                # 去重：一个 register_name 只生成一次
-                seen_regs = set()
-                for reg in registers:
-                    reg_name = reg.get("register_name")
-                    if not reg_name or reg_name in seen_regs:
-                        continue
-                    seen_regs.add(reg_name)
-
+                # page_reg_map 已按 register_name 去重，取每个寄存器的首个字节条目
+                page_regs = self.page_reg_map[page_name]
+                total_unique_regs += len(page_regs)
+                for reg_name, reg_info_list in page_regs.items():
+                    reg = reg_info_list[0]
                     class_name = self._to_valid_class_name(reg_name)
-                    byte_addr = reg.get("byte_address", "N/A")
+                    byte_addr = reg.byte_address
+                    if not self._is_valid_identifier(class_name):
+                        invalid_names.append(f"{page_name}.{class_name}")
 
-                    f.write(f"        class {class_name}:\n")
-                    f.write(
+                    parts.append(
+                        f"        class {class_name}:\n"
                         f'            """Register: {reg_name}, Address: {byte_addr}"""\n'
+                        "            @staticmethod\n"
+                        "            def r():\n"
+                        '                """Read register value"""\n'
+                        "                pass\n\n"
+                        "            @staticmethod\n"
+                        "            def w(val):\n"
+                        '                """Write value to register"""\n'
+                        "                pass\n\n"
                     )
-                    f.write("            @staticmethod\n")
-                    f.write("            def r():\n")
-                    f.write('                """Read register value"""\n')
-                    f.write("                pass\n\n")
-                    f.write("            @staticmethod\n")
-                    f.write("            def w(val):\n")
-                    f.write('                """Write value to register"""\n')
-                    f.write("                pass\n\n")
-
-                f.write("\n")
-
-        # Calculate total unique registers
-        total_unique_regs = sum(
-            len(
-                set(
-                    reg.get("register_name") for reg in regs if reg.get("register_name")
-                )
-            )
-            for regs in self.json_data.values()
-        )
+
+                parts.append("\n")
+                f.write("".join(parts))
 
         print(f"✓ AutoClass generated: {output_path}")
         print(f"  Pages: {total_pages}, Unique Registers: {total_unique_regs}")
+        if invalid_names:
+            print(f"  ⚠ Invalid class names ({len(invalid_names)}), file will not import:")
+            print(f"    {', '.join(invalid_names)}")
         return output_path
 
     # ==================== 功能 2: 替换 AutoClass 调用 ====================
 
-    def _get_addr12(self, addr_str: str) -> Tuple[str, str]:
+    def _get_addr12(self, addr_int: int) -> Tuple[str, str]:
         """将 16 位地址拆分为 addr1, addr2"""
-        addr_int = int(addr_str, 16)
-        addr1 = (addr_int >> 8) & 0xFF
-        addr2 = addr_int & 0xFF
-        return (f"0x{addr1:02X}", f"0x{addr2:02X}")
+        return (f"0x{(addr_int >> 8) & 0xFF:02X}", f"0x{addr_int & 0xFF:02X}")
 
-    def _get_rshift_str(self, byte_shift: str) -> str:
+    def _get_rshift_str(self, shift: int) -> str:
         """生成位移字符串"""
-        shift = int(byte_shift)
         if shift == 0:
             return ""
         elif shift < 0:
@@ -358,23 +527,41 @@ class AutoClassGenerator:
         else:
             return f" >> {shift}"
 
-    def _get_read_cmd(self, reg_info: dict) -> str:
+    def _get_numeric(self, reg_info: RegisterData, name: str, source: str) -> int:
+        """取预解析的数值字段，缺失时按原始字符串报错"""
+        value = getattr(reg_info.codegen, name)
+        if value is None:
+            raise ValueError(
+                f"{reg_info.register_name} @ {reg_info.byte_address}: "
+                f"无效的 {source} {getattr(reg_info, source)!r}"
+            )
+        return value
+
+    def _get_read_cmd(self, reg_info: RegisterData) -> str:
         """生成读取命令"""
-        addr_str = reg_info.get("byte_address", "0x0000")
-        addr1, addr2 = self._get_addr12(addr_str)
+        addr1, addr2 = self._get_addr12(reg_info.codegen.addr_int)
 
-        byte_mask = reg_info.get("byte_mask")
+        byte_mask = reg_info.byte_mask
         if byte_mask == "0xFF":
             byte_mask_str = ""
         else:
             byte_mask_str = f" & {byte_mask}"
 
-        shift_str = self._get_rshift_str(reg_info.get("byte_shift", "0"))
+        shift = self._get_numeric(reg_info, "shift_int", "byte_shift")
+        shift_str = self._get_rshift_str(shift)
 
         cmd = f"({self.class_instance_name}.read_reg({addr1}, {addr2}){byte_mask_str}){shift_str}"
         return cmd
 
     def _get_read_list(self, page: str, reg_name: str) -> List[str]:
+        """生成读取寄存器的代码列表（按 (page, reg) 缓存）"""
+        key = (page, reg_name)
+        cmds = self._read_cache.get(key)
+        if cmds is None:
+            cmds = self._read_cache[key] = tuple(self._build_read_list(page, reg_name))
+        return list(cmds)
+
+    def _build_read_list(self, page: str, reg_name: str) -> List[str]:
         """生成读取寄存器的代码列表"""
         return_list = []
         reg_info_list = self._get_register_info(page, reg_name)
@@ -397,34 +584,13 @@ class AutoClassGenerator:
 
         return return_list
 
-    def _mask_to_lsb_bits(self, mask: str) -> Tuple[int, int]:
-        """将掩码转换为 LSB 位置和位数"""
-        mask_int = int(mask, 16)
-        if mask_int == 0:
-            return (0, 0)
-
-        # 计算 LSB 位置
-        lsb = (mask_int & -mask_int).bit_length() - 1
-
-        # 计算连续 1 的位数
-        shifted = mask_int >> lsb
-        bits = 0
-        while shifted & 1:
-            bits += 1
-            shifted >>= 1
-
-        return (lsb, bits)
-
-    def _get_w_val(self, shift: str, mask: str, w_str: str) -> int:
+    def _get_w_val(self, shift_num: int, mask_num: int, w_str: str) -> int:
         """计算写入值"""
         if w_str.startswith(("0x", "0X")):
             w_num = int(w_str, 16)
         else:
             w_num = int(w_str)
 
-        shift_num = int(shift)
-        mask_num = int(mask, 16)
-
         if shift_num == 0:
             return w_num & mask_num
         elif shift_num < 0:
@@ -432,39 +598,93 @@ class AutoClassGenerator:
         else:
             return ((w_num << shift_num) & mask_num) >> shift_num
 
-    def _get_write_cmd(self, reg_info: dict, value_var: str) -> str:
-        """生成写入命令"""
-        addr_str = reg_info.get("byte_address", "0x0000")
-        mask_str = reg_info.get("byte_mask", "0xFF")
-        shift_str = reg_info.get("byte_shift", "0")
+    def _get_write_template(self, page: str, reg_name: str) -> Optional[tuple]:
+        """
+        获取写入寄存器的命令模板（按 (page, reg) 缓存）
+
+        Returns:
+            每个字节一项 (addr1, addr2, lsb, bits, shift, mask)，寄存器不存在时为 None
+        """
+        key = (page, reg_name)
+        if key in self._write_cache:
+            return self._write_cache[key]
 
-        addr1, addr2 = self._get_addr12(addr_str)
-        lsb, bits = self._mask_to_lsb_bits(mask_str)
-        write_val_num = self._get_w_val(shift_str, mask_str, value_var)
+        template = None
+        reg_info_list = self._get_register_info(page, reg_name)
+        if reg_info_list:
+            entries = []
+            for reg_info in reg_info_list:
+                codegen = reg_info.codegen
+                addr1, addr2 = self._get_addr12(codegen.addr_int)
+                mask = self._get_numeric(reg_info, "mask_int", "byte_mask")
+                shift = self._get_numeric(reg_info, "shift_int", "byte_shift")
+                lsb, bits = codegen.lsb, codegen.bits
+                entries.append((addr1, addr2, lsb, bits, shift, mask))
+            template = tuple(entries)
 
-        cmd = f"{self.class_instance_name}.write_bits({addr1}, {addr2}, {lsb}, {bits}, {write_val_num})"
-        return cmd
+        self._write_cache[key] = template
+        return template
 
     def _get_write_list(self, page: str, reg_name: str, value_var: str) -> List[str]:
         """生成写入寄存器的代码列表"""
-        return_list = []
-        reg_info_list = self._get_register_info(page, reg_name)
-
-        if not reg_info_list:
-            return_list.append(f"# ERROR: {page}.{reg_name} not found")
-            return return_list
+        template = self._get_write_template(page, reg_name)
+        if template is None:
+            return [f"# ERROR: {page}.{reg_name} not found"]
 
         # 添加注释
-        return_list.append(f"# w {page}:{reg_name} <- {value_var}")
+        return_list = [f"# w {page}:{reg_name} <- {value_var}"]
 
-        for reg_info in reg_info_list:
-            full_cmd = self._get_write_cmd(reg_info, value_var)
-            return_list.append(full_cmd)
+        inst = self.class_instance_name
+        for addr1, addr2, lsb, bits, shift, mask in template:
+            write_val_num = self._get_w_val(shift, mask, value_var)
+            return_list.append(
+                f"{inst}.write_bits({addr1}, {addr2}, {lsb}, {bits}, {write_val_num})"
+            )
 
         return return_list
 
+    def _rewrite_lines(self, lines, hits: Counter, verbose: bool = False):
+        """
+        逐行替换 AutoClass 调用，未匹配的行原样产出
+
+        每次替换在 hits 中按 (op, page, reg) 计数；verbose 时另外逐条打印。
+        """
+        # 热循环中用到的方法先绑定为局部变量
+        search = _CALL_RE.search
+        get_read_list = self._get_read_list
+        get_write_list = self._get_write_list
+
+        for line in lines:
+            match = search(line)
+            if not match:
+                yield line
+                continue
+
+            page, reg, op, args = match.group("page", "reg", "op", "args")
+            args = args.strip()
+            indent = line[: len(line) - len(line.lstrip())]
+
+            if op == "r":
+                cmds = get_read_list(page, reg)
+                hits["READ", page, reg] += 1
+                if verbose:
+                    print(f"[READ] {page}.{reg}")
+            else:  # op == 'w'
+                value_var = args if args else "0"
+                cmds = get_write_list(page, reg, value_var)
+                hits["WRITE", page, reg] += 1
+                if verbose:
+                    print(f"[WRITE] {page}.{reg} <- {value_var}")
+
+            for cmd in cmds:
+                yield f"{indent}{cmd}\n"
+
     def replace_autoclass_calls(
-        self, file_path: str, output_path: Optional[str] = None, backup: bool = True
+        self,
+        file_path: str,
+        output_path: Optional[str] = None,
+        backup: bool = True,
+        verbose: bool = False,
     ) -> str:
         """
         将文件中的 AutoClass 调用替换为实际 I2C 代码
@@ -477,66 +697,61 @@ class AutoClassGenerator:
             file_path: 输入文件路径
             output_path: 输出文件路径，默认覆盖原文件
             backup: 是否备份原文件
+            verbose: 逐条打印每次替换；默认只在结束时按寄存器汇总打印一次
 
         Returns:
             输出文件路径
         """
         if output_path is None:
             output_path = file_path
+        # 目标是符号链接时替换其指向的文件，而不是把链接本身换成普通文件
+        output_path = os.path.realpath(output_path)
 
         # 备份原文件
-        if backup and file_path == output_path:
+        if backup and os.path.realpath(file_path) == output_path:
             backup_path = file_path + ".bak"
-            if os.path.exists(file_path):
-                shutil.copy2(file_path, backup_path)
+            if os.path.exists(output_path):
+                # 输出经临时文件 os.replace 到新 inode，原文件内容不会被改写，
+                # 因此备份可直接用硬链接；不支持硬链接时退回复制
+                if os.path.lexists(backup_path):
+                    os.remove(backup_path)
+                try:
+                    os.link(output_path, backup_path)
+                except OSError:
+                    shutil.copy2(output_path, backup_path)
                 print(f"✓ Backup created: {backup_path}")
 
-        # 读取文件
-        with open(file_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-
-        # 匹配模式：AutoClass.<PAGE>.<reg>.<op>(<args>)
-        pattern = re.compile(
-            r"AutoClass\.(?P<page>\w+)\.(?P<reg>\w+)\.(?P<op>r|w)\(\s*(?P<args>[^)]*)\)"
-        )
-
-        new_lines = []
-        replaced_count = {"read": 0, "write": 0}
-
-        for line in lines:
-            match = pattern.search(line)
-            if match:
-                page = match.group("page")
-                reg = match.group("reg")
-                op = match.group("op")
-                args = match.group("args").strip()
-                indent_match = re.match(r"\s*", line)
-                indent = indent_match.group(0) if indent_match else ""
-
-                if op == "r":
-                    cmds = self._get_read_list(page, reg)
-                    replaced_count["read"] += 1
-                    print(f"[READ] {page}.{reg}")
-                else:  # op == 'w'
-                    value_var = args if args else "0"
-                    cmds = self._get_write_list(page, reg, value_var)
-                    replaced_count["write"] += 1
-                    print(f"[WRITE] {page}.{reg} <- {value_var}")
-
-                for cmd in cmds:
-                    new_lines.append(f"{indent}{cmd}\n")
-            else:
-                new_lines.append(line)
-
-        # 写回文件
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.writelines(new_lines)
+        hits = Counter()
+
+        # 逐行读取源文件、边生成边写入临时文件，完成后再替换目标，出错时不留下半截输出
+        tmp_path = output_path + ".tmp"
+        try:
+            with open(file_path, "r", encoding="utf-8") as src, open(
+                tmp_path, "w", encoding="utf-8"
+            ) as f:
+                f.writelines(self._rewrite_lines(src, hits, verbose))
+            # 临时文件按 umask 新建，沿用源文件的权限位（如可执行位）
+            shutil.copymode(file_path, tmp_path)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        if hits and not verbose:
+            sys.stdout.write(
+                "".join(
+                    f"[{op}] {page}.{reg}: {count}\n"
+                    for (op, page, reg), count in hits.items()
+                )
+            )
 
-        total = replaced_count["read"] + replaced_count["write"]
+        read_count = sum(c for (op, _, _), c in hits.items() if op == "READ")
+        write_count = sum(hits.values()) - read_count
         print(f"\n✓ Replacement complete: {output_path}")
-        print(f"  Read operations: {replaced_count['read']}")
-        print(f"  Write operations: {replaced_count['write']}")
-        print(f"  Total replaced: {total}")
+        print(f"  Read operations: {read_count}")
+        print(f"  Write operations: {write_count}")
+        print(f"  Total replaced: {read_count + write_count}")
 
         return output_path
 
@@ -562,47 +777,47 @@ class AutoClassGenerator:
         # 确保目录存在
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
 
+        # 文件头
+        body = [
+            '"""\n',
+            "Register Definition Constants\n",
+            "Generated from: {}\n".format(os.path.basename(self.xml_file)),
+            "=====================================\n\n",
+            "This file defines I2C memory page addresses extracted from XML.\n",
+            "Use these constants to access chip registers.\n\n",
+            "Example:\n",
+            "    from library.reg_define import *\n",
+            "    device.read_reg(AG, 0x00)  # Read from AG page\n",
+            '"""\n\n',
+        ]
+
+        # 按页面名称排序生成定义
+        sorted_pages = sorted(self.dev_addr_dict.items())
+
+        if sorted_pages:
+            body.append("# I2C Memory Page Addresses\n")
+            body.extend(f"{name} = {addr}\n" for name, addr in sorted_pages)
+            body.append("\n")
+
+            # 添加字典映射便于查询
+            body.append("# Page Name to Address Mapping\nPAGE_MAP = {\n")
+            body.extend(f'    "{name}": {addr},\n' for name, addr in sorted_pages)
+            body.append("}\n\n")
+
+            # 添加反向映射（地址到名称）
+            body.append("# Address to Page Name Mapping\nADDR_MAP = {\n")
+            body.extend(f'    {addr}: "{name}",\n' for name, addr in sorted_pages)
+            body.append("}\n\n")
+
+            # 统计信息和导出清单（sorted_pages 已按名称排序）
+            body.append(f"# Total Pages: {len(sorted_pages)}\n")
+            all_exports = [name for name, _ in sorted_pages]
+            all_exports.extend(["PAGE_MAP", "ADDR_MAP"])
+            body.append(f"__all__ = {all_exports}\n")
+
+        # 整个文件一次写入
         with open(output_path, "w", encoding="utf-8") as f:
-            # 文件头
-            f.write('"""\n')
-            f.write("Register Definition Constants\n")
-            f.write("Generated from: {}\n".format(os.path.basename(self.xml_file)))
-            f.write("=====================================\n\n")
-            f.write("This file defines I2C memory page addresses extracted from XML.\n")
-            f.write("Use these constants to access chip registers.\n\n")
-            f.write("Example:\n")
-            f.write("    from library.reg_define import *\n")
-            f.write("    device.read_reg(AG, 0x00)  # Read from AG page\n")
-            f.write('"""\n\n')
-
-            # 按页面名称排序生成定义
-            sorted_pages = sorted(self.dev_addr_dict.items())
-
-            if sorted_pages:
-                f.write("# I2C Memory Page Addresses\n")
-                for page_name, page_address in sorted_pages:
-                    f.write(f"{page_name} = {page_address}\n")
-                f.write("\n")
-
-                # 添加字典映射便于查询
-                f.write("# Page Name to Address Mapping\n")
-                f.write("PAGE_MAP = {\n")
-                for page_name, page_address in sorted_pages:
-                    f.write(f'    "{page_name}": {page_address},\n')
-                f.write("}\n\n")
-
-                # 添加反向映射（地址到名称）
-                f.write("# Address to Page Name Mapping\n")
-                f.write("ADDR_MAP = {\n")
-                for page_name, page_address in sorted_pages:
-                    f.write(f'    {page_address}: "{page_name}",\n')
-                f.write("}\n\n")
-
-                # 统计信息和导出清单
-                f.write(f"# Total Pages: {len(sorted_pages)}\n")
-                all_exports = sorted([page_name for page_name, _ in sorted_pages])
-                all_exports.extend(["PAGE_MAP", "ADDR_MAP"])
-                f.write(f"__all__ = {all_exports}\n")
+            f.write("".join(body))
 
         print(f"✓ Register definitions generated: {output_path}")
         print(f"  Total pages: {len(sorted_pages)}")
@@ -643,8 +858,6 @@ class AutoClassGenerator:
 # ==================== 命令行接口 ====================
 
 if __name__ == "__main__":
-    import sys
-
     if len(sys.argv) < 2:
         print("Usage:")
         print("  python unified_generator.py <xml_file>")
@@ -0,0 +1,28 @@
+"""
+Shared pytest setup for the ic_psd3 tests.
+
+Puts hw_bridge, the src/ bridge packages and library/ on sys.path so the
+tests run from a plain checkout, without ``pip install -e``.
+"""
+
+import os
+import sys
+
+import pytest
+
+_IC_PSD3 = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for _path in (_IC_PSD3, os.path.join(_IC_PSD3, "src"), os.path.join(_IC_PSD3, "src", "hw_bridge")):
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+from hw_bridge.drivers.mock_driver import MockDriver  # noqa: E402
+
+
+@pytest.fixture
+def mock_device():
+    """An open, quiet MockDriver with empty logs."""
+    device = MockDriver(verbose=False)
+    device.open()
+    yield device
+    device.close()
@@ -0,0 +1,195 @@
+"""Tests for hw_bridge.drivers.pi_driver, with smbus2 and i2ctransfer faked."""
+
+import errno
+import sys
+import types
+
+import pytest
+
+from hw_bridge.drivers import pi_driver
+from hw_bridge.drivers.pi_driver import RaspberryPiDriver
+from hw_bridge.utils.regtable import pack_table
+
+
+class FakeMsg:
+    """Stand-in for smbus2.i2c_msg: a write or read message."""
+
+    def __init__(self, kind, addr, data):
+        self.kind = kind
+        self.addr = addr
+        self.data = bytearray(data)
+
+    def __iter__(self):
+        return iter(self.data)
+
+    @classmethod
+    def write(cls, addr, data):
+        return cls("w", addr, data)
+
+    @classmethod
+    def read(cls, addr, num):
+        return cls("r", addr, bytes(num))
+
+
+class FakeBus:
+    """Stand-in for smbus2.SMBus: records transfers, can fail on demand."""
+
+    def __init__(self, port):
+        self.port = port
+        self.registers = {}
+        self.transfers = []
+        self.failures = []
+        self.closed = False
+
+    def i2c_rdwr(self, *msgs):
+        if self.failures:
+            raise self.failures.pop(0)
+        address = None
+        for msg in msgs:
+            if msg.kind == "w":
+                address = (msg.data[0], msg.data[1])
+                for i, value in enumerate(msg.data[2:]):
+                    self.registers[(address[0], address[1] + i)] = value
+            else:
+                for i in range(len(msg.data)):
+                    msg.data[i] = self.registers.get((address[0], address[1] + i), 0)
+        self.transfers.append([(msg.kind, bytes(msg.data)) for msg in msgs])
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_smbus(monkeypatch):
+    """Install a fake smbus2 module and skip retry sleeps."""
+    buses = []
+
+    def smbus(port):
+        bus = FakeBus(port)
+        buses.append(bus)
+        return bus
+
+    monkeypatch.setitem(sys.modules, "smbus2", types.SimpleNamespace(SMBus=smbus, i2c_msg=FakeMsg))
+    monkeypatch.setattr(pi_driver.time, "sleep", lambda seconds: None)
+    return buses
+
+
+@pytest.fixture
+def bus_driver(fake_smbus):
+    driver = RaspberryPiDriver(i2c_port=1, chip_addr=0x58)
+    driver.open()
+    yield driver, fake_smbus[0]
+    driver.close()
+
+
+def test_write_stream_chains_runs_in_one_transfer(bus_driver):
+    driver, bus = bus_driver
+
+    driver.write_stream(pack_table([(0x15, 0x00, 0x01), (0x15, 0x01, 0x02), (0x09, 0x02, 0x13)]))
+
+    assert bus.transfers == [[("w", b"\x15\x00\x01\x02"), ("w", b"\x09\x02\x13")]]
+
+
+def test_write_stream_splits_transfers_at_max_msgs(bus_driver):
+    driver, bus = bus_driver
+    count = RaspberryPiDriver.MAX_MSGS + 3
+
+    # Every other offset, so no two registers merge into one message
+    driver.write_stream(pack_table([(0x09, 2 * i, i) for i in range(count)]))
+
+    assert [len(transfer) for transfer in bus.transfers] == [RaspberryPiDriver.MAX_MSGS, 3]
+    assert bus.registers[(0x09, 2 * (count - 1))] == count - 1
+
+
+def test_write_stream_without_auto_increment(fake_smbus):
+    driver = RaspberryPiDriver(auto_increment=False)
+    driver.open()
+
+    driver.write_stream(pack_table([(0x15, 0x00, 0x01), (0x15, 0x01, 0x02)]))
+
+    assert fake_smbus[0].transfers == [[("w", b"\x15\x00\x01"), ("w", b"\x15\x01\x02")]]
+
+
+def test_read_regs_uses_one_combined_transfer(bus_driver):
+    driver, bus = bus_driver
+    bus.registers.update({(0x09, 0x02): 0x13, (0x09, 0x03): 0x01})
+
+    assert driver.read_regs(0x09, 0x02, 2) == [0x13, 0x01]
+    assert driver.read_reg(0x09, 0x03) == 0x01
+    assert bus.transfers[0] == [("w", b"\x09\x02"), ("r", b"\x13\x01")]
+
+
+def test_transient_errors_are_retried(bus_driver):
+    driver, bus = bus_driver
+    bus.failures = [OSError(errno.EIO, "I/O error"), OSError(errno.EAGAIN, "busy")]
+
+    driver.write_reg(0x09, 0x02, 0x13)
+
+    assert bus.failures == []
+    assert bus.transfers == [[("w", b"\x09\x02\x13")]]
+
+
+def test_fatal_errors_are_not_retried(bus_driver):
+    driver, bus = bus_driver
+    bus.failures = [OSError(errno.ENXIO, "no device"), OSError(errno.EIO, "unused")]
+
+    with pytest.raises(RuntimeError):
+        driver.write_reg(0x09, 0x02, 0x13)
+
+    assert len(bus.failures) == 1
+    assert bus.transfers == []
+
+
+def test_retries_give_up_after_max_retries(bus_driver):
+    driver, bus = bus_driver
+    bus.failures = [OSError(errno.EIO, "I/O error")] * RaspberryPiDriver.MAX_RETRIES
+
+    with pytest.raises(RuntimeError, match="after"):
+        driver.read_reg(0x09, 0x02)
+
+    assert bus.failures == []
+
+
+def test_close_releases_the_bus(bus_driver):
+    driver, bus = bus_driver
+
+    driver.close()
+
+    assert bus.closed
+    assert not driver.is_open
+
+
+def test_open_falls_back_to_i2ctransfer_when_the_bus_cannot_open(monkeypatch):
+    def smbus(port):
+        raise FileNotFoundError(errno.ENOENT, "No such file", f"/dev/i2c-{port}")
+
+    monkeypatch.setitem(sys.modules, "smbus2", types.SimpleNamespace(SMBus=smbus, i2c_msg=FakeMsg))
+    monkeypatch.setattr(pi_driver.shutil, "which", lambda path: path)
+    driver = RaspberryPiDriver(use_smbus=None)
+    commands = []
+    driver._run_command = commands.append
+
+    driver.open()
+    driver.write_stream(pack_table([(0x15, 0x00, 0x01), (0x15, 0x01, 0x02), (0x09, 0x02, 0x13)]))
+
+    assert driver.is_open
+    assert commands == [
+        "/usr/sbin/i2ctransfer -f -y 1 w4@0x58 0x15 0x0 0x1 0x2 w3@0x58 0x9 0x2 0x13"
+    ]
+
+
+def test_open_raises_runtime_error_when_smbus_is_required(monkeypatch):
+    def smbus(port):
+        raise PermissionError(errno.EACCES, "Permission denied")
+
+    monkeypatch.setitem(sys.modules, "smbus2", types.SimpleNamespace(SMBus=smbus, i2c_msg=FakeMsg))
+
+    with pytest.raises(RuntimeError, match="smbus2"):
+        RaspberryPiDriver(use_smbus=True).open()
+
+
+def test_open_without_i2ctransfer_fails(monkeypatch):
+    monkeypatch.setattr(pi_driver.shutil, "which", lambda path: None)
+
+    with pytest.raises(RuntimeError, match="i2ctransfer"):
+        RaspberryPiDriver(use_smbus=False).open()
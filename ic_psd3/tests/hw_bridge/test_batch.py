@@ -0,0 +1,123 @@
+"""Tests for hw_bridge.batch.WriteBatch."""
+
+import pytest
+
+from hw_bridge import WriteBatch
+from hw_bridge.utils.regtable import pack_table
+
+
+def test_writes_are_deferred_until_the_outer_block_exits(mock_device):
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x02, 0x13)
+        batch.write_reg(0x09, 0x03, 0x01)
+        assert mock_device.write_log == []
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)]
+    assert mock_device.registers[(0x09, 0x02)] == 0x13
+
+
+def test_nested_batches_join_the_outer_batch(mock_device):
+    with mock_device.batch() as outer:
+        outer.write_reg(0x09, 0x02, 0x13)
+        assert mock_device.in_batch
+        with mock_device.batch() as inner:
+            assert inner is outer
+            inner.write_reg(0x09, 0x03, 0x01)
+        assert mock_device.write_log == []
+        outer.write_reg(0x09, 0x04, 0x02)
+
+    assert not mock_device.in_batch
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x03, 0x01), (0x09, 0x04, 0x02)]
+
+
+def test_read_flushes_pending_writes(mock_device):
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x02, 0x13)
+        assert batch.read_reg(0x09, 0x02) == 0x13
+        assert mock_device.write_log == [(0x09, 0x02, 0x13)]
+        batch.write_reg(0x09, 0x03, 0x01)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)]
+
+
+def test_read_regs_flushes_and_delegates(mock_device):
+    calls = []
+    read_regs = mock_device.read_regs
+    mock_device.read_regs = lambda *args: calls.append(args) or read_regs(*args)
+
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x03, 0x7F)
+        assert batch.read_regs(0x09, 0x02, 3) == [0x00, 0x7F, 0x00]
+
+    assert calls == [(0x09, 0x02, 3)]
+    assert mock_device.write_log == [(0x09, 0x03, 0x7F)]
+
+
+def test_write_bits_reads_the_queued_value(mock_device):
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x02, 0xF0)
+        batch.write_bits(0x09, 0x02, 0, 2, 0x3)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0xF0), (0x09, 0x02, 0xF3)]
+
+
+def test_dedupe_drops_repeated_values(mock_device):
+    with mock_device.batch(dedupe=True) as batch:
+        batch.write_reg(0x09, 0x02, 0x13)
+        batch.write_reg(0x09, 0x02, 0x13)
+        batch.write_stream(pack_table([(0x09, 0x02, 0x13), (0x09, 0x02, 0x14)]))
+        batch.write_reg(0x09, 0x02, 0x13)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x02, 0x14), (0x09, 0x02, 0x13)]
+
+
+def test_without_dedupe_every_write_is_sent(mock_device):
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x02, 0x13)
+        batch.write_reg(0x09, 0x02, 0x13)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x02, 0x13)]
+
+
+def test_dedupe_does_not_drop_repeats(mock_device):
+    power_up = pack_table([(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)])
+    with mock_device.batch(dedupe=True) as batch:
+        batch.write_stream(power_up)
+        batch.write_stream_repeat(power_up, 2)
+        batch.write_stream(power_up)
+
+    assert mock_device.write_log == [
+        (0x09, 0x02, 0x13),
+        (0x09, 0x03, 0x01),
+        (0x09, 0x02, 0x13),
+        (0x09, 0x03, 0x01),
+        (0x09, 0x02, 0x13),
+        (0x09, 0x03, 0x01),
+    ]
+
+
+def test_block_write_flushes_first(mock_device):
+    with mock_device.batch() as batch:
+        batch.write_reg(0x09, 0x02, 0x13)
+        batch.write_block(0x15, 0x00, [0x01, 0x02])
+        batch.write_reg(0x09, 0x03, 0x01)
+
+    assert mock_device.write_log == [
+        (0x09, 0x02, 0x13),
+        (0x15, 0x00, 0x01),
+        (0x15, 0x01, 0x02),
+        (0x09, 0x03, 0x01),
+    ]
+
+
+def test_stream_length_is_checked(mock_device):
+    with mock_device.batch() as batch:
+        with pytest.raises(ValueError):
+            batch.write_stream(b"\x09\x02")
+
+
+def test_batch_mirrors_device_settings(mock_device):
+    mock_device.auto_increment = False
+    batch = WriteBatch(mock_device)
+    assert batch.chip_addr == mock_device.chip_addr
+    assert batch.auto_increment is False
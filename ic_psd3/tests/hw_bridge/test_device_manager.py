@@ -0,0 +1,108 @@
+"""Tests for hw_bridge.device_manager.DeviceManager."""
+
+import asyncio
+
+import pytest
+
+from hw_bridge import DeviceManager, ShadowDevice
+from hw_bridge.drivers.mock_driver import MockDriver
+
+
+@pytest.fixture
+def manager():
+    manager = DeviceManager(auto_open=True, register_atexit=False)
+    yield manager
+    manager.close_all()
+
+
+def test_register_many_opens_every_device(manager):
+    devices = manager.register_many(
+        [
+            ("tx", "mock", {"verbose": False, "chip_addr": 0x58}),
+            ("rx", "mock", {"verbose": False, "chip_addr": 0x59}),
+        ]
+    )
+
+    assert set(devices) == {"tx", "rx"}
+    assert manager["tx"] is devices["tx"] and manager["tx"].is_open
+    assert manager["rx"].chip_addr == 0x59
+
+
+def test_register_many_rolls_back_when_an_open_fails(manager, monkeypatch):
+    closed = []
+    close = MockDriver.close
+    monkeypatch.setattr(MockDriver, "close", lambda self: closed.append(self) or close(self))
+
+    with pytest.raises(RuntimeError, match="bad"):
+        manager.register_many(
+            [
+                ("tx", "mock", {"verbose": False}),
+                ("bad", "no_such_driver", {}),
+            ]
+        )
+
+    assert len(closed) == 1 and not closed[0].is_open
+    assert "tx" not in manager and "bad" not in manager
+    assert len(manager) == 0
+    # The names can be registered again after the failed call
+    manager.register("tx", "mock", verbose=False)
+
+
+def test_register_many_rejects_duplicate_names(manager):
+    manager.register("tx", "mock", verbose=False)
+
+    with pytest.raises(ValueError):
+        manager.register_many([("tx", "mock", {"verbose": False})])
+    with pytest.raises(ValueError):
+        manager.register_many(
+            [("rx", "mock", {"verbose": False}), ("rx", "mock", {"verbose": False})]
+        )
+    assert "rx" not in manager
+
+
+def test_register_many_lazy_mode_opens_on_first_access():
+    manager = DeviceManager(auto_open=False, register_atexit=False)
+
+    assert manager.register_many([("tx", "mock", {"verbose": False})]) == {"tx": None}
+    assert manager["tx"].is_open
+    manager.close_all()
+
+
+def test_register_with_shadow_wraps_the_device(manager):
+    device = manager.register("tx", "mock", verbose=False, shadow=True)
+
+    assert isinstance(device, ShadowDevice)
+    device.write_reg(0x09, 0x02, 0x13)
+    device.write_reg(0x09, 0x02, 0x13)
+    assert device.device.write_log == [(0x09, 0x02, 0x13)]
+
+
+def test_close_all_shuts_down_async_executors(manager):
+    devices = manager.register_many(
+        [("tx", "mock", {"verbose": False}), ("rx", "mock", {"verbose": False, "shadow": True})]
+    )
+
+    async def run():
+        await asyncio.gather(*(device.read_reg_async(0x09, 0x02) for device in devices.values()))
+
+    asyncio.run(run())
+    assert all(device._async_executor is not None for device in devices.values())
+
+    manager.close_all()
+
+    assert all(device._async_executor is None for device in devices.values())
+    assert not devices["tx"].is_open
+
+
+def test_async_context_manager_closes_devices():
+    async def run():
+        async with DeviceManager(register_atexit=False) as manager:
+            device = manager.register("tx", "mock", verbose=False)
+            await device.write_reg_async(0x09, 0x02, 0x13)
+        return device
+
+    device = asyncio.run(run())
+
+    assert not device.is_open
+    assert device._async_executor is None
+    assert device.write_log == [(0x09, 0x02, 0x13)]
@@ -0,0 +1,151 @@
+"""Tests for the default IDevice helpers in hw_bridge.interfaces."""
+
+import asyncio
+import threading
+
+import pytest
+
+from hw_bridge import IDevice
+from hw_bridge.utils.regtable import pack_table
+
+
+class RecordingDevice(IDevice):
+    """Minimal IDevice that records single writes and block writes."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.registers = {}
+        self.transactions = []
+
+    def open(self):
+        self._is_open = True
+
+    def close(self):
+        self._shutdown_async()
+        self._is_open = False
+
+    @property
+    def is_open(self):
+        return self._is_open
+
+    def write_reg(self, addr1, addr2, value):
+        self.transactions.append(("reg", addr1, addr2, value))
+        self.registers[(addr1, addr2)] = value
+
+    def read_reg(self, addr1, addr2):
+        return self.registers.get((addr1, addr2), 0x00)
+
+    def write_block(self, addr1, addr2, data):
+        self.transactions.append(("block", addr1, addr2, bytes(data)))
+        for i, value in enumerate(data):
+            self.registers[(addr1, addr2 + i)] = value
+
+
+STREAM = pack_table([(0x15, 0x00, 0x01), (0x15, 0x01, 0x02), (0x09, 0x02, 0x13)])
+
+
+def test_write_stream_merges_consecutive_offsets_by_default():
+    device = RecordingDevice()
+    assert device.auto_increment is True
+
+    device.write_stream(STREAM)
+
+    assert device.transactions == [
+        ("block", 0x15, 0x00, b"\x01\x02"),
+        ("reg", 0x09, 0x02, 0x13),
+    ]
+
+
+def test_write_stream_without_auto_increment_writes_each_register():
+    device = RecordingDevice(auto_increment=False)
+
+    device.write_stream(STREAM)
+
+    assert device.transactions == [
+        ("reg", 0x15, 0x00, 0x01),
+        ("reg", 0x15, 0x01, 0x02),
+        ("reg", 0x09, 0x02, 0x13),
+    ]
+
+
+def test_write_stream_rejects_partial_triples():
+    with pytest.raises(ValueError):
+        RecordingDevice().write_stream(b"\x09\x02")
+
+
+def test_write_stream_repeat_without_gap_sends_every_copy():
+    device = RecordingDevice()
+
+    device.write_stream_repeat(pack_table([(0x09, 0x02, 0x13)]), 3)
+
+    assert device.transactions == [("reg", 0x09, 0x02, 0x13)] * 3
+
+
+def test_write_reg_rmw_skips_unchanged_values_unless_told_not_to():
+    device = RecordingDevice()
+    device.registers[(0x09, 0x02)] = 0xF3
+
+    assert not device.write_reg_rmw(0x09, 0x02, 0x0F, 0x03)
+    assert device.transactions == []
+
+    assert device.write_reg_rmw(0x09, 0x02, 0x0F, 0x03, skip_unchanged=False)
+    assert device.write_reg_rmw(0x09, 0x02, 0x0F, 0x05)
+    assert device.transactions == [("reg", 0x09, 0x02, 0xF3), ("reg", 0x09, 0x02, 0xF5)]
+
+
+def test_write_reg_rmw_value_is_aligned_to_the_mask():
+    device = RecordingDevice()
+
+    device.write_reg_rmw(0x09, 0x02, 0xF0, 0x50)
+
+    assert device.registers[(0x09, 0x02)] == 0x50
+
+
+def test_write_bits_and_read_bits():
+    device = RecordingDevice()
+    device.registers[(0x09, 0x02)] = 0xFF
+
+    device.write_bits(0x09, 0x02, lsb=2, bits=3, value=0x2)
+
+    assert device.registers[(0x09, 0x02)] == 0xEB
+    assert device.read_bits(0x09, 0x02, lsb=2, bits=3) == 0x2
+
+
+def test_async_wrappers_run_on_one_worker_thread_per_device(mock_device):
+    mock_device.set_register(0x09, 0x03, 0x01)
+    threads = []
+    read_reg = mock_device.read_reg
+
+    def recording_read_reg(addr1, addr2):
+        threads.append(threading.current_thread())
+        return read_reg(addr1, addr2)
+
+    mock_device.read_reg = recording_read_reg
+
+    async def run():
+        await mock_device.write_reg_async(0x09, 0x02, 0x13)
+        await mock_device.write_stream_async(pack_table([(0x09, 0x04, 0x02)]))
+        return await asyncio.gather(
+            mock_device.read_reg_async(0x09, 0x02),
+            mock_device.read_regs_async(0x09, 0x02, 3),
+        )
+
+    value, values = asyncio.run(run())
+
+    assert value == 0x13
+    assert values == [0x13, 0x01, 0x02]
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x04, 0x02)]
+    assert len(set(threads)) == 1
+    assert threads[0] is not threading.main_thread()
+
+
+def test_close_shuts_down_the_async_executor(mock_device):
+    asyncio.run(mock_device.read_reg_async(0x09, 0x02))
+    executor = mock_device._async_executor
+    assert executor is not None
+
+    mock_device.close()
+
+    assert mock_device._async_executor is None
+    with pytest.raises(RuntimeError):
+        executor.submit(int)
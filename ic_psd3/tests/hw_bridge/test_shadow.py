@@ -0,0 +1,163 @@
+"""Tests for hw_bridge.shadow.ShadowDevice."""
+
+from hw_bridge import ShadowDevice
+from hw_bridge.utils.regtable import pack_table
+
+
+def test_unchanged_writes_are_skipped(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0x13)
+    shadow.write_reg(0x09, 0x02, 0x13)
+    shadow.write_reg(0x09, 0x02, 0x14)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x02, 0x14)]
+    assert shadow.skipped == 1
+
+
+def test_invalidate_forgets_values(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0x13)
+    shadow.write_reg(0x0A, 0x02, 0x13)
+    shadow.invalidate(0x09)
+    shadow.write_reg(0x09, 0x02, 0x13)
+    shadow.write_reg(0x0A, 0x02, 0x13)
+    shadow.invalidate()
+    shadow.write_reg(0x0A, 0x02, 0x13)
+
+    assert mock_device.write_log == [
+        (0x09, 0x02, 0x13),
+        (0x0A, 0x02, 0x13),
+        (0x09, 0x02, 0x13),
+        (0x0A, 0x02, 0x13),
+    ]
+
+
+def test_volatile_pages_and_disabled_shadow_always_write(mock_device):
+    shadow = ShadowDevice(mock_device, volatile_pages=(0x64,))
+    shadow.write_reg(0x64, 0xA0, 0x01)
+    shadow.write_reg(0x64, 0xA0, 0x01)
+    shadow.enabled = False
+    shadow.write_reg(0x09, 0x02, 0x13)
+    shadow.write_reg(0x09, 0x02, 0x13)
+
+    assert mock_device.write_log == [
+        (0x64, 0xA0, 0x01),
+        (0x64, 0xA0, 0x01),
+        (0x09, 0x02, 0x13),
+        (0x09, 0x02, 0x13),
+    ]
+
+
+def test_stream_drops_only_registers_already_known(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0x13)
+    mock_device.clear_logs()
+
+    shadow.write_stream(pack_table([(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)]))
+
+    assert mock_device.write_log == [(0x09, 0x03, 0x01)]
+
+
+def test_stream_keeps_sequences_repeated_within_it(mock_device):
+    # A flattened composite with three Chip_Power_Up calls in one stream
+    power_up = pack_table([(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)])
+    shadow = ShadowDevice(mock_device)
+    shadow.write_stream(power_up * 3)
+
+    assert mock_device.write_log == [
+        (0x09, 0x02, 0x13),
+        (0x09, 0x03, 0x01),
+    ] * 3
+
+
+def test_stream_keeps_pulses(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0x00)
+    mock_device.clear_logs()
+
+    shadow.write_stream(pack_table([(0x09, 0x02, 0x01), (0x09, 0x02, 0x00)]))
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x01), (0x09, 0x02, 0x00)]
+    assert shadow.shadow[(0x09, 0x02)] == 0x00
+
+
+def test_repeats_bypass_the_shadow(mock_device):
+    power_up = pack_table([(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)])
+    shadow = ShadowDevice(mock_device)
+    shadow.write_stream(power_up)
+    mock_device.clear_logs()
+
+    shadow.write_stream_repeat(power_up, 3)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0x13), (0x09, 0x03, 0x01)] * 3
+    assert shadow.shadow[(0x09, 0x03)] == 0x01
+
+
+def test_block_is_sent_whole_when_any_register_changed(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_block(0x15, 0x00, [0x01, 0x02, 0x03])
+    shadow.write_block(0x15, 0x00, [0x01, 0x02, 0x03])
+    shadow.write_block(0x15, 0x00, [0x01, 0x09, 0x03])
+
+    assert mock_device.write_log == [
+        (0x15, 0x00, 0x01),
+        (0x15, 0x01, 0x02),
+        (0x15, 0x02, 0x03),
+        (0x15, 0x00, 0x01),
+        (0x15, 0x01, 0x09),
+        (0x15, 0x02, 0x03),
+    ]
+
+
+def test_write_reg_multi_skips_unchanged_pages(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x10, 0x01, 0xAA)
+    mock_device.clear_logs()
+
+    shadow.write_reg_multi((0x10, 0x20), 0x01, 0xAA)
+
+    assert mock_device.write_log == [(0x20, 0x01, 0xAA)]
+
+
+def test_rmw_uses_the_shadow_instead_of_a_read(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0xF0)
+    mock_device.clear_logs()
+
+    assert shadow.write_reg_rmw(0x09, 0x02, 0x0F, 0x03)
+    assert not shadow.write_reg_rmw(0x09, 0x02, 0x0F, 0x03)
+
+    assert mock_device.read_log == []
+    assert mock_device.write_log == [(0x09, 0x02, 0xF3)]
+
+
+def test_rmw_reads_unknown_registers(mock_device):
+    mock_device.set_register(0x09, 0x02, 0xF0)
+    shadow = ShadowDevice(mock_device)
+
+    shadow.write_bits(0x09, 0x02, 0, 2, 0x3)
+
+    assert len(mock_device.read_log) == 1
+    assert mock_device.write_log == [(0x09, 0x02, 0xF3)]
+
+
+def test_rmw_can_write_unchanged_values(mock_device):
+    shadow = ShadowDevice(mock_device)
+    shadow.write_reg(0x09, 0x02, 0xF3)
+    mock_device.clear_logs()
+
+    assert shadow.write_reg_rmw(0x09, 0x02, 0x0F, 0x03, skip_unchanged=False)
+
+    assert mock_device.write_log == [(0x09, 0x02, 0xF3)]
+
+
+def test_reads_refresh_the_shadow(mock_device):
+    mock_device.set_register(0x09, 0x02, 0x13)
+    mock_device.set_register(0x09, 0x03, 0x01)
+    shadow = ShadowDevice(mock_device)
+
+    assert shadow.read_regs(0x09, 0x02, 2) == [0x13, 0x01]
+    shadow.write_reg(0x09, 0x03, 0x01)
+
+    assert shadow.shadow == {(0x09, 0x02): 0x13, (0x09, 0x03): 0x01}
+    assert mock_device.write_log == []
@@ -0,0 +1,95 @@
+"""Tests for hw_bridge.utils.regtable."""
+
+import pytest
+
+from hw_bridge.utils.regtable import (
+    coalesce_runs,
+    expand_pages,
+    pack_block,
+    pack_columns,
+    pack_table,
+)
+
+
+def test_pack_table():
+    assert pack_table([(0x09, 0x02, 0x13), (0x15, 0x00, 0xFF)]) == bytes(
+        [0x09, 0x02, 0x13, 0x15, 0x00, 0xFF]
+    )
+    assert pack_table([]) == b""
+
+
+def test_pack_table_rejects_out_of_range_fields():
+    with pytest.raises(ValueError):
+        pack_table([(0x09, 0x02, 0x100)])
+
+
+def test_pack_columns_matches_pack_table():
+    table = [(0x15, 0x00, 0x01), (0x15, 0x01, 0xC0), (0x37, 0x10, 0x43)]
+    pages, offsets, values = (bytes(column) for column in zip(*table))
+    assert pack_columns(pages, offsets, values) == pack_table(table)
+
+
+def test_pack_columns_rejects_uneven_columns():
+    with pytest.raises(ValueError):
+        pack_columns(b"\x15\x15", b"\x00", b"\x01\x02")
+
+
+def test_pack_block():
+    assert pack_block(0x15, 0x10, b"\x01\xC0\x43") == pack_table(
+        [(0x15, 0x10, 0x01), (0x15, 0x11, 0xC0), (0x15, 0x12, 0x43)]
+    )
+    assert pack_block(0x15, 0x10, b"") == b""
+
+
+def test_expand_pages_pair_major():
+    stream = expand_pages((0x10, 0x20), ((0x01, 0xAA), (0x02, 0xBB)))
+    assert stream == pack_table(
+        [(0x10, 0x01, 0xAA), (0x20, 0x01, 0xAA), (0x10, 0x02, 0xBB), (0x20, 0x02, 0xBB)]
+    )
+
+
+def test_expand_pages_page_major():
+    stream = expand_pages((0x10, 0x20), ((0x01, 0xAA), (0x02, 0xBB)), page_major=True)
+    assert stream == pack_table(
+        [(0x10, 0x01, 0xAA), (0x10, 0x02, 0xBB), (0x20, 0x01, 0xAA), (0x20, 0x02, 0xBB)]
+    )
+
+
+def test_coalesce_runs_merges_consecutive_offsets_on_one_page():
+    stream = pack_table(
+        [
+            (0x15, 0x00, 0x01),
+            (0x15, 0x01, 0x02),
+            (0x15, 0x02, 0x03),
+            (0x15, 0x04, 0x04),  # gap in offsets
+            (0x16, 0x05, 0x05),  # page change
+            (0x16, 0x06, 0x06),
+            (0x16, 0x06, 0x07),  # same offset again
+        ]
+    )
+    assert coalesce_runs(stream) == [
+        (0x15, 0x00, b"\x01\x02\x03"),
+        (0x15, 0x04, b"\x04"),
+        (0x16, 0x05, b"\x05\x06"),
+        (0x16, 0x06, b"\x07"),
+    ]
+
+
+def test_coalesce_runs_keeps_write_order():
+    stream = pack_table([(0x15, 0x01, 0x01), (0x15, 0x00, 0x02), (0x15, 0x01, 0x03)])
+    assert coalesce_runs(stream) == [
+        (0x15, 0x01, b"\x01"),
+        (0x15, 0x00, b"\x02\x03"),
+    ]
+
+
+def test_coalesce_runs_without_auto_increment():
+    stream = pack_table([(0x15, 0x00, 0x01), (0x15, 0x01, 0x02)])
+    assert coalesce_runs(stream, auto_increment=False) == [
+        (0x15, 0x00, b"\x01"),
+        (0x15, 0x01, b"\x02"),
+    ]
+
+
+def test_coalesce_runs_empty_stream():
+    assert coalesce_runs(b"") == []
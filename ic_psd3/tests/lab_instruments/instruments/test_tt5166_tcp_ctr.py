@@ -0,0 +1,162 @@
+"""Tests for the TT5166 Modbus TCP controller, against a fake socket."""
+
+import socket
+import struct
+
+import pytest
+
+from lab_instruments.instruments import tt5166_tcp_ctr
+from lab_instruments.instruments.tt5166_tcp_ctr import TemperatureController
+
+# Write replies echo the 6-byte request PDU
+ECHO_REPLY = b"\x00\x01\x00\x00\x00\x06" + bytes(6)
+# MBAP header whose length field (unit id + PDU bytes) is 0
+MALFORMED_REPLY = b"\x00\x01\x00\x00\x00\x00\x00"
+
+
+def temperature_reply(centi_degrees):
+    """Reply to the read-temperature request: one signed register in 0.01 deg."""
+    return b"\x00\x01\x00\x00\x00\x05\x00\x03\x02" + struct.pack(">h", centi_degrees)
+
+
+class FakeSocket:
+    """Stand-in for the controller link: one scripted reply per request.
+
+    A reply is a list of chunks handed out by successive recv_into() calls,
+    or an exception raised by sendall().
+    """
+
+    def __init__(self, replies):
+        self.replies = list(replies)
+        self.chunks = []
+        self.sent = []
+        self.address = None
+        self.closed = False
+
+    def setsockopt(self, level, option, value):
+        pass
+
+    def connect(self, address):
+        self.address = address
+
+    def sendall(self, data):
+        self.sent.append(bytes(data))
+        reply = self.replies.pop(0)
+        if isinstance(reply, Exception):
+            raise reply
+        self.chunks = list(reply)
+
+    def recv_into(self, buffer):
+        if not self.chunks:
+            return 0
+        chunk = self.chunks.pop(0)
+        n = min(len(buffer), len(chunk))
+        buffer[:n] = chunk[:n]
+        if n < len(chunk):
+            self.chunks.insert(0, chunk[n:])
+        return n
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def links(monkeypatch):
+    """Queue of reply scripts, one per connection; the opened sockets are recorded."""
+    scripts = []
+    opened = []
+
+    def fake_socket(family, kind):
+        link = FakeSocket(scripts.pop(0))
+        opened.append(link)
+        return link
+
+    monkeypatch.setattr(socket, "socket", fake_socket)
+    monkeypatch.setattr(tt5166_tcp_ctr.time, "sleep", lambda seconds: None)
+    return scripts, opened
+
+
+def test_one_connection_serves_every_request(links):
+    scripts, opened = links
+    scripts.append([[tt5166_tcp_ctr._POWER_ON_FRAME], [temperature_reply(2512)]])
+    controller = TemperatureController("192.0.2.1", 3000)
+
+    controller._turn_on_power()
+
+    assert controller._display_temperature() == 25.12
+    assert len(opened) == 1 and opened[0].address == ("192.0.2.1", 3000)
+    assert opened[0].sent == [tt5166_tcp_ctr._POWER_ON_FRAME, tt5166_tcp_ctr._READ_TEMP_FRAME]
+
+
+def test_dropped_link_reconnects_and_retries_once(links):
+    scripts, opened = links
+    scripts.extend([[ConnectionResetError("reset by peer")], [[temperature_reply(-550)]]])
+    controller = TemperatureController("192.0.2.1", 3000)
+
+    assert controller._display_temperature() == -5.5
+    assert len(opened) == 2 and opened[0].closed and not opened[1].closed
+
+
+def test_turn_off_powers_off_after_a_failed_request(links):
+    scripts, opened = links
+    scripts.extend(
+        [
+            [BrokenPipeError("link down")],
+            [BrokenPipeError("still down")],
+            [[tt5166_tcp_ctr._POWER_OFF_FRAME]],
+        ]
+    )
+    controller = TemperatureController("192.0.2.1", 3000)
+    with pytest.raises(ConnectionError):
+        controller._display_temperature()
+    assert controller.client_socket is None
+
+    controller.turn_off_controller()
+
+    assert opened[2].sent == [tt5166_tcp_ctr._POWER_OFF_FRAME]
+    assert opened[2].closed
+
+
+def test_turn_off_before_any_connection_sends_nothing(links):
+    _, opened = links
+
+    TemperatureController("192.0.2.1", 3000).turn_off_controller()
+
+    assert opened == []
+
+
+def test_reply_is_read_to_the_mbap_length_across_partial_reads(links):
+    scripts, opened = links
+    reply = temperature_reply(2512)
+    # Header split in two, trailing bytes belong to no request and must stay unread
+    scripts.append([[reply[:3], reply[3:9], reply[9:] + b"\xff\xff"]])
+    controller = TemperatureController("192.0.2.1", 3000)
+
+    assert controller._txn(tt5166_tcp_ctr._READ_TEMP_FRAME) == reply
+    assert opened[0].chunks == [b"\xff\xff"]
+
+
+def test_zero_mbap_length_drops_the_link_and_retries(links):
+    scripts, opened = links
+    scripts.extend([[[MALFORMED_REPLY]], [[temperature_reply(2512)]]])
+    controller = TemperatureController("192.0.2.1", 3000)
+
+    assert controller._display_temperature() == 25.12
+    assert len(opened) == 2 and opened[0].closed
+
+
+def test_temperature_wait_keeps_polling_after_malformed_replies(links):
+    scripts, opened = links
+    scripts.extend(
+        [
+            [[ECHO_REPLY], [MALFORMED_REPLY]],
+            [[MALFORMED_REPLY]],
+            [[temperature_reply(2490)]],
+        ]
+    )
+    controller = TemperatureController("192.0.2.1", 3000)
+
+    controller._check_temperature(25)
+
+    assert controller.now_temperature == 24.9
+    assert len(opened) == 3
@@ -0,0 +1,219 @@
+"""Tests for library.usb_common_class.USBCommonClass on a MockDriver.
+
+The expected write sequences were checked against the register contents
+left by the earlier one-write-per-field implementation.
+"""
+
+import pytest
+
+from hw_bridge.drivers.mock_driver import MockDriver
+from library.usb_common_class import USBCommonClass
+
+PAGE = 0x10
+
+
+def fill(device, value, page=PAGE):
+    """Preload every register of one page."""
+    for addr2 in range(256):
+        device.set_register(page, addr2, value)
+
+
+@pytest.fixture(params=[0xFF, 0x00], ids=["ones", "zeros"])
+def preset(request, mock_device):
+    """MockDriver with PAGE preloaded to all ones or all zeros."""
+    fill(mock_device, request.param)
+    return mock_device, request.param
+
+
+EXPECTED_WRITES = {
+    ("init_usb2_tx_prbs", (PAGE, 0x20)): {
+        0xFF: [(0x62, 0x7F), (0x63, 0xFF), (0x63, 0xDF), (0x30, 0xFF), (0x63, 0xC7)],
+        0x00: [(0x62, 0x00), (0x63, 0x20), (0x63, 0x00), (0x30, 0x30), (0x63, 0x00)],
+    },
+    ("usb3_cdr_config", (PAGE, 1, 2, 3, 4)): {
+        0xFF: [(0xE0, 0xFF), (0xE1, 0x32), (0xE2, 0xF3)],
+        0x00: [(0xE0, 0x81), (0xE1, 0x32), (0xE2, 0x00)],
+    },
+    ("usb3_tx_swing_config", (PAGE, 3)): {
+        0xFF: [
+            (0x3A, 0x18),
+            (0x3B, 0xC6),
+            (0x3C, 0x31),
+            (0x3D, 0x8C),
+            (0x3E, 0x63),
+            (0x3F, 0x18),
+            (0x40, 0xC6),
+            (0x41, 0x3F),
+        ],
+        0x00: [
+            (0x3A, 0x18),
+            (0x3B, 0xC6),
+            (0x3C, 0x31),
+            (0x3D, 0x8C),
+            (0x3E, 0x63),
+            (0x3F, 0x18),
+            (0x40, 0xC6),
+            (0x41, 0x30),
+        ],
+    },
+    # 0x0E and 0x0F are written back even when the enable bits are already set
+    ("usb3_tx_ffe_config", (PAGE, 1, 2, 3, 1)): {
+        0xFF: [(0xEA, 0xBF), (0x0E, 0xFF), (0x0F, 0xFF), (0xF7, 0xFF), (0xEE, 0xEF), (0xF6, 0xDB)],
+        0x00: [(0xEA, 0x00), (0x0E, 0x01), (0x0F, 0x80), (0xF7, 0x80), (0xEE, 0x0C), (0xF6, 0x18)],
+    },
+    ("usb2_tx_reset", (PAGE,)): {
+        0xFF: [(0x62, 0x7F), (0x63, 0xFF), (0x63, 0xDF)],
+        0x00: [(0x62, 0x00), (0x63, 0x20), (0x63, 0x00)],
+    },
+    ("cdr_reset", (PAGE,)): {
+        0xFF: [(0x3F, 0xFF), (0x3F, 0xFE), (0x3F, 0xFF)],
+        0x00: [(0x3F, 0x02), (0x3F, 0x02), (0x3F, 0x03)],
+    },
+}
+
+
+@pytest.mark.parametrize("call", list(EXPECTED_WRITES), ids=lambda call: call[0])
+def test_write_sequences_and_register_contents(preset, call):
+    device, value = preset
+    name, args = call
+    expected = [(PAGE, addr2, data) for addr2, data in EXPECTED_WRITES[call][value]]
+
+    getattr(USBCommonClass(device, settle_time=0), name)(*args)
+
+    assert device.write_log == expected
+    final = {(addr1, addr2): data for addr1, addr2, data in expected}
+    assert {key: device.registers[key] for key in final} == final
+
+
+def test_prbs_set_mode_updates_every_page(mock_device):
+    fill(mock_device, 0x00, 0x10)
+    fill(mock_device, 0x00, 0x20)
+
+    USBCommonClass(mock_device).prbs_set_mode([0x10, 0x20], 2)
+
+    assert mock_device.write_log == [
+        (0x10, 0x63, 0x04),
+        (0x10, 0x19, 0x10),
+        (0x20, 0x63, 0x04),
+        (0x20, 0x19, 0x10),
+    ]
+
+
+@pytest.mark.parametrize("clk_val", [500, 500.0])
+def test_usb2_pll_clk_set_accepts_int_and_float_clocks(mock_device, clk_val):
+    fill(mock_device, 0x00)
+
+    assert USBCommonClass(mock_device).usb2_pll_clk_set(PAGE, clk_val)
+
+    assert mock_device.write_log == [
+        (PAGE, 0xF1, 20),
+        (PAGE, 0xF2, 0x00),
+        (PAGE, 0xF0, 0x00),
+        (PAGE, 0xF0, 0x01),
+    ]
+
+
+def test_usb2_pll_clk_set_rejects_clocks_not_divisible_by_25(mock_device):
+    assert not USBCommonClass(mock_device).usb2_pll_clk_set(PAGE, 480.0)
+    assert mock_device.write_log == []
+
+
+def test_shadow_mode_skips_unchanged_writes(mock_device):
+    fill(mock_device, 0x00)
+    usb = USBCommonClass(mock_device, shadow=True)
+
+    usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+    first = list(mock_device.write_log)
+    mock_device.clear_logs()
+    usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+
+    # 0xE2 already holds the masked value, so the shadow drops it
+    assert first == [(PAGE, 0xE0, 0x81), (PAGE, 0xE1, 0x32)]
+    assert mock_device.write_log == []
+    assert mock_device.read_log == []
+
+
+def test_shadow_mode_invalidate_reads_again(mock_device):
+    fill(mock_device, 0x00)
+    usb = USBCommonClass(mock_device, shadow=True)
+    usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+    mock_device.set_register(PAGE, 0xE0, 0x00)
+    mock_device.clear_logs()
+
+    usb.invalidate(PAGE)
+    usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+
+    # 0xE1 is written whole, so only the re-read 0xE0 and 0xE2 can be skipped
+    assert mock_device.write_log == [(PAGE, 0xE0, 0x81), (PAGE, 0xE1, 0x32)]
+    assert [read[:2] for read in mock_device.read_log] == [(PAGE, 0xE0), (PAGE, 0xE2)]
+
+
+@pytest.mark.parametrize("shadow", [False, True])
+def test_batched_keeps_the_write_sequence(shadow):
+    expected = []
+    for batched in (False, True):
+        device = MockDriver(verbose=False)
+        device.open()
+        fill(device, 0x00)
+        usb = USBCommonClass(device, shadow=shadow, settle_time=0)
+        if batched:
+            with usb.batched():
+                usb.init_usb2_tx_prbs(PAGE, 0x20)
+                usb.usb3_tx_swing_config(PAGE, 3)
+            assert not device.in_batch
+        else:
+            usb.init_usb2_tx_prbs(PAGE, 0x20)
+            usb.usb3_tx_swing_config(PAGE, 3)
+        expected.append((device.write_log, device.registers))
+        device.close()
+
+    assert expected[1] == expected[0]
+
+
+def test_batched_defers_writes_until_the_block_exits(mock_device):
+    fill(mock_device, 0x00)
+    usb = USBCommonClass(mock_device, shadow=True)
+    usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+    mock_device.clear_logs()
+
+    # Every register is known to the shadow, so nothing is read and flushed early
+    with usb.batched():
+        usb.usb3_cdr_config(PAGE, 0, 5, 1, 3)
+        usb.usb3_cdr_config(PAGE, 1, 2, 3, 4)
+        assert mock_device.write_log == []
+
+    assert mock_device.read_log == []
+    assert mock_device.write_log == [
+        (PAGE, 0xE0, 0x80),
+        (PAGE, 0xE1, 0x15),
+        (PAGE, 0xE2, 0x0C),
+        (PAGE, 0xE0, 0x81),
+        (PAGE, 0xE1, 0x32),
+        (PAGE, 0xE2, 0x00),
+    ]
+
+
+def test_reads_in_a_batch_see_queued_writes(mock_device):
+    fill(mock_device, 0x00)
+    usb = USBCommonClass(mock_device)
+
+    with usb.batched():
+        usb.device.write_reg(PAGE, 0x6B, 0x12)
+        assert usb.read_usb3_prbs_errors(PAGE) == 0x1200
+
+    assert mock_device.write_log == [(PAGE, 0x6B, 0x12)]
+
+
+@pytest.mark.parametrize("shadow", [False, True])
+def test_read_regs_goes_through_the_wrapped_device(mock_device, shadow):
+    calls = []
+    read_regs = mock_device.read_regs
+    mock_device.read_regs = lambda *args: calls.append(args) or read_regs(*args)
+    mock_device.set_register(PAGE, 0x6A, 0x01)
+    mock_device.set_register(PAGE, 0x6C, 0x03)
+    usb = USBCommonClass(mock_device, shadow=shadow)
+
+    with usb.batched():
+        assert usb.read_usb3_prbs_errors(PAGE) == 0x010003
+
+    assert calls == [(PAGE, 0x6A, 3)]
@@ -0,0 +1,76 @@
+"""
+Auto-generated Register Access Class
+Generated from: small_regs.xml
+=====================================
+
+This class provides IDE autocomplete for register access.
+Use with replace_autoclass_calls() to generate actual I2C code.
+
+Example:
+    AutoClass.AG.i2c_audio_format.r()      # Read register
+    AutoClass.AG.i2c_audio_format.w(0x3)   # Write register
+"""
+
+class AutoClass:
+    """
+    Register access class for IDE autocomplete.
+    All methods are placeholders (pass).
+    Use replace_autoclass_calls() to replace with actual I2C code.
+    """
+
+    # Total Pages: 2, Total Registers: 6
+
+    class AG:
+        """Page: AG, Address: 0x15"""
+        class i2c_audio_format:
+            """Register: i2c_audio_format, Address: 0x1500"""
+            @staticmethod
+            def r():
+                """Read register value"""
+                pass
+
+            @staticmethod
+            def w(val):
+                """Write value to register"""
+                pass
+
+        class i2c_gain_ctrl:
+            """Register: i2c_gain_ctrl, Address: 0x1501"""
+            @staticmethod
+            def r():
+                """Read register value"""
+                pass
+
+            @staticmethod
+            def w(val):
+                """Write value to register"""
+                pass
+
+        class i2c_mute:
+            """Register: i2c_mute, Address: 0x1503"""
+            @staticmethod
+            def r():
+                """Read register value"""
+                pass
+
+            @staticmethod
+            def w(val):
+                """Write value to register"""
+                pass
+
+
+    class DP:
+        """Page: DP, Address: 0x20"""
+        class dp_lane_count:
+            """Register: dp_lane_count, Address: 0x2010"""
+            @staticmethod
+            def r():
+                """Read register value"""
+                pass
+
+            @staticmethod
+            def w(val):
+                """Write value to register"""
+                pass
+
+
@@ -0,0 +1,31 @@
+"""
+Register Definition Constants
+Generated from: small_regs.xml
+=====================================
+
+This file defines I2C memory page addresses extracted from XML.
+Use these constants to access chip registers.
+
+Example:
+    from library.reg_define import *
+    device.read_reg(AG, 0x00)  # Read from AG page
+"""
+
+# I2C Memory Page Addresses
+AG = 0x15
+DP = 0x20
+
+# Page Name to Address Mapping
+PAGE_MAP = {
+    "AG": 0x15,
+    "DP": 0x20,
+}
+
+# Address to Page Name Mapping
+ADDR_MAP = {
+    0x15: "AG",
+    0x20: "DP",
+}
+
+# Total Pages: 2
+__all__ = ['AG', 'DP', 'PAGE_MAP', 'ADDR_MAP']
@@ -0,0 +1,16 @@
+def configure(self):
+    rb_i2c_audio_format = (self.device.read_reg(0x15, 0x00))
+    if rb_i2c_audio_format:
+        # w AG:i2c_mute <- 1
+        self.device.write_bits(0x15, 0x03, 6, 1, 1)
+        self.device.write_bits(0x15, 0x04, 0, 1, 1)
+    # w AG:i2c_gain_ctrl <- 0x7CF
+    self.device.write_bits(0x15, 0x01, 0, 8, 124)
+    self.device.write_bits(0x15, 0x02, 4, 4, 15)
+    rb_i2c_gain_ctrl = 0
+    rb_i2c_gain_ctrl |= (self.device.read_reg(0x15, 0x01)) << 4
+    rb_i2c_gain_ctrl |= (self.device.read_reg(0x15, 0x02) & 0xF0) >> 4
+    # w DP:dp_lane_count <- 0
+    self.device.write_bits(0x20, 0x10, 0, 3, 0)
+    # ERROR: DP.no_such_reg not found
+    return rb_i2c_gain_ctrl
@@ -0,0 +1,9 @@
+def configure(self):
+    AutoClass.AG.i2c_audio_format.r()
+    if rb_i2c_audio_format:
+        AutoClass.AG.i2c_mute.w(1)
+    AutoClass.AG.i2c_gain_ctrl.w(0x7CF)
+    AutoClass.AG.i2c_gain_ctrl.r()
+    AutoClass.DP.dp_lane_count.w()
+    AutoClass.DP.no_such_reg.r()
+    return rb_i2c_gain_ctrl
@@ -0,0 +1,65 @@
+#include "GSU1K1_NTO_scripts.h"
+void func_01_01_Chip_Power_Up(){
+    writeReg(0x09,0x02,0x13); //power
+    writeReg(0x09,0x03,0x01);
+}
+
+void func_02_01_EQ_table(){
+    writeReg(0x09,0x05,0x01); //ram sel
+    writeReg(0x15,0x00,0x44); //first tap
+    writeReg(0x15,0x01,0x20);
+    writeReg(0x15,0x02,0x82);
+    writeReg(0x15,0x03,0x3c);
+    writeReg(0x15,0x04,0xfd);
+    writeReg(0x09,0x05,0x00);
+}
+
+void func_02_02_lane_mirror(){
+    writeReg(0x20,0x01,0x11); //lane0 gain
+    writeReg(0x20,0x02,0x22);
+    writeReg(0x21,0x01,0x11);
+    writeReg(0x21,0x02,0x22);
+    writeReg(0x22,0x01,0x11);
+    writeReg(0x22,0x02,0x22);
+}
+
+void func_02_03_fan_out(){
+    writeReg(0x30,0x10,0x05); //both lanes
+    writeReg(0x31,0x10,0x05);
+    writeReg(0x30,0x11,0x06);
+    writeReg(0x31,0x11,0x06);
+    writeReg(0x09,0x50,0x07); //lone write
+}
+
+void func_03_01_forward_include(){
+    func_04_01_late_func();
+}
+
+void func_03_02_power_up_thrice(){
+    func_01_01_Chip_Power_Up();
+    func_01_01_Chip_Power_Up();
+    writeReg(0x09,0x02,0x14); //between
+    func_01_01_Chip_Power_Up();
+    func_02_01_EQ_table();
+}
+
+void func_03_03_alias(){
+    func_03_02_power_up_thrice();
+}
+
+void func_03_04_nested(){
+    writeReg(0x01,0x01,0x01);
+    func_03_02_power_up_thrice();
+    func_03_01_forward_include();
+}
+
+void func_03_05_calls_missing(){
+    writeReg(0x01,0x02,0x02);
+    func_99_99_not_in_script();
+    func_02_02_lane_mirror();
+}
+
+void func_04_01_late_func(){
+    writeReg(0x0a,0x01,0x01);
+    writeReg(0x0a,0x03,0x03);
+}
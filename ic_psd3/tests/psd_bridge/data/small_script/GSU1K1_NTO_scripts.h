@@ -0,0 +1,10 @@
+void func_01_01_Chip_Power_Up();
+void func_02_01_EQ_table();
+void func_02_02_lane_mirror();
+void func_02_03_fan_out();
+void func_03_01_forward_include();
+void func_03_02_power_up_thrice();
+void func_03_03_alias();
+void func_03_04_nested();
+void func_03_05_calls_missing();
+void func_04_01_late_func();
\ No newline at end of file
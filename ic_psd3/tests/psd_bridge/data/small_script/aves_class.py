@@ -0,0 +1,286 @@
+"""
+AVESChipConfig - AVES script configuration class
+Auto-generated from: small_script.txt
+"""
+
+from typing import Optional
+from hw_bridge import DeviceManager
+from hw_bridge.utils.regtable import expand_pages, pack_block, pack_table
+
+
+_STREAM_01_01_0 = pack_table(
+    (
+        (0x09, 0x02, 0x13),  # power
+        (0x09, 0x03, 0x01),
+    )
+)
+
+_STREAM_02_01_1 = (
+    pack_table(
+        (
+            (0x09, 0x05, 0x01),  # ram sel
+        )
+    )
+    + pack_block(
+        # 0x1500: first tap
+        0x15,
+        0x00,
+        bytes.fromhex("4420823CFD"),
+    )  # 0x1500-0x1504
+    + pack_table(
+        (
+            (0x09, 0x05, 0x00),
+        )
+    )
+)
+
+_STREAM_02_02_2 = expand_pages(
+    # 0x2001: lane0 gain
+    (0x20, 0x21, 0x22),
+    (
+        (0x01, 0x11),
+        (0x02, 0x22),
+    ),
+    page_major=True,
+)
+
+_STREAM_02_03_3 = (
+    expand_pages(
+        # 0x3010: both lanes
+        (0x30, 0x31),
+        (
+            (0x10, 0x05),
+            (0x11, 0x06),
+        ),
+    )
+    + pack_table(
+        (
+            (0x09, 0x50, 0x07),  # lone write
+        )
+    )
+)
+
+_STREAM_04_01_4 = pack_table(
+    (
+        (0x0a, 0x01, 0x01),
+        (0x0a, 0x03, 0x03),
+    )
+)
+
+_STREAM_03_02_5 = (
+    (_STREAM_01_01_0, 2),
+    b"\x09\x02\x14",
+    (_STREAM_01_01_0, 1),
+    _STREAM_02_01_1,
+)
+
+_STREAM_03_04_6 = (
+    b"\x01\x01\x01",
+    (_STREAM_01_01_0, 2),
+    b"\x09\x02\x14",
+    (_STREAM_01_01_0, 1),
+    _STREAM_02_01_1 + _STREAM_04_01_4,
+)
+
+
+def _stream_method(title, name, stream, steps=None):
+    """
+    Build a configuration method that writes one packed stream.
+
+    For a flattened composite, steps lists the included method names and
+    streams it was built from; they are run one by one when skip_applied
+    is set so that included functions already applied are skipped.
+    A composite with repeated includes passes a tuple of streams and
+    (stream, count) repeats instead of one stream.
+    """
+
+    def _method(self):
+        if self._skip_applied and name in self._applied:
+            return
+        device = self._get_device()
+        if self._verbose and not device.in_batch:
+            print(f"Cfg {name}...")
+        with device.batch(dedupe=self._dedupe_writes) as device:
+            if steps is None or not self._skip_applied:
+                if isinstance(stream, tuple):
+                    for part in stream:
+                        if isinstance(part, tuple):
+                            device.write_stream_repeat(*part)
+                        else:
+                            device.write_stream(part)
+                else:
+                    device.write_stream(stream)
+            else:
+                for step in steps:
+                    if isinstance(step, str):
+                        getattr(self, step)()
+                    else:
+                        device.write_stream(step)
+        self._applied.add(name)
+
+    _method.__name__ = name
+    _method.__doc__ = title
+    return _method
+
+
+class AVESChipConfig:
+    """
+    AVES script configuration for chip initialization.
+    
+    This class provides methods to configure the chip using I2C commands
+    converted from AVES scripts. It supports DeviceManager for centralized
+    device management, enabling multi-device configurations (e.g., TX/RX boards).
+    
+    Usage (DeviceManager mode - recommended):
+        >>> from hw_bridge import DeviceManager
+        >>> dm = DeviceManager(auto_open=True)
+        >>> dm.register("tx", "ftdi", i2c_port=0, chip_addr=0x58)
+        >>> dm.register("rx", "ftdi", i2c_port=1, chip_addr=0x58)
+        >>> tx_config = AVESChipConfig(device_manager=dm, device_name="tx")
+        >>> rx_config = AVESChipConfig(device_manager=dm, device_name="rx")
+        >>> tx_config.func_01_01_Chip_Power_Up()
+    """
+
+    __slots__ = (
+        "_device_manager",
+        "_device_name",
+        "_dedupe_writes",
+        "_verbose",
+        "_device",
+        "_skip_applied",
+        "_applied",
+    )
+
+    def __init__(
+        self,
+        device_manager: Optional[DeviceManager] = None,
+        device_name: str = "chip",
+        dedupe_writes: bool = False,
+        verbose: bool = True,
+        skip_applied: bool = False,
+    ):
+        """
+        Initialize the AVES chip configuration.
+
+        Args:
+            device_manager: DeviceManager instance for device access.
+                           If None, you must set it before calling methods.
+            device_name: Name of the device in the DeviceManager.
+            dedupe_writes: Drop writes that repeat the value already written
+                           to the same register within one call.
+            verbose: If True, print the name of each top-level configuration call.
+            skip_applied: Skip configuration functions that already ran on this
+                          device; use force_reapply() to run them again.
+        """
+        self._device_manager = device_manager
+        self._device_name = device_name
+        self._dedupe_writes = dedupe_writes
+        self._verbose = verbose
+        self._device = None
+        self._skip_applied = skip_applied
+        self._applied = set()
+
+    def _get_device(self):
+        """Get the device instance from DeviceManager (cached while open)."""
+        device = self._device
+        if device is not None and device.is_open:
+            return device
+        if self._device_manager is None:
+            raise RuntimeError("DeviceManager not set. Initialize with device_manager parameter.")
+        self._device = self._device_manager[self._device_name]
+        return self._device
+
+    def set_device_manager(self, device_manager: DeviceManager, device_name: str = None):
+        """
+        Set or update the DeviceManager.
+
+        Args:
+            device_manager: DeviceManager instance
+            device_name: Optional new device name
+        """
+        self._device_manager = device_manager
+        self._device = None
+        self._applied.clear()
+        if device_name:
+            self._device_name = device_name
+
+    def force_reapply(self, names=None):
+        """
+        Let configuration functions run again when skip_applied is set.
+
+        Args:
+            names: Function names to forget (e.g. ["func_01_01_Chip_Power_Up"]);
+                   None forgets all of them, e.g. after a chip reset
+        """
+        if names is None:
+            self._applied.clear()
+        else:
+            self._applied.difference_update(names)
+
+    func_01_01_Chip_Power_Up = _stream_method(
+        "01-01 Chip Power Up", "func_01_01_Chip_Power_Up", _STREAM_01_01_0
+    )  # 2 regs
+
+    func_02_01_EQ_table = _stream_method(
+        "02-01 EQ table", "func_02_01_EQ_table", _STREAM_02_01_1
+    )  # 7 regs
+
+    func_02_02_lane_mirror = _stream_method(
+        "02-02 lane mirror", "func_02_02_lane_mirror", _STREAM_02_02_2
+    )  # 6 regs
+
+    func_02_03_fan_out = _stream_method(
+        "02-03 fan out", "func_02_03_fan_out", _STREAM_02_03_3
+    )  # 5 regs
+
+    func_03_01_forward_include = _stream_method(
+        "03-01 forward include",
+        "func_03_01_forward_include",
+        _STREAM_04_01_4,
+        steps=(
+            "func_04_01_late_func",
+        ),
+    )  # 2 regs
+
+    func_03_02_power_up_thrice = _stream_method(
+        "03-02 power up thrice",
+        "func_03_02_power_up_thrice",
+        _STREAM_03_02_5,
+        steps=(
+            "func_01_01_Chip_Power_Up",
+            "func_01_01_Chip_Power_Up",
+            b"\x09\x02\x14",
+            "func_01_01_Chip_Power_Up",
+            "func_02_01_EQ_table",
+        ),
+    )  # 14 regs
+
+    func_03_03_alias = func_03_02_power_up_thrice  # 03-03 alias
+
+    func_03_04_nested = _stream_method(
+        "03-04 nested",
+        "func_03_04_nested",
+        _STREAM_03_04_6,
+        steps=(
+            b"\x01\x01\x01",
+            "func_03_02_power_up_thrice",
+            "func_03_01_forward_include",
+        ),
+    )  # 17 regs
+
+    def func_03_05_calls_missing(self):
+        """03-05 calls missing"""
+        if self._skip_applied and "func_03_05_calls_missing" in self._applied:
+            return
+        device = self._get_device()
+        if self._verbose and not device.in_batch:
+            print("Cfg func_03_05_calls_missing...")
+        with device.batch(dedupe=self._dedupe_writes) as device:
+            device.write_reg(0x01, 0x02, 0x02)
+            self.func_99_99_not_in_script()
+            self.func_02_02_lane_mirror()
+        self._applied.add("func_03_05_calls_missing")
+
+    func_04_01_late_func = _stream_method(
+        "04-01 late func", "func_04_01_late_func", _STREAM_04_01_4
+    )  # 2 regs
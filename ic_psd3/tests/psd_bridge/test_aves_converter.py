@@ -0,0 +1,176 @@
+"""Tests for psd_bridge.aves_converter on a small AVES script.
+
+The golden files in data/small_script/ are the converter output for
+data/small_script.txt. After an intended change to the generated code,
+refresh them from the ic_psd3 directory with:
+
+    python -m src.psd_bridge.aves_converter tests/psd_bridge/data/small_script.txt \
+        tests/psd_bridge/data/small_script
+"""
+
+import importlib.util
+import os
+
+import pytest
+
+from hw_bridge import DeviceManager
+from psd_bridge.aves_converter import AVESConverter
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+SCRIPT = os.path.join(DATA_DIR, "small_script.txt")
+GOLDEN_DIR = os.path.join(DATA_DIR, "small_script")
+GOLDEN_FILES = ("aves_class.py", "GSU1K1_NTO_scripts.h", "GSU1K1_NTO_scripts.c")
+
+
+@pytest.fixture(scope="module")
+def functions():
+    """Parsed functions of the small script, keyed by Python method name."""
+    converter = AVESConverter(SCRIPT)
+    return {
+        converter._sanitize_func_name(index, name): commands
+        for index, name, commands in converter._parse_aves_script()
+    }
+
+
+@pytest.fixture
+def generated(tmp_path):
+    """Convert the small script and import the generated module."""
+    AVESConverter(SCRIPT, output_dir=str(tmp_path)).convert()
+    spec = importlib.util.spec_from_file_location(
+        "small_script_aves_class", str(tmp_path / "aves_class.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return tmp_path, module
+
+
+def expand(functions, name):
+    """Writes a function performs, with includes expanded recursively."""
+    writes = []
+    for command in functions[name]:
+        if isinstance(command, str):
+            writes.extend(expand(functions, command))
+        else:
+            writes.append(command[:3])
+    return writes
+
+
+def run(module, name, shadow=False, **kwargs):
+    """Run one generated method on a fresh MockDriver and return its write log."""
+    manager = DeviceManager(auto_open=True, register_atexit=False)
+    device = manager.register("chip", "mock", verbose=False, shadow=shadow)
+    config = module.AVESChipConfig(manager, verbose=False, **kwargs)
+    getattr(config, name)()
+    mock = device.device if shadow else device
+    log = list(mock.write_log)
+    manager.close_all()
+    return log, mock.registers
+
+
+def test_generated_files_match_golden(generated):
+    output_dir, _ = generated
+    for filename in GOLDEN_FILES:
+        with open(os.path.join(GOLDEN_DIR, filename), encoding="utf-8") as f:
+            expected = f.read()
+        assert (output_dir / filename).read_text(encoding="utf-8") == expected, filename
+
+
+def test_group_commands_merges_blocks_mirrors_and_fan_outs(functions):
+    group = AVESConverter(SCRIPT)._group_commands
+
+    assert [kind for kind, _ in group(functions["func_02_01_EQ_table"])] == [
+        "write",
+        "block",
+        "write",
+    ]
+    assert group(functions["func_02_01_EQ_table"])[1][1][:3] == (
+        0x15,
+        0x00,
+        [0x44, 0x20, 0x82, 0x3C, 0xFD],
+    )
+    (kind, (pages, seq, _)), = group(functions["func_02_02_lane_mirror"])
+    assert (kind, pages, seq) == ("mirror", (0x20, 0x21, 0x22), [(0x01, 0x11), (0x02, 0x22)])
+    assert [item[:2] for _, item in group(functions["func_02_03_fan_out"])] == [
+        ((0x30, 0x31), 0x10),
+        ((0x30, 0x31), 0x11),
+        (0x09, 0x50),
+    ]
+    assert group(functions["func_03_01_forward_include"]) == [
+        ("line", "self.func_04_01_late_func()")
+    ]
+
+
+def test_repeated_includes_become_repeats(generated):
+    _, module = generated
+
+    assert module._STREAM_03_02_5 == (
+        (module._STREAM_01_01_0, 2),
+        b"\x09\x02\x14",
+        (module._STREAM_01_01_0, 1),
+        module._STREAM_02_01_1,
+    )
+
+
+def test_forward_include_shares_the_included_stream(generated):
+    _, module = generated
+
+    assert module._STREAM_04_01_4 == b"\x0a\x01\x01\x0a\x03\x03"
+    assert module.AVESChipConfig.func_03_01_forward_include.__name__ == (
+        "func_03_01_forward_include"
+    )
+
+
+def test_single_include_of_an_earlier_function_is_an_alias(generated):
+    _, module = generated
+    config = module.AVESChipConfig
+
+    assert config.func_03_03_alias is config.func_03_02_power_up_thrice
+
+
+@pytest.mark.parametrize("shadow", [False, True])
+def test_generated_methods_write_the_expanded_script(functions, generated, shadow):
+    _, module = generated
+
+    for name in functions:
+        if name == "func_03_05_calls_missing":
+            continue
+        log, registers = run(module, name, shadow=shadow)
+        expected = expand(functions, name)
+        assert log == expected, name
+        assert registers == {(a1, a2): value for a1, a2, value in expected}, name
+
+
+def test_method_including_an_unknown_function_fails_after_earlier_writes(generated):
+    _, module = generated
+    manager = DeviceManager(auto_open=True, register_atexit=False)
+    device = manager.register("chip", "mock", verbose=False)
+    config = module.AVESChipConfig(manager, verbose=False)
+
+    with pytest.raises(AttributeError, match="func_99_99_not_in_script"):
+        config.func_03_05_calls_missing()
+
+    assert device.write_log == [(0x01, 0x02, 0x02)]
+    manager.close_all()
+
+
+def test_skip_applied_runs_included_functions_once(functions, generated):
+    _, module = generated
+    manager = DeviceManager(auto_open=True, register_atexit=False)
+    device = manager.register("chip", "mock", verbose=False)
+    config = module.AVESChipConfig(manager, verbose=False, skip_applied=True)
+
+    config.func_03_02_power_up_thrice()
+    device.clear_logs()
+    config.func_03_04_nested()
+    config.func_03_04_nested()
+
+    assert device.write_log == [(0x01, 0x01, 0x01)] + expand(functions, "func_04_01_late_func")
+    manager.close_all()
+
+
+def test_dedupe_writes_keeps_repeated_includes(functions, generated):
+    _, module = generated
+
+    log, _ = run(module, "func_03_02_power_up_thrice", dedupe_writes=True)
+
+    assert log == expand(functions, "func_03_02_power_up_thrice")
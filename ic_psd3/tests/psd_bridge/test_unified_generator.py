@@ -0,0 +1,192 @@
+"""Tests for psd_bridge.unified_generator on a small register XML.
+
+The golden files in data/small_regs/ are the generator output for
+data/small_regs.xml and data/small_regs_script.py. After an intended change
+to the generated code, refresh them with generate_outputs(GOLDEN_DIR).
+"""
+
+import os
+import shutil
+import stat
+import types
+
+import pytest
+
+from psd_bridge.unified_generator import AutoClassGenerator, CodegenInfo
+
+DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
+XML = os.path.join(DATA_DIR, "small_regs.xml")
+SCRIPT = os.path.join(DATA_DIR, "small_regs_script.py")
+GOLDEN_DIR = os.path.join(DATA_DIR, "small_regs")
+GOLDEN_FILES = ("auto_class.py", "reg_define.py", "small_regs_script.py")
+
+
+def generate_outputs(output_dir):
+    """Write auto_class.py, reg_define.py and the replaced script to output_dir."""
+    generator = AutoClassGenerator(XML)
+    generator.generate_auto_class(os.path.join(output_dir, "auto_class.py"))
+    generator.generate_reg_define(os.path.join(output_dir, "reg_define.py"))
+    generator.replace_autoclass_calls(
+        SCRIPT, os.path.join(output_dir, "small_regs_script.py"), backup=False
+    )
+
+
+def load(path):
+    """Execute a generated file and return its namespace."""
+    namespace = {}
+    with open(path, encoding="utf-8") as f:
+        exec(compile(f.read(), path, "exec"), namespace)
+    return namespace
+
+
+@pytest.fixture(scope="module")
+def generator():
+    return AutoClassGenerator(XML)
+
+
+def test_pages_and_fields_come_from_one_pass(generator):
+    assert generator.dev_addr_dict == {"AG": "0x15", "DP": "0x20"}
+    assert {
+        page: [reg.byte_address for reg in registers]
+        for page, registers in generator.json_data.items()
+    } == {
+        "AG": ["0x1500", "0x1501", "0x1502", "0x1503", "0x1504"],
+        "DP": ["0x2010"],
+    }
+    # Only field[@class='Field'] nodes are registers
+    assert "not_a_field" not in [reg.field_name for reg in generator.json_data["AG"]]
+
+
+def test_registers_are_looked_up_by_page_and_caption(generator):
+    assert {page: list(names) for page, names in generator.page_reg_map.items()} == {
+        "AG": ["i2c_audio_format", "i2c_gain_ctrl", "i2c_mute"],
+        "DP": ["dp_lane_count"],
+    }
+    assert [reg.byte_address for reg in generator._get_register_info("AG", "i2c_mute")] == [
+        "0x1503",
+        "0x1504",
+    ]
+    assert generator._get_register_info("DP", "no_such_reg") is None
+
+
+def test_cached_tables_are_shared_read_only(generator):
+    other = AutoClassGenerator(XML)
+
+    assert other.page_reg_map is generator.page_reg_map
+    with pytest.raises(TypeError):
+        other.dev_addr_dict["AG"] = "0x99"
+    with pytest.raises(TypeError):
+        other.page_reg_map["AG"]["i2c_mute"] = ()
+    with pytest.raises(AttributeError):
+        other.json_data["DP"].append(None)
+    assert generator.dev_addr_dict == {"AG": "0x15", "DP": "0x20"}
+
+
+def test_byte_entries_carry_parsed_codegen_values(generator):
+    low, high = generator._get_register_info("AG", "i2c_gain_ctrl")
+
+    assert (low.bit_range, low.total_bits, low.default_value) == ("[11:0]", 12, "0x7CF")
+    assert (high.byte_mask, high.byte_shift, high.effective_bits) == ("0xF0", "4", 4)
+    assert low.codegen == CodegenInfo(0x1501, 0xFF, -4, 0, 8)
+    assert high.codegen == CodegenInfo(0x1502, 0xF0, 4, 4, 4)
+    assert not hasattr(low, "__dict__")
+
+
+@pytest.mark.parametrize(
+    "text, message",
+    [
+        ("<root><device/></root>", "根节点不是 file"),
+        ("<file><author>x</author></file>", "未找到 device"),
+    ],
+)
+def test_malformed_xml_is_rejected(tmp_path, text, message):
+    path = tmp_path / "bad.xml"
+    path.write_text(text, encoding="utf-8")
+
+    with pytest.raises(ValueError, match=message):
+        AutoClassGenerator(str(path))
+
+
+@pytest.fixture
+def generated(tmp_path):
+    generate_outputs(str(tmp_path))
+    return tmp_path
+
+
+def test_generated_files_match_golden(generated):
+    for filename in GOLDEN_FILES:
+        with open(os.path.join(GOLDEN_DIR, filename), encoding="utf-8") as f:
+            expected = f.read()
+        assert (generated / filename).read_text(encoding="utf-8") == expected, filename
+
+
+def test_auto_class_has_one_class_per_register_name(generated):
+    auto_class = load(str(generated / "auto_class.py"))["AutoClass"]
+
+    # The two i2c_mute fields share one class
+    assert [name for name in vars(auto_class.AG) if not name.startswith("__")] == [
+        "i2c_audio_format",
+        "i2c_gain_ctrl",
+        "i2c_mute",
+    ]
+    assert auto_class.DP.dp_lane_count.r() is None
+    assert load(str(generated / "reg_define.py"))["PAGE_MAP"] == {"AG": 0x15, "DP": 0x20}
+
+
+def test_replaced_script_writes_split_fields(generated, mock_device):
+    mock_device.set_register(0x15, 0x00, 0x1D)
+    configure = load(str(generated / "small_regs_script.py"))["configure"]
+
+    assert configure(types.SimpleNamespace(device=mock_device)) == 0x7CF
+    assert mock_device.write_log == [
+        (0x15, 0x03, 0x40),
+        (0x15, 0x04, 0x01),
+        (0x15, 0x01, 0x7C),
+        (0x15, 0x02, 0xF0),
+        (0x20, 0x10, 0x00),
+    ]
+
+
+
+def test_replace_in_place_keeps_the_file_mode(tmp_path):
+    script = tmp_path / "script.py"
+    shutil.copy(SCRIPT, script)
+    os.chmod(script, 0o755)
+
+    AutoClassGenerator(XML).replace_autoclass_calls(str(script), backup=False)
+
+    assert stat.S_IMODE(os.stat(script).st_mode) == 0o755
+    with open(os.path.join(GOLDEN_DIR, "small_regs_script.py"), encoding="utf-8") as f:
+        assert script.read_text(encoding="utf-8") == f.read()
+
+
+def test_replace_through_a_symlink_rewrites_its_target(tmp_path):
+    target = tmp_path / "script.py"
+    shutil.copy(SCRIPT, target)
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+
+    AutoClassGenerator(XML).replace_autoclass_calls(str(link), backup=False)
+
+    assert link.is_symlink()
+    with open(os.path.join(GOLDEN_DIR, "small_regs_script.py"), encoding="utf-8") as f:
+        assert target.read_text(encoding="utf-8") == f.read()
+    assert sorted(os.listdir(tmp_path)) == ["link.py", "script.py"]
+
+
+def test_backup_keeps_the_original_content_and_mode(tmp_path):
+    script = tmp_path / "script.py"
+    shutil.copy(SCRIPT, script)
+    os.chmod(script, 0o750)
+    backup = tmp_path / "script.py.bak"
+    backup.write_text("stale backup\n", encoding="utf-8")
+
+    AutoClassGenerator(XML).replace_autoclass_calls(str(script))
+
+    with open(SCRIPT, encoding="utf-8") as f:
+        assert backup.read_text(encoding="utf-8") == f.read()
+    assert stat.S_IMODE(os.stat(backup).st_mode) == 0o750
+    # The rewrite went to a new inode, so the hard-linked backup is not touched
+    assert not os.path.samefile(backup, script)
+    with open(os.path.join(GOLDEN_DIR, "small_regs_script.py"), encoding="utf-8") as f:
+        assert script.read_text(encoding="utf-8") == f.read()